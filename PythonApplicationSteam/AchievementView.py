@@ -0,0 +1,183 @@
+import tkinter as tk
+from tkinter import Scrollbar, Canvas
+
+# Row layout for the canvas-drawn achievement list
+ROW_HEIGHT = 90
+ICON_SIZE = 64
+PADDING = 5
+TEXT_WIDTH = 400
+# Rows drawn above and below the viewport so slow scrolling never shows gaps
+OVERSCAN = 4
+# Appended to the longest line of a row whose wrapped text is taller than the row
+ELLIPSIS = "\u2026"
+
+def visible_range(top, height, count, row_height=ROW_HEIGHT, overscan=OVERSCAN):
+    """Return the [first, last) row indexes that intersect a viewport, plus overscan."""
+    if count == 0 or height <= 0:
+        return 0, 0
+    first = max(0, int(top // row_height) - overscan)
+    last = min(count, int((top + height) // row_height) + 1 + overscan)
+    return first, last
+# Performance: Constant-height rows make the visible range O(1) to compute, so drawing
+# cost depends on the window height rather than on the number of achievements.
+
+
+class _IconSlot:
+    """Widget-like target for an achievement icon, used with the image queue."""
+    def __init__(self, view, index, generation):
+        self.view = view
+        self.index = index
+        self.generation = generation
+        self.image = None
+
+    def config(self, image=None):
+        self.view.set_icon(self.index, image, self.generation)
+    # Design Rationale: Mirrors Label.config(image=...) so check_image_queue can update
+    # canvas rows and widgets the same way.
+
+
+class AchievementList:
+    """Scrollable achievement list drawn as canvas items, materialising only visible rows."""
+    def __init__(self, parent, placeholder_img, request_icon=None):
+        self.placeholder_img = placeholder_img
+        self.request_icon = request_icon  # Called as request_icon(index, row) once per row
+        self.canvas = Canvas(parent, highlightthickness=0)
+        self.scrollbar = Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+
+        self.rows = []
+        self.icons = {}       # index -> loaded PhotoImage
+        self.items = {}       # index -> (image item id, text item id)
+        self.fitted = {}      # index -> row text shortened to fit ROW_HEIGHT
+        self.requested = set()
+        self.generation = 0
+        # Design Rationale: The generation counter discards icons that finish loading
+        # after the list has been repopulated for another game.
+
+    def set_rows(self, rows):
+        """Replace the list contents; rows are dicts with 'text' and 'color' keys."""
+        self.clear()
+        self.rows = rows
+        width = max(self.canvas.winfo_width(), ICON_SIZE + TEXT_WIDTH + 3 * PADDING)
+        self.canvas.configure(scrollregion=(0, 0, width, len(rows) * ROW_HEIGHT))
+        self.canvas.yview_moveto(0)
+        self.redraw()
+
+    def clear(self):
+        """Remove all rows and canvas items."""
+        self.generation += 1
+        self.canvas.delete("all")
+        self.rows = []
+        self.icons = {}
+        self.items = {}
+        self.fitted = {}
+        self.requested = set()
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.redraw()
+
+    def redraw(self):
+        """Create items for rows entering the viewport and delete those that left it."""
+        first, last = visible_range(self.canvas.canvasy(0), self.canvas.winfo_height(), len(self.rows))
+        for index in [i for i in self.items if not first <= i < last]:
+            for item in self.items.pop(index):
+                self.canvas.delete(item)
+        for index in range(first, last):
+            if index not in self.items:
+                self.items[index] = self._draw_row(index)
+        # Performance: Only the visible window of rows exists as canvas items, so games
+        # with thousands of achievements cost the same to scroll as games with ten.
+
+    def _draw_row(self, index):
+        row = self.rows[index]
+        y = index * ROW_HEIGHT + PADDING
+        image_item = self.canvas.create_image(
+            PADDING, y, anchor="nw", image=self.icons.get(index, self.placeholder_img))
+        text_item = self.canvas.create_text(
+            ICON_SIZE + 2 * PADDING, y, anchor="nw", text=self.fitted.get(index, row['text']),
+            fill=row.get('color', 'black'), width=TEXT_WIDTH)
+        if index not in self.fitted:
+            self.fitted[index] = self._fit(text_item, row['text'])
+        # Performance: Icons are only requested once a row is first shown.
+        if index not in self.requested and self.request_icon:
+            self.requested.add(index)
+            self.request_icon(index, row)
+        return image_item, text_item
+
+    def _text_height(self, item):
+        bbox = self.canvas.bbox(item)
+        return bbox[3] - bbox[1] if bbox else 0
+
+    def _fit(self, item, text):
+        """Shorten the longest line of a row's text with an ellipsis until it fits the row; return the text."""
+        limit = ROW_HEIGHT - PADDING
+        if self._text_height(item) <= limit:
+            return text
+        lines = text.split('\n')
+        longest = max(range(len(lines)), key=lambda i: len(lines[i]))
+        line = lines[longest]
+        low, high = 0, len(line) - 1
+        while low < high:
+            keep = (low + high + 1) // 2
+            lines[longest] = line[:keep].rstrip() + ELLIPSIS
+            self.canvas.itemconfigure(item, text='\n'.join(lines))
+            if self._text_height(item) <= limit:
+                low = keep
+            else:
+                high = keep - 1
+        lines[longest] = line[:low].rstrip() + ELLIPSIS
+        fitted = '\n'.join(lines)
+        self.canvas.itemconfigure(item, text=fitted)
+        return fitted
+    # Design Rationale: Long descriptions are clamped rather than given taller rows, so row
+    # offsets stay index * ROW_HEIGHT and visible_range stays O(1). Each row is measured
+    # once, when first drawn, and the shortened text is reused on later redraws.
+
+    def icon_slot(self, index):
+        """Return a widget-like target that updates the icon of a row when loaded."""
+        return _IconSlot(self, index, self.generation)
+
+    def set_icon(self, index, photo, generation=None):
+        """Update a row's icon in place; ignored if the list has been repopulated."""
+        if generation is not None and generation != self.generation:
+            return
+        photo = photo or self.placeholder_img
+        self.icons[index] = photo
+        if index in self.items:
+            self.canvas.itemconfigure(self.items[index][0], image=photo)
+
+
+class AchievementPanel:
+    """Owns the achievement panel widgets and reuses them for every game shown."""
+    def __init__(self, parent, placeholder_img, request_icon=None):
+        self.title_label = tk.Label(parent, font=("Arial", 14, "bold"))
+        self.empty_label = tk.Label(parent, text="No achievements available for this game.")
+        self.list = AchievementList(parent, placeholder_img, request_icon)
+    # Design Rationale: Widgets are created once and only packed, unpacked and
+    # reconfigured afterwards, so a long session never accumulates widgets.
+
+    def _hide(self):
+        for widget in (self.title_label, self.empty_label, self.list.canvas, self.list.scrollbar):
+            widget.pack_forget()
+
+    def show(self, game_name, rows):
+        """Show the achievement rows for a game."""
+        self._hide()
+        self.title_label.config(text=f"Achievements for {game_name}")
+        self.title_label.pack(pady=5)
+        self.list.canvas.pack(side="left", fill="both", expand=True)
+        self.list.scrollbar.pack(side="right", fill="y")
+        self.list.set_rows(rows)
+
+    def show_empty(self):
+        """Show the message for a game without achievements."""
+        self._hide()
+        self.list.clear()
+        self.empty_label.pack()
+
+    def reset(self):
+        """Hide the panel and release the rows and icons of the previous game."""
+        self._hide()
+        self.list.clear()
@@ -0,0 +1,174 @@
+import logging
+import Funcs
+import Breaker
+import Scheduler
+import Snapshot
+import History
+# Performance: NumPy is imported inside the functions that need it; it is only required
+# for analytics and is never loaded by the viewer itself.
+
+# Playtime histogram bin edges in hours
+PLAYTIME_BINS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float('inf'))
+
+
+class LibraryArrays:
+    """A user's library flattened into parallel NumPy arrays.
+
+    Games are indexed 0..n_games-1; every achievement row stores the index of its game,
+    whether it is unlocked and its global unlock percentage (NaN when unknown).
+    """
+    def __init__(self, appids, names, playtime, ach_game, ach_unlocked, ach_percent, ach_names):
+        self.appids = appids                # int64[n_games]
+        self.names = names                  # list[str], per game
+        self.playtime = playtime            # int64[n_games], minutes
+        self.ach_game = ach_game            # int32[n_achievements]
+        self.ach_unlocked = ach_unlocked    # bool[n_achievements]
+        self.ach_percent = ach_percent      # float32[n_achievements]
+        self.ach_names = ach_names          # list[str], per achievement
+
+    def __len__(self):
+        return len(self.appids)
+
+
+def build(games, achievements_by_appid, global_by_appid=None):
+    """Return LibraryArrays for owned games and {appid: achievements} / {appid: global percentages}."""
+    import numpy as np
+    global_by_appid = global_by_appid or {}
+    appids = np.fromiter((g['appid'] for g in games), dtype=np.int64, count=len(games))
+    playtime = np.fromiter((g.get('playtime_forever', 0) for g in games), dtype=np.int64, count=len(games))
+    names = [g.get('name', str(g['appid'])) for g in games]
+
+    ach_game, ach_unlocked, ach_percent, ach_names = [], [], [], []
+    for index, game in enumerate(games):
+        achievements = achievements_by_appid.get(game['appid'])
+        if not achievements:
+            continue
+        percentages = {a['name']: a['percent'] for a in global_by_appid.get(game['appid']) or ()}
+        ach_game.extend([index] * len(achievements))
+        for ach in achievements:
+            apiname = ach.get('apiname')
+            ach_names.append(apiname)
+            ach_unlocked.append(ach.get('achieved', 0) == 1)
+            ach_percent.append(percentages.get(apiname, np.nan))
+    return LibraryArrays(appids, names, playtime,
+                         np.array(ach_game, dtype=np.int32),
+                         np.array(ach_unlocked, dtype=bool),
+                         np.array(ach_percent, dtype=np.float32),
+                         ach_names)
+# Performance: Building the arrays is the only per-achievement Python loop; every
+# aggregate below is a handful of vectorized passes over them.
+
+def overall_completion(library):
+    """Return the fraction of all achievements in the library that are unlocked."""
+    if not len(library.ach_unlocked):
+        return 0.0
+    return float(library.ach_unlocked.mean())
+
+def completion_per_game(library):
+    """Return float64[n_games] of per-game completion; NaN for games without achievements."""
+    import numpy as np
+    n = len(library)
+    total = np.bincount(library.ach_game, minlength=n)
+    unlocked = np.bincount(library.ach_game, weights=library.ach_unlocked, minlength=n)
+    completion = np.full(n, np.nan)
+    np.divide(unlocked, total, out=completion, where=total > 0)
+    return completion
+
+def rarest_unlocked(library, k=10):
+    """Return [(appid, game_name, apiname, percent)] for the k rarest unlocked achievements."""
+    import numpy as np
+    candidates = np.flatnonzero(library.ach_unlocked & ~np.isnan(library.ach_percent))
+    if not len(candidates) or k <= 0:
+        return []
+    percent = library.ach_percent[candidates]
+    if len(candidates) > k:
+        keep = np.argpartition(percent, k - 1)[:k]
+        candidates, percent = candidates[keep], percent[keep]
+    order = np.argsort(percent, kind='stable')
+    result = []
+    for row in candidates[order]:
+        game = library.ach_game[row]
+        result.append((int(library.appids[game]), library.names[game], library.ach_names[row],
+                       float(library.ach_percent[row])))
+    return result
+# Performance: argpartition selects the k smallest in O(n); only those k are sorted.
+
+def playtime_distribution(library, bins=PLAYTIME_BINS):
+    """Return {'bins', 'counts', 'total_hours', 'median_hours', 'p90_hours', 'unplayed'}."""
+    import numpy as np
+    hours = library.playtime / 60.0
+    counts, _ = np.histogram(hours, bins=np.asarray(bins, dtype=np.float64))
+    played = hours[hours > 0]
+    return {
+        'bins': list(bins),
+        'counts': counts.tolist(),
+        'total_hours': float(hours.sum()),
+        'median_hours': float(np.median(played)) if len(played) else 0.0,
+        'p90_hours': float(np.percentile(played, 90)) if len(played) else 0.0,
+        'unplayed': int((hours == 0).sum()),
+    }
+
+def summarize(library, k=10):
+    """Return all library-level aggregates as one dict."""
+    import numpy as np
+    completion = completion_per_game(library)
+    with_achievements = ~np.isnan(completion)
+    return {
+        'games': len(library),
+        'achievements': int(len(library.ach_unlocked)),
+        'unlocked': int(library.ach_unlocked.sum()),
+        'overall_completion': overall_completion(library),
+        'perfect_games': int((completion[with_achievements] == 1.0).sum()),
+        'average_game_completion': float(completion[with_achievements].mean()) if with_achievements.any() else 0.0,
+        'rarest_unlocked': rarest_unlocked(library, k),
+        'playtime': playtime_distribution(library),
+    }
+
+
+def _load_game(steam_id, appid):
+    cached = Snapshot.load_achievements(steam_id, appid, fresh_for='player_achievements')
+    if cached is not None:
+        return cached
+    achievements = None
+    if not Funcs.OFFLINE:
+        import requests
+        try:
+            achievements = Funcs.fetch_player_achievements(steam_id, appid)
+        except (requests.RequestException, Breaker.CircuitOpenError, ValueError) as e:
+            logging.warning("Cannot refresh achievements for appid %s, using the snapshot: %s", appid, e)
+    if achievements is None:
+        return Snapshot.load_achievements(steam_id, appid) or ([], [])
+    global_achievements = Funcs.get_global_achievements(appid) if achievements else []
+    if achievements:
+        Snapshot.save_achievements(steam_id, appid, achievements, global_achievements)
+        History.record_achievements(steam_id, appid, achievements)
+    return achievements, global_achievements
+# Design Rationale: A snapshot is only trusted for as long as the matching API response
+# would be; after that it is refetched, and used as-is only offline or when Steam fails.
+
+def load_user(steam_id, scheduler=None):
+    """Load a user's games and per-game achievement data into LibraryArrays, or None.
+
+    Recent snapshots are read from disk; the rest are fetched as background work on the
+    shared scheduler and snapshotted for next time.
+    """
+    games = Snapshot.load_library(steam_id, fresh_for='owned_games')
+    if games is None and not Funcs.OFFLINE:
+        games = Funcs.get_owned_games(steam_id)
+    if games is None:
+        games = Snapshot.load_library(steam_id)
+    if games is None:
+        return None
+    scheduler = scheduler or Scheduler.get_scheduler()
+    futures = {game['appid']: scheduler.submit(_load_game, steam_id, game['appid'],
+                                               priority=Scheduler.BACKGROUND, group='analytics')
+               for game in games}
+    achievements_by_appid, global_by_appid = {}, {}
+    for appid, future in futures.items():
+        try:
+            achievements_by_appid[appid], global_by_appid[appid] = future.result()
+        except Exception as e:
+            logging.error("Cannot load achievements for appid %s: %s", appid, e)
+    return build(games, achievements_by_appid, global_by_appid)
+# Design Rationale: Loading goes through the snapshot store so a second run over the
+# same library costs no API calls.
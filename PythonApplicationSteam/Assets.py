@@ -0,0 +1,113 @@
+import os
+import time
+import logging
+import threading
+
+CDN_BASE = "https://steamcdn-a.akamaihd.net/steam/apps"
+
+# Store-art variants served for most apps, as (file name, (width, height))
+GAME_VARIANTS = (
+    ('capsule_sm_120.jpg', (120, 45)),
+    ('capsule_184x69.jpg', (184, 69)),
+    ('capsule_231x87.jpg', (231, 87)),
+    ('header.jpg', (460, 215)),
+    ('capsule_467x181.jpg', (467, 181)),
+    ('capsule_616x353.jpg', (616, 353)),
+)
+# Every app has a header, so every fallback chain includes it
+FALLBACK_VARIANT = 'header.jpg'
+# Seconds a 404 for an app's variant is remembered before it is tried again
+NEGATIVE_TTL = 7 * 24 * 3600
+NEGATIVE_CACHE_FILE = 'missing_assets.tsv'
+
+
+def variant_chain(size):
+    """Return variant file names to try for a display size, best first.
+
+    Variants at least as large as size come first, smallest first, up to the header,
+    which every chain includes; smaller variants follow as a last resort.
+    """
+    width, height = size
+    by_area = sorted(GAME_VARIANTS, key=lambda v: v[1][0] * v[1][1])
+    chain = []
+    for name, (w, h) in by_area:
+        if w >= width and h >= height:
+            chain.append(name)
+            if name == FALLBACK_VARIANT:
+                break
+    if FALLBACK_VARIANT not in chain:
+        chain.append(FALLBACK_VARIANT)
+    return chain + [name for name, (w, h) in reversed(by_area) if name not in chain and (w < width or h < height)]
+# Performance: A 184x69 capsule is about a tenth of the bytes of the 460x215 header and
+# needs no resize; the header is only downloaded for games without the capsule.
+
+def variant_url(appid, variant):
+    return f"{CDN_BASE}/{appid}/{variant}"
+
+def variant_cache_path(cache_dir, appid, variant):
+    """Return the cache file for a variant; headers keep the original {appid}.jpg name."""
+    if variant == FALLBACK_VARIANT:
+        return os.path.join(cache_dir, f"{appid}.jpg")
+    return os.path.join(cache_dir, f"{appid}_{os.path.splitext(variant)[0]}.jpg")
+# Design Rationale: Headers cached before variants existed stay valid.
+
+
+class NegativeCache:
+    """Remembers (appid, variant) pairs that returned 404, in an append-only file."""
+    def __init__(self, path=None, ttl=NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.missing = {}    # key -> time recorded
+        self.lock = threading.Lock()
+        if path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    key, _, recorded = line.rstrip('\n').rpartition('\t')
+                    try:
+                        self.missing[key] = float(recorded)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logging.warning("Cannot read negative asset cache %s: %s", self.path, e)
+
+    def __contains__(self, key):
+        with self.lock:
+            recorded = self.missing.get(key)
+        return recorded is not None and time.time() - recorded < self.ttl
+
+    def add(self, key):
+        now = time.time()
+        with self.lock:
+            self.missing[key] = now
+            if not self.path:
+                return
+            try:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(f"{key}\t{now}\n")
+            except OSError as e:
+                logging.warning("Cannot record missing asset %s: %s", key, e)
+# Performance: Appending one line per 404 keeps recording O(1); the file is read once per run
+# and later lines for the same key simply overwrite earlier ones.
+
+
+_negative = NegativeCache()
+
+def init(cache_dir):
+    """Persist 404 results under cache_dir so later runs skip missing variants."""
+    global _negative
+    _negative = NegativeCache(os.path.join(cache_dir, NEGATIVE_CACHE_FILE))
+
+def candidates(appid, size, cache_dir):
+    """Return [(variant, url, cache_path)] to try for a game image, skipping known 404s."""
+    return [(variant, variant_url(appid, variant), variant_cache_path(cache_dir, appid, variant))
+            for variant in variant_chain(size) if f"{appid}/{variant}" not in _negative]
+
+def mark_missing(appid, variant):
+    """Record that an app has no such variant on the CDN."""
+    _negative.add(f"{appid}/{variant}")
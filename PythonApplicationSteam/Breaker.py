@@ -0,0 +1,133 @@
+import time
+import logging
+import threading
+import Scheduler
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Consecutive failures that open a breaker
+FAILURE_THRESHOLD = 5
+# Seconds an open breaker waits before probing, doubled after each failed probe
+COOLDOWN = 10.0
+MAX_COOLDOWN = 120.0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the endpoint's breaker is open."""
+    def __init__(self, name):
+        super().__init__(f"Circuit open for {name}")
+        self.name = name
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures for an endpoint or host and fails fast while open."""
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, max_cooldown=MAX_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probe = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Return True if requests may be sent; only closed breakers let traffic through."""
+        return self.state == CLOSED
+    # Design Rationale: While open or half-open, only the background probe reaches the
+    # endpoint, so a degraded Steam costs one request per cooldown instead of thousands.
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            if self.state == CLOSED:
+                return
+            self.cooldown = self.base_cooldown
+            self._set_state(CLOSED)
+
+    def record_failure(self, probe=None):
+        """Count a failure; probe is a callable that retries the request for half-open checks."""
+        with self.lock:
+            self.failures += 1
+            if probe is not None:
+                self.probe = probe
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self._set_state(OPEN)
+        timer = threading.Timer(self.cooldown, self._start_probe)
+        timer.daemon = True
+        timer.start()
+
+    def _start_probe(self):
+        with self.lock:
+            if self.state != OPEN:
+                return
+            self._set_state(HALF_OPEN)
+            probe = self.probe
+        if probe is None:
+            self.record_success()
+            return
+        try:
+            Scheduler.get_scheduler().submit(probe, priority=Scheduler.BACKGROUND, group='probe')
+        except RuntimeError as e:
+            logging.warning("Cannot probe %s: %s", self.name, e)
+    # Design Rationale: The probe reports back through record_success/record_failure, so
+    # the breaker closes as soon as one retry of a failed request succeeds.
+
+    def _set_state(self, state):
+        self.state = state
+        logging.warning("Circuit breaker for %s is %s", self.name, state)
+        _notify(self.name, state)
+
+
+_breakers = {}
+_listeners = []
+_registry_lock = threading.Lock()
+
+def get_breaker(name):
+    """Return the shared breaker for an endpoint or host, creating it on first use."""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def states():
+    """Return {name: state} for every breaker that is not closed."""
+    with _registry_lock:
+        return {name: b.state for name, b in _breakers.items() if b.state != CLOSED}
+
+def add_listener(callback):
+    """Call callback(name, state) from any thread whenever a breaker changes state."""
+    with _registry_lock:
+        _listeners.append(callback)
+
+def remove_listener(callback):
+    with _registry_lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+def _notify(name, state):
+    with _registry_lock:
+        listeners = list(_listeners)
+    for callback in listeners:
+        try:
+            callback(name, state)
+        except Exception as e:
+            logging.error("Circuit breaker listener failed: %s", e)
+
+def reset():
+    """Forget all breakers; open breakers' pending probes become no-ops."""
+    with _registry_lock:
+        for b in _breakers.values():
+            b.state = CLOSED
+        _breakers.clear()
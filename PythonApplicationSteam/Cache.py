@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import Scheduler
+import Http
+import Breaker
+import Codec
+# Performance: requests is imported lazily; this module is loaded by Funcs at startup.
+
+# Seconds after which a cached entry is revalidated, per asset type
+REVALIDATE_INTERVALS = {
+    'header': 7 * 24 * 3600,
+    'icon': 30 * 24 * 3600,
+    'owned_games': 10 * 60,
+    'player_achievements': 5 * 60,
+    'global_achievements': 24 * 3600,
+    'game_schema': 24 * 3600,
+    'most_played': 24 * 3600,
+    'friend_list': 60 * 60,
+    'vanity_url': 24 * 3600,
+    'player_summaries': 24 * 3600,
+}
+DEFAULT_INTERVAL = 24 * 3600
+# Design Rationale: Store artwork and global stats change rarely; a player's library and
+# unlocks change often. Override entries here to tune revalidation per deployment.
+# Compress stored API responses with zlib; off, because decompressing costs most of the
+# parse time the codec saves over JSON
+COMPRESS_RESPONSES = False
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+def is_fresh(checked_at, asset_type, now=None):
+    """Return True if an entry checked at checked_at does not need revalidation yet."""
+    interval = REVALIDATE_INTERVALS.get(asset_type, DEFAULT_INTERVAL)
+    return (now if now is not None else time.time()) - checked_at < interval
+
+def validators_from(headers):
+    """Extract the ETag and Last-Modified validators from response headers."""
+    etag = headers.get('ETag')
+    last_modified = headers.get('Last-Modified')
+    return {
+        'etag': etag if isinstance(etag, str) else None,
+        'last_modified': last_modified if isinstance(last_modified, str) else None,
+    }
+
+def conditional_headers(validators):
+    """Build If-None-Match / If-Modified-Since request headers from stored validators."""
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+# Performance: A matching validator turns a full download into a bodiless 304 response.
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# Image validators live in a sidecar file next to each cached image; its mtime is
+# the time the image was last confirmed current.
+
+def _meta_path(cache_path):
+    return f"{cache_path}.meta"
+
+def read_image_validators(cache_path):
+    """Return the stored validators for a cached image, or an empty dict."""
+    try:
+        with open(_meta_path(cache_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_image_validators(cache_path, headers):
+    """Store the validators from a response next to a cached image."""
+    try:
+        _write_atomic(_meta_path(cache_path), json.dumps(validators_from(headers)).encode('utf-8'))
+    except OSError as e:
+        logging.error("Cannot write cache metadata for %s: %s", cache_path, e)
+
+def image_checked_at(cache_path):
+    """Return when a cached image was last confirmed current."""
+    try:
+        return os.path.getmtime(_meta_path(cache_path))
+    except OSError:
+        try:
+            return os.path.getmtime(cache_path)
+        except OSError:
+            return 0
+# Performance: One stat call per cache hit decides whether revalidation is due.
+# Design Rationale: Images cached before validators existed count as checked when written.
+
+def revalidate_image(url, cache_path):
+    """Revalidate a cached image with a conditional GET, replacing it if it changed."""
+    import requests
+    headers = conditional_headers(read_image_validators(cache_path))
+    try:
+        response = Http.get(url, headers=headers, default_timeout=5)
+        if response.status_code == 304:
+            if os.path.exists(_meta_path(cache_path)):
+                os.utime(_meta_path(cache_path))
+            else:
+                write_image_validators(cache_path, response.headers)
+            return False
+        response.raise_for_status()
+        _write_atomic(cache_path, response.content)
+        write_image_validators(cache_path, response.headers)
+        logging.info("Updated cached image %s", cache_path)
+        return True
+    except (requests.RequestException, Breaker.CircuitOpenError, OSError) as e:
+        logging.warning("Failed to revalidate image %s: %s", url, e)
+        return False
+
+def schedule_image_revalidation(url, cache_path, asset_type):
+    """Revalidate a cached image in the background if its interval has elapsed."""
+    if is_fresh(image_checked_at(cache_path), asset_type):
+        return None
+    with _pending_lock:
+        if cache_path in _pending:
+            return None
+        _pending.add(cache_path)
+    future = Scheduler.get_scheduler().submit(revalidate_image, url, cache_path,
+                                              priority=Scheduler.BACKGROUND, group='revalidate')
+    future.add_done_callback(lambda f: _discard_pending(cache_path))
+    return future
+# Design Rationale: The cached image is shown immediately; an updated image is picked up
+# the next time it is loaded.
+
+def _discard_pending(cache_path):
+    with _pending_lock:
+        _pending.discard(cache_path)
+
+
+class ResponseStore:
+    """Disk store for Steam API payloads and their HTTP validators."""
+    def __init__(self, directory, compress=COMPRESS_RESPONSES):
+        self.directory = directory
+        self.compress = compress
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            logging.error("Failed to create response cache %s: %s", directory, e)
+            raise
+
+    def _digest(self, url, params):
+        public = sorted((k, str(v)) for k, v in (params or {}).items() if k != 'key')
+        return hashlib.sha1(json.dumps([url, public]).encode('utf-8')).hexdigest()
+    # Security: The API key is excluded from the cache key and never written to disk.
+
+    def _path(self, url, params):
+        return os.path.join(self.directory, f"{self._digest(url, params)}.bin")
+
+    def _json_path(self, url, params):
+        return os.path.join(self.directory, f"{self._digest(url, params)}.json")
+    # Design Rationale: Entries written as JSON by earlier versions are still read, and
+    # replaced by the binary form the next time they are stored.
+
+    def get(self, url, params):
+        """Return the stored entry ({'payload', 'etag', 'last_modified', 'checked_at'}) or None."""
+        path = self._path(url, params)
+        try:
+            with open(path, 'rb') as f:
+                entry = Codec.loads(f.read())
+            entry['checked_at'] = os.path.getmtime(path)
+            return entry
+        except FileNotFoundError:
+            return self._get_json(url, params)
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring unreadable cached response %s: %s", path, e)
+            return None
+    # Performance: Payloads are stored column by column (see Codec), so a warm load of a
+    # 10k-game library decodes typed arrays instead of parsing 3 MB of JSON.
+
+    def _get_json(self, url, params):
+        path = self._json_path(url, params)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['checked_at'] = os.path.getmtime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring unreadable cached response %s: %s", path, e)
+            return None
+
+    def put(self, url, params, payload, headers):
+        """Store a payload with the validators from its response headers."""
+        entry = dict(validators_from(headers), payload=payload)
+        try:
+            _write_atomic(self._path(url, params), Codec.dumps(entry, compress=self.compress))
+        except (OSError, TypeError) as e:
+            logging.error("Cannot write cached response for %s: %s", url, e)
+            return
+        try:
+            os.remove(self._json_path(url, params))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning("Cannot remove old cached response for %s: %s", url, e)
+
+    def touch(self, url, params):
+        """Mark a stored payload as confirmed current after a 304 response."""
+        path = self._path(url, params)
+        if not os.path.exists(path):
+            path = self._json_path(url, params)
+        try:
+            os.utime(path)
+        except OSError as e:
+            logging.warning("Cannot update cached response for %s: %s", url, e)
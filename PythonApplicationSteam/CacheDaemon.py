@@ -0,0 +1,425 @@
+import os
+import sys
+import json
+import time
+import stat
+import socket
+import struct
+import logging
+import argparse
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import Breaker
+# Design Rationale: The client half only needs the standard library, so Funcs and
+# Thumbnails can check for a running daemon without importing anything heavy. The server
+# half imports Funcs, Cache and Thumbnails when it starts.
+
+def _default_socket_path():
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    runtime = os.getenv('XDG_RUNTIME_DIR')
+    if runtime and _is_private_dir(runtime):
+        return os.path.join(runtime, "steam-cache.sock")
+    return os.path.join(tempfile.gettempdir(), f"steam-cache-{uid}", "cache.sock")
+# Security: The socket lives in a directory only this user can enter, never directly in
+# the shared temp directory where another user could create the path first.
+
+def _is_private_dir(path):
+    """Return True if path is a real directory owned by this user that nobody else can use."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and _owned(st) and not st.st_mode & 0o077
+
+def _owned(st):
+    return not hasattr(os, 'getuid') or st.st_uid == os.getuid()
+
+# Unix socket of the shared cache daemon; clients use it whenever it exists and is owned by this user
+SOCKET_PATH = os.getenv('STEAM_CACHE_SOCKET') or _default_socket_path()
+# Seconds a client stops trying the daemon after it failed to answer
+RETRY_SECONDS = 5.0
+# Bytes of images the daemon keeps in shared memory
+MAX_SHARED_BYTES = 256 * 1024 * 1024
+# Shared segments kept when the open-files limit is unknown or unlimited
+MAX_SEGMENTS = 4096
+# Fraction of the open-files limit shared segments may use; each holds one descriptor
+SEGMENT_FD_FRACTION = 0.25
+
+_local = threading.local()
+_down_until = 0.0
+_created = set()    # Segment names created by a daemon in this process
+
+
+def _max_segments():
+    """Return how many shared segments fit in this process's open-files limit."""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError, ValueError):
+        return MAX_SEGMENTS
+    if soft == resource.RLIM_INFINITY:
+        return MAX_SEGMENTS
+    return max(1, min(MAX_SEGMENTS, int(soft * SEGMENT_FD_FRACTION)))
+# Design Rationale: Small thumbnails reach the descriptor limit long before the byte
+# budget, so the segment count is capped as well, leaving most descriptors for sockets
+# and cache files.
+
+
+class Unavailable(Exception):
+    """The daemon is not running or stopped answering; callers fall back to local caches."""
+
+
+def enabled():
+    """Return True if requests should go through the daemon."""
+    if getattr(_local, 'in_daemon', False) or not hasattr(socket, 'AF_UNIX'):
+        return False
+    return time.monotonic() >= _down_until and _trusted_socket(SOCKET_PATH)
+# Performance: One stat call per fetch while no daemon runs; the daemon's own threads
+# never route requests back to themselves.
+
+def _trusted_socket(path):
+    """Return True if path is a socket, not a link to one, owned by this user."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode):
+        return False
+    if not _owned(st):
+        logging.warning("Ignoring cache daemon socket %s owned by uid %s", path, st.st_uid)
+        return False
+    return True
+
+def _check_peer(sock):
+    """Raise ConnectionRefusedError unless the process behind sock runs as this user."""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _, uid, _ = struct.unpack('3i', creds)
+    if uid != os.getuid():
+        raise ConnectionRefusedError(f"cache daemon runs as uid {uid}")
+# Security: Requests carry the API key and replies are trusted as cached payloads, so the
+# client checks both the socket's owner and, where the OS reports it, the peer's uid.
+
+def _connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None or conn[0] != SOCKET_PATH:
+        if not _trusted_socket(SOCKET_PATH):
+            raise ConnectionRefusedError(f"untrusted cache daemon socket {SOCKET_PATH}")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(SOCKET_PATH)
+            _check_peer(sock)
+        except OSError:
+            sock.close()
+            raise
+        conn = _local.conn = (SOCKET_PATH, sock, sock.makefile('rb'))
+    return conn
+
+def _call(request):
+    """Send one request on this thread's connection and return the decoded reply."""
+    global _down_until
+    try:
+        _, sock, reader = _connection()
+        sock.sendall(json.dumps(request, separators=(',', ':')).encode('utf-8') + b'\n')
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("cache daemon closed the connection")
+        return json.loads(line)
+    except (OSError, ValueError) as e:
+        conn = getattr(_local, 'conn', None)
+        _local.conn = None
+        if conn:
+            conn[1].close()
+        _down_until = time.monotonic() + RETRY_SECONDS
+        logging.warning("Cache daemon unavailable, using local caches: %s", e)
+        raise Unavailable(str(e)) from e
+# Performance: Each thread keeps one connection open, so a request costs one round trip
+# over the socket rather than a connect per fetch.
+
+def _read_shared(name, size):
+    from multiprocessing import shared_memory, resource_tracker
+    shm = shared_memory.SharedMemory(name=name)
+    if name not in _created:
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    try:
+        return bytes(shm.buf[:size])
+    finally:
+        shm.close()
+# Design Rationale: Only the daemon may unlink a segment; attaching registers it with
+# this process's resource tracker, which would otherwise unlink it when the process exits.
+
+def _image_reply(reply, cache_path):
+    if reply.get('missing') or 'error' in reply:
+        return None
+    if 'shm' in reply:
+        try:
+            return _read_shared(reply['shm'], reply['size'])
+        except FileNotFoundError:
+            pass  # Evicted between the reply and the attach; the daemon has written the file
+    try:
+        with open(cache_path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def fetch_image(url, cache_path, asset_type='header'):
+    """Return image bytes through the daemon (see Thumbnails.fetch_image_bytes); raises Unavailable."""
+    cache_path = os.path.abspath(cache_path)
+    reply = _call({'op': 'image', 'url': url, 'cache_path': cache_path, 'asset_type': asset_type})
+    return _image_reply(reply, cache_path)
+
+def download(url, cache_path):
+    """Download an image through the daemon (see Thumbnails.download_to_cache); raises Unavailable."""
+    cache_path = os.path.abspath(cache_path)
+    reply = _call({'op': 'download', 'url': url, 'cache_path': cache_path})
+    return reply.get('status'), _image_reply(reply, cache_path)
+
+def get_json(url, params, asset_type):
+    """Return an API payload through the daemon (see Funcs._get_json); raises Unavailable."""
+    reply = _call({'op': 'api', 'url': url, 'params': params, 'asset_type': asset_type})
+    if 'circuit' in reply:
+        raise Breaker.CircuitOpenError(reply['circuit'])
+    if 'error' in reply:
+        import requests
+        raise requests.RequestException(reply['error'])
+    return reply['payload']
+
+
+class CacheServer:
+    """Owns the image and API caches for every process on the host."""
+    def __init__(self, socket_path=None, max_shared_bytes=MAX_SHARED_BYTES, max_segments=None):
+        self.socket_path = socket_path or SOCKET_PATH
+        self.max_shared_bytes = max_shared_bytes
+        self.max_segments = max_segments or _max_segments()
+        self.segments = OrderedDict()   # cache_path -> (shm, size, mtime), least recently used first
+        self.shared_bytes = 0
+        self.inflight = {}              # request key -> Future
+        self.lock = threading.Lock()
+        self.server = None
+
+    def _once(self, key, fn):
+        """Run fn for the first caller with key; concurrent callers wait for its result."""
+        with self.lock:
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                del self.inflight[key]
+    # Performance: Forty kiosks opening the same library cost one download per image.
+
+    def _shared_hit(self, cache_path):
+        with self.lock:
+            segment = self.segments.get(cache_path)
+            if segment is None:
+                return None
+            try:
+                current = os.path.getmtime(cache_path) == segment[2]
+            except OSError:
+                current = False
+            if not current:
+                self._evict(cache_path)
+                return None
+            self.segments.move_to_end(cache_path)
+            return {'shm': segment[0].name, 'size': segment[1]}
+    # Design Rationale: A revalidation that rewrote the file changes its mtime, so the
+    # next request loads the new image instead of serving the old shared copy.
+
+    def _share(self, cache_path, data):
+        from multiprocessing import shared_memory
+        if not data or len(data) > self.max_shared_bytes:
+            return {}
+        try:
+            mtime = os.path.getmtime(cache_path)
+        except OSError:
+            return {}
+        with self.lock:
+            if cache_path in self.segments:
+                self._evict(cache_path)
+            while self.segments and len(self.segments) >= self.max_segments:
+                self._evict(next(iter(self.segments)))
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=len(data))
+        except OSError as e:
+            logging.warning("Cannot share %s, clients will read the file: %s", cache_path, e)
+            return {}
+        shm.buf[:len(data)] = data
+        if getattr(shm, '_fd', -1) >= 0:
+            os.close(shm._fd)
+            shm._fd = -1
+        with self.lock:
+            _created.add(shm.name)
+            if cache_path in self.segments:
+                self._evict(cache_path)
+            self.segments[cache_path] = (shm, len(data), mtime)
+            self.shared_bytes += len(data)
+            while self.shared_bytes > self.max_shared_bytes or len(self.segments) > self.max_segments:
+                self._evict(next(iter(self.segments)))
+        return {'shm': shm.name, 'size': len(data)}
+    # Performance: The shm_open descriptor is closed once the segment is mapped; the
+    # mapping keeps its own, so each shared image costs one descriptor instead of two.
+    # Design Rationale: A segment that cannot be created is not an error; the image is
+    # already on disk, and an empty reply sends the client to the file.
+
+    def _evict(self, cache_path):
+        shm, size, _ = self.segments.pop(cache_path)
+        self.shared_bytes -= size
+        _created.discard(shm.name)
+        shm.close()
+        shm.unlink()
+
+    def trim(self, fraction):
+        """Evict the least recently used fraction of shared bytes; return the bytes freed."""
+        with self.lock:
+            target = self.shared_bytes * (1 - fraction)
+            before = self.shared_bytes
+            while self.segments and self.shared_bytes > target:
+                self._evict(next(iter(self.segments)))
+            return before - self.shared_bytes
+    # Design Rationale: Evicted images stay on disk, so clients fall back to reading the file.
+
+    def image(self, request):
+        import Thumbnails
+        import Cache
+        cache_path = request['cache_path']
+        hit = self._shared_hit(cache_path)
+        if hit:
+            Cache.schedule_image_revalidation(request['url'], cache_path, request.get('asset_type', 'header'))
+            return hit
+        def load():
+            data = Thumbnails.fetch_image_bytes(request['url'], cache_path, request.get('asset_type', 'header'))
+            return self._share(cache_path, data) if data is not None else {'missing': True}
+        return self._once(('file', cache_path), load)
+
+    def download(self, request):
+        import Thumbnails
+        cache_path = request['cache_path']
+        def load():
+            status, data = Thumbnails.download_to_cache(request['url'], cache_path)
+            if data is None:
+                return {'status': status, 'missing': True}
+            return dict(self._share(cache_path, data), status=status)
+        return self._once(('file', cache_path), load)
+
+    def api(self, request):
+        import requests
+        import Funcs
+        url, params = request['url'], request.get('params') or {}
+        key = ('api', url, json.dumps(params, sort_keys=True))
+        try:
+            return {'payload': self._once(key, lambda: Funcs._get_json(url, params, request['asset_type']))}
+        except Breaker.CircuitOpenError as e:
+            return {'circuit': e.name}
+        except requests.RequestException as e:
+            return {'error': str(e)}
+
+    def dispatch(self, request):
+        op = request.get('op')
+        if op == 'image':
+            return self.image(request)
+        if op == 'download':
+            return self.download(request)
+        if op == 'api':
+            return self.api(request)
+        return {'error': f"unknown operation {op!r}"}
+
+    def serve_forever(self):
+        """Listen on the socket until shutdown() is called."""
+        import socketserver
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                _local.in_daemon = True
+                for line in self.rfile:
+                    try:
+                        reply = daemon.dispatch(json.loads(line))
+                    except Exception as e:
+                        logging.error("Cache daemon request failed: %s", e)
+                        reply = {'error': str(e)}
+                    self.wfile.write(json.dumps(reply, separators=(',', ':')).encode('utf-8') + b'\n')
+
+        self._prepare_socket_dir()
+        umask = os.umask(0o177)
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(umask)
+        self.server.daemon_threads = True
+        # Security: The socket is created 0600 under a 0700 directory, so there is no moment
+        # at which another user can connect; requests carry API keys.
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+            with self.lock:
+                for cache_path in list(self.segments):
+                    self._evict(cache_path)
+
+    def _prepare_socket_dir(self):
+        """Create the socket's directory 0700 and remove a stale socket; refuse paths other users control."""
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+        if not _is_private_dir(directory):
+            raise PermissionError(f"{directory} must be a directory owned by this user with mode 0700")
+        try:
+            st = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(st.st_mode) or not _owned(st):
+            raise PermissionError(f"{self.socket_path} exists and is not this user's socket")
+        os.unlink(self.socket_path)  # Left behind by a daemon that did not shut down cleanly
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+def main(argv=None):
+    """Command line entry point: run the cache daemon in the foreground."""
+    parser = argparse.ArgumentParser(description="Share the Steam image and API caches between processes")
+    parser.add_argument('--socket', default=SOCKET_PATH)
+    parser.add_argument('--api-cache-dir', default='api_cache')
+    parser.add_argument('--shared-mb', type=int, default=MAX_SHARED_BYTES // (1024 * 1024))
+    parser.add_argument('--memory-limit-mb', type=int)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    import Funcs
+    import Cache
+    Funcs.RESPONSE_STORE = Cache.ResponseStore(args.api_cache_dir)
+    # Design Rationale: Clients send their own API key with each request, so the daemon
+    # needs none and does not call Funcs.init().
+    server = CacheServer(args.socket, args.shared_mb * 1024 * 1024)
+    import Memory
+    governor = Memory.init(args.memory_limit_mb)
+    governor.register('shared_images', lambda: server.shared_bytes, server.trim)
+    logging.info("Cache daemon listening on %s", args.socket)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    governor.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import logging
+import Funcs
+import Breaker
+import Scheduler
+import Snapshot
+# Design Rationale: Only the standard library is needed; member sets are Python ints used
+# as bitsets, which stay exact and fast for friend lists of any size.
+
+_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+class FriendIndex:
+    """Owned games of a user and their friends, indexed per appid.
+
+    Member 0 is the user. Bit i of owners[appid] is set when member i owns the game;
+    members whose library is private or unavailable are listed in `unavailable`.
+    """
+    def __init__(self, libraries):
+        self.members = []       # SteamIDs, indexed by bit position
+        self.unavailable = []   # SteamIDs without a readable library
+        self.owners = {}        # appid -> int bitset of members owning it
+        self.libraries = []     # int bitset of owned appid slots, per member
+        self.playtime = []      # {appid: minutes}, per member
+        self.names = {}         # appid -> game name, from the user's library
+        self.progress = {}      # appid -> {steam_id: (unlocked, total)}, filled on demand
+        self.profiles = {}      # steam_id -> player summary (display name, avatars), set by load_user
+        for steam_id, games in libraries.items():
+            if games is None:
+                self.unavailable.append(steam_id)
+                continue
+            bit = 1 << len(self.members)
+            self.members.append(steam_id)
+            playtime = {game['appid']: game.get('playtime_forever', 0) for game in games}
+            self.playtime.append(playtime)
+            owners = self.owners
+            for appid in playtime:
+                owners[appid] = owners.get(appid, 0) | bit
+            if not self.names:
+                self.names = {game['appid']: game['name'] for game in games if 'name' in game}
+        self.position = {steam_id: i for i, steam_id in enumerate(self.members)}
+        self.appids = list(self.owners)    # appid per slot
+        slots = {appid: slot for slot, appid in enumerate(self.appids)}
+        for playtime in self.playtime:
+            flags = bytearray(len(self.appids))
+            for appid in playtime:
+                flags[slots[appid]] = 1
+            self.libraries.append(int(flags.translate(_DIGITS)[::-1], 2) if flags else 0)
+    # Performance: The index is built in two passes over every library; all queries below
+    # are bitwise operations over it, so they never touch the network.
+
+    def __len__(self):
+        return len(self.members)
+
+    def mask(self, steam_ids):
+        """Return the bitset of the given members; unknown SteamIDs are ignored."""
+        bits = 0
+        for steam_id in steam_ids:
+            position = self.position.get(steam_id)
+            if position is not None:
+                bits |= 1 << position
+        return bits
+
+    def _appids(self, bits):
+        appids = []
+        while bits:
+            low = bits & -bits
+            appids.append(self.appids[low.bit_length() - 1])
+            bits ^= low
+        return appids
+
+    def _ids(self, bits):
+        ids = []
+        while bits:
+            low = bits & -bits
+            ids.append(self.members[low.bit_length() - 1])
+            bits ^= low
+        return ids
+
+    def owner_ids(self, appid):
+        """Return the SteamIDs owning a game, the user first."""
+        return self._ids(self.owners.get(appid, 0))
+
+    def shared(self, steam_ids):
+        """Return the appids owned by every one of the given members, sorted."""
+        positions = {self.position[s] for s in steam_ids if s in self.position}
+        if not positions:
+            return []
+        bits = -1
+        for position in positions:
+            bits &= self.libraries[position]
+        return sorted(self._appids(bits))
+
+    def shared_with_friends(self, min_friends=1):
+        """Return [(appid, friend_count)] for the user's games owned by at least min_friends friends.
+
+        Sorted by friend count, most shared first.
+        """
+        if not self.members:
+            return []
+        result = []
+        for appid, owners in self.owners.items():
+            if owners & 1:
+                count = bin(owners).count('1') - 1
+                if count >= min_friends:
+                    result.append((appid, count))
+        result.sort(key=lambda item: (-item[1], item[0]))
+        return result
+
+    def overlap(self):
+        """Return [(steam_id, shared_games)] for every friend, most games in common first."""
+        if not self.members:
+            return []
+        own = self.libraries[0]
+        counts = [bin(own & library).count('1') for library in self.libraries]
+        ranked = sorted(range(1, len(self.members)), key=lambda i: (-counts[i], i))
+        return [(self.members[i], counts[i]) for i in ranked]
+    # Performance: Per-member bitsets over appid slots turn "games in common" into one AND
+    # and bit count per friend, while the per-game bitsets answer "who owns this" without
+    # scanning members.
+
+    def playtime_leaderboard(self, appid):
+        """Return [(steam_id, minutes)] for the owners of a game, most played first."""
+        owners = self.owner_ids(appid)
+        minutes = [self.playtime[self.position[steam_id]][appid] for steam_id in owners]
+        ranked = sorted(range(len(owners)), key=lambda i: -minutes[i])
+        return [(owners[i], minutes[i]) for i in ranked]
+
+    def achievement_leaderboard(self, appid, scheduler=None):
+        """Return [(steam_id, unlocked, total)] for the owners of a game, furthest along first.
+
+        Achievements are loaded once per game (recent snapshots first, then the API on the
+        shared scheduler) and answered from memory afterwards.
+        """
+        progress = self.progress.get(appid)
+        if progress is None:
+            progress = self.progress[appid] = _load_progress(self.owner_ids(appid), appid, scheduler)
+        ranked = sorted(progress.items(), key=lambda item: (
+            -(item[1][0] / item[1][1] if item[1][1] else 0.0), -item[1][0], self.position[item[0]]))
+        return [(steam_id, unlocked, total) for steam_id, (unlocked, total) in ranked]
+
+
+def _achievements(steam_id, appid):
+    cached = Snapshot.load_achievements(steam_id, appid, fresh_for='player_achievements')
+    if cached is not None:
+        return cached[0]
+    achievements = None
+    if not Funcs.OFFLINE:
+        import requests
+        try:
+            achievements = Funcs.fetch_player_achievements(steam_id, appid)
+        except (requests.RequestException, Breaker.CircuitOpenError, ValueError) as e:
+            logging.warning("Cannot refresh achievements of %s for appid %s, using the snapshot: %s",
+                            steam_id, appid, e)
+    if achievements is None:
+        cached = Snapshot.load_achievements(steam_id, appid)
+        achievements = cached[0] if cached else []
+    return achievements
+
+def _achievement_counts(steam_id, appid):
+    achievements = _achievements(steam_id, appid)
+    unlocked = sum(1 for ach in achievements if ach.get('achieved', 0) == 1)
+    return unlocked, len(achievements)
+
+def _load_progress(steam_ids, appid, scheduler=None):
+    scheduler = scheduler or Scheduler.get_scheduler()
+    futures = {steam_id: scheduler.submit(_achievement_counts, steam_id, appid,
+                                          priority=Scheduler.VISIBLE, group='friends')
+               for steam_id in steam_ids}
+    progress = {}
+    for steam_id, future in futures.items():
+        try:
+            progress[steam_id] = future.result()
+        except Exception as e:
+            logging.error("Cannot load achievements of %s for appid %s: %s", steam_id, appid, e)
+            progress[steam_id] = (0, 0)
+    return progress
+
+def _load_library(steam_id):
+    games = Snapshot.load_library(steam_id, fresh_for='owned_games')
+    if games is None and not Funcs.OFFLINE:
+        games = Funcs.get_owned_games(steam_id)
+    if games is None:
+        games = Snapshot.load_library(steam_id)
+    return games
+# Design Rationale: Snapshots stand in for the API only while its response would still
+# be fresh; older ones are used offline or when the fetch fails, so overlap and
+# leaderboards do not freeze at the first run.
+
+def load_libraries(steam_ids, scheduler=None):
+    """Return {steam_id: games or None}, reading snapshots and fetching the rest concurrently."""
+    scheduler = scheduler or Scheduler.get_scheduler()
+    futures = {steam_id: scheduler.submit(_load_library, steam_id, priority=Scheduler.BACKGROUND, group='friends')
+               for steam_id in dict.fromkeys(steam_ids)}
+    libraries = {}
+    for steam_id, future in futures.items():
+        try:
+            libraries[steam_id] = future.result()
+        except Exception as e:
+            logging.error("Cannot load the library of %s: %s", steam_id, e)
+            libraries[steam_id] = None
+    return libraries
+# Performance: Steam has no multi-user GetOwnedGames, so libraries are fetched as one batch
+# of concurrent requests on the shared scheduler. Each goes through the response store and
+# cache daemon, so a friend already looked up (or warmed) costs no round trip.
+
+def load_user(steam_id, scheduler=None):
+    """Return a FriendIndex for a user and their friends, or None if the user's library is unavailable."""
+    friends = Funcs.get_friend_list(steam_id) or []
+    libraries = load_libraries([steam_id] + [f for f in friends if f != steam_id], scheduler)
+    if libraries.get(steam_id) is None:
+        return None
+    index = FriendIndex(libraries)
+    index.profiles = Funcs.get_player_summaries(libraries)
+    logging.info("Indexed %s games across %s of %s friends of SteamID %s",
+                 len(index.owners), len(index) - 1, len(friends), steam_id)
+    return index
+# Design Rationale: A private friend list still yields an index of the user alone, so the
+# view can render instead of failing.
+# Performance: Names and avatars for the user and every friend come from one
+# GetPlayerSummaries request per 100 profiles, most of them from the cache on a repeat.
@@ -1,76 +1,326 @@
-import requests
-import tkinter as tk
-from tkinter import messagebox, Scrollbar, Canvas, Frame
-from PIL import Image, ImageTk
-import io
 import os
-import threading
 import logging
-from queue import Queue, Empty
+import Cache
+import Http
+import Breaker
+import CacheDaemon
+# Performance: requests is imported inside each fetcher so that importing Funcs
+# (e.g. in worker processes) stays cheap and free of side effects.
 
-# Steam API key from environment variable
-API_KEY = os.getenv('STEAM_API_KEY')
-if not API_KEY:
-    raise ValueError("STEAM_API_KEY environment variable not set")
+# Steam API key, resolved by init() rather than at import time
+API_KEY = None
+# Offline mode: fetchers only use cached responses and never touch the network
+OFFLINE = False
+# Optional Cache.ResponseStore for API payloads, set by init()
+RESPONSE_STORE = None
+# Steam Web API root; init() can point it at a mirror or a local stand-in server
+DEFAULT_API_BASE = "http://api.steampowered.com"
+API_BASE = DEFAULT_API_BASE
+# SteamIDs per GetPlayerSummaries request, the most Steam accepts
+MAX_SUMMARY_IDS = 100
+
+def init(api_key=None, offline=False, response_store=None, api_base=None):
+    """Resolve the Steam API key from the argument or the STEAM_API_KEY environment variable."""
+    global API_KEY, OFFLINE, RESPONSE_STORE, API_BASE
+    OFFLINE = offline
+    RESPONSE_STORE = response_store
+    API_BASE = (api_base or os.getenv('STEAM_API_BASE') or DEFAULT_API_BASE).rstrip('/')
+    API_KEY = api_key or os.getenv('STEAM_API_KEY')
+    if not API_KEY and not offline:
+        raise ValueError("STEAM_API_KEY environment variable not set")
+    return API_KEY
 # Security: Using environment variable prevents hardcoding sensitive API key.
-# Design Rationale: Fail early if key is missing to avoid runtime issues.
+# Design Rationale: Fail early at initialisation if key is missing to avoid runtime issues.
+
+def _api_key():
+    """Return the configured API key, initialising from the environment on first use."""
+    if API_KEY or OFFLINE:
+        return API_KEY
+    return init()
+
+def _get_json(url, params, asset_type, timeout=10, revalidate=False, before_request=None):
+    """GET a Steam API URL and return its JSON, using and revalidating the response store.
+
+    With revalidate, a stored entry is checked with Steam even while it is fresh, and
+    before_request() is called just before a request is actually sent.
+    Returns None in offline mode when nothing is cached; raises requests.RequestException.
+    """
+    import requests
+    if not OFFLINE and not revalidate and before_request is None and CacheDaemon.enabled():
+        try:
+            return CacheDaemon.get_json(url, params, asset_type)
+        except CacheDaemon.Unavailable:
+            pass
+    entry = RESPONSE_STORE.get(url, params) if RESPONSE_STORE else None
+    if OFFLINE:
+        return entry['payload'] if entry else None
+    if entry and not revalidate and Cache.is_fresh(entry['checked_at'], asset_type):
+        return entry['payload']
+    if before_request:
+        before_request()
+    try:
+        response = Http.get(url, params=params, headers=Cache.conditional_headers(entry),
+                            endpoint=url, default_timeout=timeout)
+        if entry and response.status_code == 304:
+            RESPONSE_STORE.touch(url, params)
+            return entry['payload']
+        response.raise_for_status()
+    except (requests.RequestException, Breaker.CircuitOpenError) as e:
+        if entry:
+            logging.warning("Using cached response for %s after error: %s", url, e)
+            return entry['payload']
+        raise
+    payload = response.json()
+    if RESPONSE_STORE:
+        RESPONSE_STORE.put(url, params, payload, response.headers)
+    return payload
+# Performance: Fresh entries cost no round trip and stale ones a conditional GET, so an
+# unchanged payload comes back as a bodiless 304.
+# Design Rationale: A stale cached payload is better than an error when Steam is unreachable.
+# Performance: Http.get shares the scheduler's per-host slots and adapts the timeout and
+# hedging to each API method's observed latency.
+# Performance: With a cache daemon running, every process on the host shares its response
+# store, and concurrent requests for the same payload become one request.
+# Design Rationale: Callers passing before_request, such as a rate-limited warm-up, go to
+# the response store directly so every request they cause passes through the hook.
 
 def get_owned_games(steam_id):
     """Fetch list of games owned by the user."""
-    url = "http://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
+    import requests
+    url = f"{API_BASE}/IPlayerService/GetOwnedGames/v1/"
     params = {
-        "key": API_KEY,
+        "key": _api_key(),
         "steamid": steam_id,
         "include_appinfo": True,
         "include_played_free_games": True
     }
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json().get('response', {})
+        payload = _get_json(url, params, 'owned_games')
+        if payload is None:
+            logging.info("Offline mode; no cached games for SteamID %s", steam_id)
+            return None
+        data = payload.get('response', {})
         if 'games' not in data:
-            logging.warning(f"No games data for SteamID {steam_id}; profile may be private")
+            logging.warning("No games data for SteamID %s; profile may be private", steam_id)
             return None
         games = data.get('games', [])
-        logging.info(f"Fetched {len(games)} games for SteamID {steam_id}")
+        logging.info("Fetched %s games for SteamID %s", len(games), steam_id)
         return games
-    except requests.RequestException as e:
-        logging.error(f"Error fetching owned games: {e}")
+    except (requests.RequestException, Breaker.CircuitOpenError) as e:
+        logging.error("Error fetching owned games: %s", e)
         return None
 # API: Checks for missing 'games' key to detect private profiles.
 # Performance: Timeout of 10s accommodates large game libraries.
 
-def get_player_achievements(steam_id, appid):
-    """Fetch player achievements for a specific game."""
-    url = "http://api.steampowered.com/ISteamUserStats/GetPlayerAchievements/v1/"
+def get_friend_list(steam_id):
+    """Fetch the SteamIDs of a user's friends, or None if the list is private or unavailable."""
+    import requests
+    url = f"{API_BASE}/ISteamUser/GetFriendList/v1/"
     params = {
-        "key": API_KEY,
+        "key": _api_key(),
+        "steamid": steam_id,
+        "relationship": "friend"
+    }
+    try:
+        payload = _get_json(url, params, 'friend_list')
+        if payload is None:
+            return None
+        friends = payload.get('friendslist', {}).get('friends')
+        if friends is None:
+            logging.warning("No friends list for SteamID %s; profile may be private", steam_id)
+            return None
+        return [friend['steamid'] for friend in friends if 'steamid' in friend]
+    except (requests.RequestException, Breaker.CircuitOpenError) as e:
+        logging.error("Error fetching friend list for SteamID %s: %s", steam_id, e)
+        return None
+# API: Steam answers 401 for private friend lists, which surfaces here as an HTTP error.
+
+def resolve_vanity_url(name):
+    """Fetch the ResolveVanityURL response for a custom profile name, or None on error.
+
+    The response is {'success': 1, 'steamid': ...} for a match and {'success': 42, ...}
+    when no profile uses the name.
+    """
+    import requests
+    url = f"{API_BASE}/ISteamUser/ResolveVanityURL/v1/"
+    params = {
+        "key": _api_key(),
+        "vanityurl": name,
+        "url_type": 1
+    }
+    try:
+        payload = _get_json(url, params, 'vanity_url')
+        if payload is None:
+            return None
+        return payload.get('response')
+    except (requests.RequestException, Breaker.CircuitOpenError) as e:
+        logging.error("Error resolving vanity name %s: %s", name, e)
+        return None
+# API: url_type 1 restricts the lookup to individual profiles, not groups.
+
+def get_player_summaries(steam_ids):
+    """Fetch {steam_id: summary} with display names and avatars, MAX_SUMMARY_IDS per request.
+
+    Summaries are cached per SteamID, so only IDs without a fresh summary are requested.
+    IDs Steam does not know are left out of the result.
+    """
+    import requests
+    url = f"{API_BASE}/ISteamUser/GetPlayerSummaries/v2/"
+    summaries, missing, stale = {}, [], {}
+    for steam_id in dict.fromkeys(str(s) for s in steam_ids):
+        entry = RESPONSE_STORE.get(url, {"steamids": steam_id}) if RESPONSE_STORE else None
+        players = entry['payload'].get('response', {}).get('players', []) if entry else []
+        if players and (OFFLINE or Cache.is_fresh(entry['checked_at'], 'player_summaries')):
+            summaries[steam_id] = players[0]
+        else:
+            missing.append(steam_id)
+            if players:
+                stale[steam_id] = players[0]
+    if OFFLINE:
+        return summaries
+    for start in range(0, len(missing), MAX_SUMMARY_IDS):
+        batch = missing[start:start + MAX_SUMMARY_IDS]
+        params = {
+            "key": _api_key(),
+            "steamids": ",".join(batch)
+        }
+        try:
+            response = Http.get(url, params=params, endpoint=url, default_timeout=10)
+            response.raise_for_status()
+            players = response.json().get('response', {}).get('players', [])
+        except (requests.RequestException, Breaker.CircuitOpenError, ValueError) as e:
+            logging.error("Error fetching %s player summaries: %s", len(batch), e)
+            summaries.update((s, stale[s]) for s in batch if s in stale)
+            continue
+        requested = set(batch)
+        for player in players:
+            steam_id = player.get('steamid')
+            if steam_id in requested:
+                summaries[steam_id] = player
+                if RESPONSE_STORE:
+                    RESPONSE_STORE.put(url, {"steamids": steam_id}, {'response': {'players': [player]}}, {})
+    return summaries
+# Performance: One request covers up to 100 profiles, and each summary is stored under its
+# own SteamID, so a friend list that overlaps an earlier one only requests the new IDs.
+# Design Rationale: Batches vary from call to call, so the response store and cache daemon
+# are bypassed for the request itself; a stale summary is still returned if Steam fails.
+
+def fetch_player_achievements(steam_id, appid):
+    """Fetch player achievements for a game, raising on network, server and breaker errors.
+
+    Returns [] when Steam reports no stats for the player (a private profile or a game
+    without achievements), and None in offline mode when nothing is cached. Raises
+    requests.RequestException, Breaker.CircuitOpenError or ValueError for a malformed body.
+    """
+    import requests
+    url = f"{API_BASE}/ISteamUserStats/GetPlayerAchievements/v1/"
+    params = {
+        "key": _api_key(),
         "steamid": steam_id,
         "appid": appid
     }
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json().get('playerstats', {})
-        if data.get('success'):
-            logging.info(f"Fetched achievements for appid {appid}")
-            return data.get('achievements', [])
+        payload = _get_json(url, params, 'player_achievements')
+    except requests.HTTPError as e:
+        payload = _client_error_payload(e.response)
+        if payload is None:
+            raise
+    if payload is None:
+        return None
+    data = payload.get('playerstats')
+    if not isinstance(data, dict):
+        raise ValueError(f"no playerstats for SteamID {steam_id} appid {appid}")
+    if not data.get('success'):
+        logging.info("No achievement stats for SteamID %s appid %s: %s", steam_id, appid, data.get('error'))
         return []
-    except requests.RequestException as e:
-        logging.error(f"Error fetching achievements for appid {appid}: {e}")
+    logging.info("Fetched achievements for appid %s", appid)
+    return data.get('achievements', [])
+# API: Steam answers private profiles (403) and games without stats (400) with a
+# playerstats body whose success is false; only those count as an empty result.
+
+def _client_error_payload(response):
+    """Return the JSON body of a 4xx response, or None for other errors and non-JSON bodies."""
+    if response is None or not 400 <= response.status_code < 500 or response.status_code == 429:
+        return None
+    try:
+        payload = response.json()
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) and 'playerstats' in payload else None
+
+def get_player_achievements(steam_id, appid):
+    """Fetch player achievements for a specific game."""
+    import requests
+    try:
+        return fetch_player_achievements(steam_id, appid) or []
+    except (requests.RequestException, Breaker.CircuitOpenError, ValueError) as e:
+        logging.error("Error fetching achievements for appid %s: %s", appid, e)
         return []
-# Design Rationale: Empty list fallback ensures UI can handle failed or empty responses.
+# Design Rationale: Empty list fallback ensures UI can handle failed or empty responses;
+# batch tools call fetch_player_achievements so failures are retried instead.
+
+def fetch_global_achievements(appid, before_request=None):
+    """Fetch global achievement percentages for a game, raising on network, server and breaker errors.
+
+    Returns None in offline mode when nothing is cached.
+    """
+    url = f"{API_BASE}/ISteamUserStats/GetGlobalAchievementPercentagesForApp/v2/"
+    params = {"gameid": appid}
+    payload = _get_json(url, params, 'global_achievements', before_request=before_request)
+    if payload is None:
+        return None
+    return payload.get('achievementpercentages', {}).get('achievements', [])
 
 def get_global_achievements(appid):
     """Fetch global achievement percentages for a game."""
-    url = "http://api.steampowered.com/ISteamUserStats/GetGlobalAchievementPercentagesForApp/v2/"
-    params = {"gameid": appid}
+    import requests
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json().get('achievementpercentages', {})
-        return data.get('achievements', [])
-    except requests.RequestException as e:
-        logging.error(f"Error fetching global achievements for appid {appid}: {e}")
+        return fetch_global_achievements(appid) or []
+    except (requests.RequestException, Breaker.CircuitOpenError) as e:
+        logging.error("Error fetching global achievements for appid %s: %s", appid, e)
+        return []
+# Performance: Global percentages are cached for a day by the response store.
+
+def fetch_game_schema(appid, revalidate=False, before_request=None):
+    """Fetch the achievement schema for a game, raising on network, server and breaker errors.
+
+    Returns None in offline mode when nothing is cached.
+    """
+    url = f"{API_BASE}/ISteamUserStats/GetSchemaForGame/v2/"
+    params = {
+        "key": _api_key(),
+        "appid": appid
+    }
+    payload = _get_json(url, params, 'game_schema', revalidate=revalidate, before_request=before_request)
+    if payload is None:
+        return None
+    return payload.get('game', {})
+
+def get_game_schema(appid, revalidate=False):
+    """Fetch the achievement schema (display names, descriptions and icons) for a game.
+
+    revalidate checks a stored schema with Steam (a conditional GET) even while it is fresh.
+    """
+    import requests
+    try:
+        return fetch_game_schema(appid, revalidate=revalidate)
+    except (requests.RequestException, Breaker.CircuitOpenError) as e:
+        logging.error("Error fetching achievement schema for appid %s: %s", appid, e)
+        return None
+# API: The schema is identical for every player, so the stored response is shared across
+# users; GetPlayerAchievements is requested without a language and carries unlock state only.
+
+def get_most_played_games():
+    """Fetch the appids of Steam's current most played games, most played first."""
+    import requests
+    url = f"{API_BASE}/ISteamChartsService/GetMostPlayedGames/v1/"
+    try:
+        payload = _get_json(url, {}, 'most_played')
+        if payload is None:
+            return []
+        ranks = payload.get('response', {}).get('ranks', [])
+        return [entry['appid'] for entry in sorted(ranks, key=lambda r: r.get('rank', 0)) if 'appid' in entry]
+    except (requests.RequestException, Breaker.CircuitOpenError) as e:
+        logging.error("Error fetching most played games: %s", e)
         return []
-# Performance: Could cache global achievements to reduce API calls for repeated queries.
\ No newline at end of file
+# API: Needs no key; used to pick games worth warming the cache for before any user searches.
@@ -0,0 +1,136 @@
+import time
+import sqlite3
+import logging
+import threading
+# Design Rationale: SQLite ships with Python, so history queries work offline and never
+# wait on the HTTP stack.
+
+# Database file, set by init(); recording is disabled until then
+HISTORY_DB = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS unlocks (
+    steam_id TEXT NOT NULL,
+    appid INTEGER NOT NULL,
+    apiname TEXT NOT NULL,
+    unlocktime INTEGER NOT NULL,
+    PRIMARY KEY (steam_id, appid, apiname)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS unlocks_by_time ON unlocks (steam_id, unlocktime);
+CREATE TABLE IF NOT EXISTS playtime (
+    steam_id TEXT NOT NULL,
+    appid INTEGER NOT NULL,
+    recorded_at INTEGER NOT NULL,
+    minutes INTEGER NOT NULL,
+    PRIMARY KEY (steam_id, appid, recorded_at)
+) WITHOUT ROWID;
+"""
+# Design Rationale: Rows are deltas. An achievement is stored once, when it is first seen
+# unlocked; playtime only when it differs from the last recorded value. The primary keys
+# lead with (steam_id, appid), so they double as the per-game index.
+
+_conn = None
+_lock = threading.Lock()
+
+def init(path='history.sqlite3'):
+    """Enable the history database stored at path."""
+    global HISTORY_DB, _conn
+    close()
+    try:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+    except sqlite3.Error as e:
+        logging.error("Failed to open history database %s: %s", path, e)
+        raise
+    HISTORY_DB, _conn = path, conn
+# Performance: WAL with synchronous=NORMAL makes each commit an append to the log
+# rather than two fsyncs of the database.
+
+def close():
+    """Close the database and disable recording."""
+    global HISTORY_DB, _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+        HISTORY_DB, _conn = None, None
+
+def _write(statements):
+    """Run (sql, rows) pairs in one transaction; return the number of rows changed."""
+    if _conn is None:
+        return 0
+    with _lock:
+        try:
+            with _conn:
+                before = _conn.total_changes
+                for sql, rows in statements:
+                    _conn.executemany(sql, rows)
+                return _conn.total_changes - before
+        except sqlite3.Error as e:
+            logging.error("Cannot write history to %s: %s", HISTORY_DB, e)
+            return 0
+# Performance: One transaction per batch, however many games it covers; per-row commits
+# would each wait for the disk.
+
+def _query(sql, params):
+    if _conn is None:
+        return []
+    with _lock:
+        try:
+            return _conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logging.error("Cannot read history from %s: %s", HISTORY_DB, e)
+            return []
+
+def record_achievements(steam_id, appid, achievements):
+    """Record newly unlocked achievements for one game; return how many were new."""
+    return record_achievements_batch(steam_id, {appid: achievements})
+
+def record_achievements_batch(steam_id, achievements_by_appid):
+    """Record newly unlocked achievements for many games in one transaction."""
+    rows = [(str(steam_id), appid, ach['apiname'], ach.get('unlocktime') or 0)
+            for appid, achievements in achievements_by_appid.items()
+            for ach in achievements or ()
+            if ach.get('achieved', 0) == 1 and 'apiname' in ach]
+    return _write([("INSERT OR IGNORE INTO unlocks VALUES (?, ?, ?, ?)", rows)])
+# Design Rationale: INSERT OR IGNORE makes re-recording a game idempotent, so refetches
+# only ever add unlocks that are new.
+
+def record_library(steam_id, games, recorded_at=None):
+    """Record playtime for every game whose playtime changed; return rows written."""
+    if _conn is None:
+        return 0
+    steam_id = str(steam_id)
+    recorded_at = int(recorded_at if recorded_at is not None else time.time())
+    latest = dict(_query("""SELECT appid, minutes FROM playtime AS p
+                            WHERE steam_id = ? AND recorded_at =
+                                (SELECT MAX(recorded_at) FROM playtime
+                                 WHERE steam_id = p.steam_id AND appid = p.appid)""", (steam_id,)))
+    rows = [(steam_id, g['appid'], recorded_at, g.get('playtime_forever', 0)) for g in games
+            if latest.get(g['appid']) != g.get('playtime_forever', 0)]
+    return _write([("INSERT OR REPLACE INTO playtime VALUES (?, ?, ?, ?)", rows)])
+
+def unlocks_between(steam_id, start, end=None, appid=None):
+    """Return [(appid, apiname, unlocktime)] unlocked in [start, end), oldest first."""
+    sql = "SELECT appid, apiname, unlocktime FROM unlocks WHERE steam_id = ? AND unlocktime >= ?"
+    params = [str(steam_id), int(start)]
+    if end is not None:
+        sql += " AND unlocktime < ?"
+        params.append(int(end))
+    if appid is not None:
+        sql += " AND appid = ?"
+        params.append(appid)
+    return _query(sql + " ORDER BY unlocktime", params)
+# Performance: Served by the (steam_id, unlocktime) index, so "this week" reads only the
+# week's rows however large the history is.
+
+def unlocks_for_game(steam_id, appid):
+    """Return [(apiname, unlocktime)] for one game, oldest first."""
+    return _query("SELECT apiname, unlocktime FROM unlocks WHERE steam_id = ? AND appid = ? "
+                  "ORDER BY unlocktime", (str(steam_id), appid))
+
+def playtime_history(steam_id, appid):
+    """Return [(recorded_at, minutes)] for one game, oldest first."""
+    return _query("SELECT recorded_at, minutes FROM playtime WHERE steam_id = ? AND appid = ? "
+                  "ORDER BY recorded_at", (str(steam_id), appid))
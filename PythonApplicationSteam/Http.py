@@ -0,0 +1,243 @@
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import Scheduler
+import Breaker
+# Performance: requests is imported lazily; this module is loaded by Funcs at startup.
+
+# Latency samples kept per endpoint
+SAMPLE_WINDOW = 200
+# Samples needed before timeouts adapt or requests are hedged
+MIN_SAMPLES = 20
+# Adaptive timeout = p95 * TIMEOUT_MULTIPLIER, clamped to [MIN_TIMEOUT, the caller's default]
+TIMEOUT_MULTIPLIER = 3.0
+MIN_TIMEOUT = 2.0
+# Hedges are sent once a request has run past the endpoint's p95, but never sooner than this
+MIN_HEDGE_DELAY = 0.05
+# At most this fraction of requests may be hedged, with a small burst allowance
+HEDGE_RATIO = 0.05
+HEDGE_BURST = 5
+# Threads running hedge-eligible requests; sized so every scheduler worker plus its hedge fits
+HEDGE_WORKERS = 2 * Scheduler.WORKERS
+
+
+def _percentile(sorted_samples, fraction):
+    return sorted_samples[min(len(sorted_samples) - 1, int(fraction * len(sorted_samples)))]
+
+
+class LatencyTracker:
+    """Rolling latency samples for one endpoint."""
+    def __init__(self, window=SAMPLE_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, fraction):
+        """Return the given percentile in seconds, or None with too few samples."""
+        with self.lock:
+            if len(self.samples) < MIN_SAMPLES:
+                return None
+            return _percentile(sorted(self.samples), fraction)
+
+    def timeout(self, default):
+        """Return a timeout derived from p95, never above the caller's default."""
+        p95 = self.percentile(0.95)
+        if p95 is None:
+            return default
+        return min(default, max(MIN_TIMEOUT, p95 * TIMEOUT_MULTIPLIER))
+    # Design Rationale: Timed-out requests are recorded at their timeout, so a slow but
+    # working endpoint pushes its own p95 and timeout back up towards the default.
+
+    def stats(self):
+        with self.lock:
+            ordered = sorted(self.samples)
+            result = {'requests': self.requests, 'hedges': self.hedges, 'hedge_wins': self.hedge_wins}
+        for name, fraction in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            result[name] = _percentile(ordered, fraction) if ordered else None
+        return result
+
+
+class HedgeBudget:
+    """Token bucket limiting hedged requests to a fraction of all requests."""
+    def __init__(self, ratio=HEDGE_RATIO, burst=HEDGE_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = float(burst)
+        self.lock = threading.Lock()
+
+    def on_request(self):
+        with self.lock:
+            self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def try_acquire(self):
+        with self.lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+# Design Rationale: Hedging is capped so a slow Steam backend never sees more than a few
+# percent of extra load from us, even when every request is slow.
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+_budget = HedgeBudget()
+_hedge_pool = None
+
+def tracker(endpoint):
+    """Return the LatencyTracker for an endpoint, creating it on first use."""
+    with _trackers_lock:
+        if endpoint not in _trackers:
+            _trackers[endpoint] = LatencyTracker()
+        return _trackers[endpoint]
+
+def latency_stats():
+    """Return {endpoint: {'p50', 'p95', 'p99', 'requests', 'hedges', 'hedge_wins'}}."""
+    with _trackers_lock:
+        trackers = dict(_trackers)
+    return {endpoint: t.stats() for endpoint, t in trackers.items()}
+
+def reset():
+    """Forget all latency samples and refill the hedge budget."""
+    global _budget
+    with _trackers_lock:
+        _trackers.clear()
+        _budget = HedgeBudget()
+
+def _pool():
+    global _hedge_pool
+    with _trackers_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='hedge')
+        return _hedge_pool
+
+def _timed_get(stats, url, params, headers, timeout):
+    import requests
+    start = time.monotonic()
+    try:
+        response = requests.get(url, params=params, headers=headers, timeout=timeout)
+    except requests.Timeout:
+        stats.record(timeout)
+        raise
+    stats.record(time.monotonic() - start)
+    return response
+
+def _release_when_done(futures, release):
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def finished(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            release()
+    for future in futures:
+        future.add_done_callback(finished)
+
+def _hedged_get(stats, url, params, headers, timeout, delay, host):
+    pool = _pool()
+    primary = pool.submit(_timed_get, stats, url, params, headers, timeout)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+    scheduler = Scheduler.get_scheduler()
+    if not scheduler.try_host_slot(host):
+        return primary.result()
+    if not _budget.try_acquire():
+        scheduler.release_host_slot(host)
+        return primary.result()
+    with stats.lock:
+        stats.hedges += 1
+    logging.info("Hedging request to %s after %.3fs", url, delay)
+    hedge = pool.submit(_timed_get, stats, url, params, headers, timeout)
+    _release_when_done([primary, hedge], lambda: scheduler.release_host_slot(host))
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                response = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            if future is hedge:
+                with stats.lock:
+                    stats.hedge_wins += 1
+            return response
+    raise error
+# Performance: The losing request is left to finish on its pool thread; its latency
+# still feeds the endpoint's samples.
+# Design Rationale: A hedge needs a host slot of its own, so it is skipped rather than
+# pushing a saturated host past PER_HOST. That slot is held until both requests finish,
+# since the loser is still on the wire after the caller returns its own slot.
+
+def _breakers_for(url, endpoint):
+    host = Scheduler.host_of(url)
+    names = [host] if endpoint in (None, host) else [endpoint, host]
+    return [Breaker.get_breaker(name) for name in names]
+
+def _is_server_failure(response):
+    return response.status_code >= 500 or response.status_code == 429
+# Design Rationale: 4xx responses such as a private profile or missing artwork mean the
+# endpoint is up, so only 5xx and rate limiting count towards opening a breaker.
+
+def _record_outcome(breakers, response=None, probe=None):
+    for b in breakers:
+        if response is None or _is_server_failure(response):
+            b.record_failure(probe)
+        else:
+            b.record_success()
+
+def _probe(stats, url, params, headers, breakers):
+    import requests
+    try:
+        response = _timed_get(stats, url, params, headers, stats.timeout(MIN_TIMEOUT))
+    except requests.RequestException as e:
+        logging.info("Probe of %s failed: %s", url, e)
+        _record_outcome(breakers)
+        return
+    _record_outcome(breakers, response)
+
+def get(url, params=None, headers=None, endpoint=None, default_timeout=10, hedge=True):
+    """GET with an adaptive timeout, per-host scheduling, hedging and circuit breaking.
+
+    Only use hedge=True for idempotent requests; raises requests.RequestException, or
+    Breaker.CircuitOpenError without sending anything while the endpoint or host is failing.
+    """
+    import requests
+    breakers = _breakers_for(url, endpoint)
+    for b in breakers:
+        if not b.allow():
+            raise Breaker.CircuitOpenError(b.name)
+    stats = tracker(endpoint or Scheduler.host_of(url))
+    timeout = stats.timeout(default_timeout)
+    with stats.lock:
+        stats.requests += 1
+    _budget.on_request()
+    probe = lambda: _probe(stats, url, params, headers, breakers)
+    try:
+        host = Scheduler.host_of(url)
+        with Scheduler.get_scheduler().host_slot(host):
+            p95 = stats.percentile(0.95) if hedge else None
+            if p95 is None:
+                response = _timed_get(stats, url, params, headers, timeout)
+            else:
+                response = _hedged_get(stats, url, params, headers, timeout, max(MIN_HEDGE_DELAY, p95), host)
+    except requests.RequestException:
+        _record_outcome(breakers, probe=probe)
+        raise
+    _record_outcome(breakers, response, probe)
+    return response
+# Design Rationale: Endpoints are tracked separately because GetOwnedGames for a large
+# library is legitimately slower than a CDN icon; one threshold would suit neither. A
+# host-wide breaker also trips when every endpoint on a host fails together.
@@ -0,0 +1,299 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import argparse
+import threading
+import multiprocessing
+from collections import namedtuple
+import Funcs
+import Profiles
+
+# Seconds a leased job belongs to a worker; heartbeats extend it while work is in progress
+LEASE_SECONDS = 60.0
+# Jobs leased per round trip to the database
+LEASE_BATCH = 5
+# Leases (including expired ones) before a job is marked failed
+MAX_ATTEMPTS = 3
+# Seconds an idle worker waits before checking for jobs released by other workers
+POLL_SECONDS = 0.05
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    steam_id TEXT NOT NULL,
+    appid INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_expires REAL,
+    UNIQUE (steam_id, appid)
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, lease_expires);
+CREATE TABLE IF NOT EXISTS results (
+    steam_id TEXT NOT NULL,
+    appid INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (steam_id, appid)
+) WITHOUT ROWID;
+"""
+# Design Rationale: appid 0 marks a user job (fetch the owned games); other rows fetch one
+# game's achievements. UNIQUE (steam_id, appid) makes adding the same work twice a no-op.
+
+Job = namedtuple('Job', 'id steam_id appid attempts')
+# appid is None for user jobs
+
+
+class JobQueue:
+    """A work queue of SteamIDs and (SteamID, appid) pairs in an SQLite file with leases.
+
+    Any number of processes can open the same file; each leases a batch of jobs, keeps
+    the leases alive with heartbeat() and calls complete() or fail() per job. Jobs whose
+    lease expires are handed to the next worker that asks.
+    """
+    def __init__(self, path, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS, wal=True):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        if wal:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+    # Design Rationale: WAL needs shared memory on one host; processes on several machines
+    # sharing the file over a network filesystem pass wal=False to use the rollback journal.
+    # Each process holds its own connection; the lock only serialises its own threads.
+
+    def _transaction(self, work):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = work(self.conn)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return result
+    # Design Rationale: BEGIN IMMEDIATE takes the write lock up front, so two workers
+    # can never select the same pending job before either has marked it leased.
+
+    def add(self, steam_ids=(), pairs=()):
+        """Queue user jobs and (steam_id, appid) achievement jobs; return how many were new."""
+        rows = [(str(s), 0) for s in steam_ids] + [(str(s), int(a)) for s, a in pairs]
+        def work(conn):
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO jobs (steam_id, appid) VALUES (?, ?)", rows)
+            return conn.total_changes - before
+        return self._transaction(work)
+
+    def lease(self, owner, limit=LEASE_BATCH):
+        """Lease up to limit pending or expired jobs to owner."""
+        now = time.time()
+        def work(conn):
+            conn.execute("UPDATE jobs SET state = ?, owner = NULL WHERE state = ? AND lease_expires < ? "
+                         "AND attempts >= ?", (FAILED, LEASED, now, self.max_attempts))
+            return conn.execute(
+                "UPDATE jobs SET state = ?, owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id IN (SELECT id FROM jobs WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY id LIMIT ?) RETURNING id, steam_id, appid, attempts",
+                (LEASED, owner, now + self.lease_seconds, PENDING, LEASED, now, limit)).fetchall()
+        return [Job(i, s, a or None, n) for i, s, a, n in self._transaction(work)]
+    # Performance: One write transaction leases a whole batch, so workers contend for the
+    # database once per LEASE_BATCH jobs rather than once per job.
+
+    def heartbeat(self, owner, job_ids):
+        """Extend owner's leases on job_ids; return how many are still held."""
+        if not job_ids:
+            return 0
+        ids = list(job_ids)
+        def work(conn):
+            return conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE owner = ? AND state = ? "
+                f"AND id IN ({','.join('?' * len(ids))})",
+                [time.time() + self.lease_seconds, owner, LEASED] + ids).rowcount
+        return self._transaction(work)
+
+    def complete(self, job, payload, children=()):
+        """Store a job's result, queue the jobs it spawned and mark it done."""
+        self.complete_many([(job, payload, children)])
+
+    def complete_many(self, finished):
+        """Store [(job, payload, children)] results in one transaction.
+
+        Idempotent: if a lease expired and another worker finishes the same job, the
+        result row is simply written again.
+        """
+        def work(conn):
+            conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                             [(job.steam_id, job.appid or 0, json.dumps(payload, separators=(',', ':')))
+                              for job, payload, _ in finished])
+            conn.executemany("INSERT OR IGNORE INTO jobs (steam_id, appid) VALUES (?, ?)",
+                             [(str(s), int(a)) for _, _, children in finished for s, a in children])
+            conn.executemany("UPDATE jobs SET state = ?, owner = NULL WHERE id = ?",
+                             [(DONE, job.id) for job, _, _ in finished])
+        if finished:
+            self._transaction(work)
+    # Performance: Workers write a leased batch's results together, so each batch costs
+    # two write transactions (lease and complete) however many jobs it holds.
+
+    def fail(self, owner, job):
+        """Return a job to the queue, or mark it failed once it is out of attempts."""
+        def work(conn):
+            conn.execute("UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, owner = NULL "
+                         "WHERE id = ? AND owner = ? AND state = ?",
+                         (self.max_attempts, FAILED, PENDING, job.id, owner, LEASED))
+        self._transaction(work)
+
+    def counts(self):
+        """Return {state: number of jobs}."""
+        with self.lock:
+            return dict(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+
+    def result(self, steam_id, appid=None):
+        """Return the stored result for a user job or an achievement job, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT payload FROM results WHERE steam_id = ? AND appid = ?",
+                                    (str(steam_id), appid or 0)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def process(job):
+    """Run one job; return (payload, child jobs) or raise to have it retried."""
+    if job.appid is None:
+        games = Funcs.get_owned_games(job.steam_id)
+        if games is None:
+            raise RuntimeError(f"no games for SteamID {job.steam_id}")
+        children = [(job.steam_id, g['appid']) for g in games if g.get('playtime_forever', 0) > 0]
+        return games, children
+    achievements = Funcs.fetch_player_achievements(job.steam_id, job.appid)
+    if achievements is None:
+        raise RuntimeError(f"no cached achievements for SteamID {job.steam_id} appid {job.appid}")
+    return achievements, ()
+# Design Rationale: Achievements are only crawled for games that have been played; an
+# unplayed game cannot have unlocks. Server errors and open breakers raise, so the job
+# is retried and eventually marked failed rather than stored as an empty result.
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def run_worker(path, worker_id=None, batch=LEASE_BATCH, lease_seconds=LEASE_SECONDS, wal=True, poll=POLL_SECONDS):
+    """Process jobs from the queue at path until none are pending or leased; return the count."""
+    worker_id = worker_id or default_worker_id()
+    jobs = JobQueue(path, lease_seconds=lease_seconds, wal=wal)
+    held = set()
+    stop = threading.Event()
+
+    def keep_alive():
+        while not stop.wait(lease_seconds / 3):
+            jobs.heartbeat(worker_id, list(held))
+    heartbeat = threading.Thread(target=keep_alive, name="job-heartbeat", daemon=True)
+    heartbeat.start()
+    processed = 0
+    try:
+        while True:
+            leased = jobs.lease(worker_id, batch)
+            if not leased:
+                counts = jobs.counts()
+                if not counts.get(PENDING) and not counts.get(LEASED):
+                    return processed
+                time.sleep(poll)  # Others hold the remaining leases; wait for them to finish or expire
+                continue
+            held.update(job.id for job in leased)
+            finished = []
+            for job in leased:
+                try:
+                    finished.append((job, *process(job)))
+                except Exception as e:
+                    logging.error("Job %s for SteamID %s appid %s failed: %s", job.id, job.steam_id, job.appid, e)
+                    jobs.fail(worker_id, job)
+            jobs.complete_many(finished)
+            processed += len(finished)
+            held.clear()
+    finally:
+        stop.set()
+        jobs.close()
+# Design Rationale: Workers only coordinate through the queue file, so processes and
+# machines can join or leave mid-run; a worker that dies simply lets its leases expire.
+
+def _worker_main(path, api_key, api_base, wal):
+    Funcs.init(api_key, api_base=api_base)
+    run_worker(path, wal=wal)
+
+def start_workers(path, count, api_key=None, api_base=None, wal=True):
+    """Start count worker processes on the queue at path and return them."""
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_worker_main, args=(path, api_key, api_base, wal),
+                                 name=f"steam-worker-{i}") for i in range(count)]
+    for p in processes:
+        p.start()
+    return processes
+# Design Rationale: 'spawn' gives each worker a clean interpreter with its own GIL,
+# HTTP connection pool and circuit breakers.
+
+def resolve_profiles(profiles):
+    """Return the SteamID64s for SteamIDs, profile URLs and vanity names, skipping unknown ones."""
+    parsed = [Profiles.parse(text) for text in profiles]
+    if any(p is not None and p[0] == 'vanity' for p in parsed):
+        Funcs.init()
+    steam_ids = []
+    for text, profile in zip(profiles, parsed):
+        steam_id = None
+        if profile is not None:
+            steam_id = profile[1] if profile[0] == 'steam_id' else Profiles.resolve_vanity(profile[1])
+        if steam_id is None:
+            logging.warning("Skipping %r: not a SteamID64 or a known profile", text)
+        else:
+            steam_ids.append(steam_id)
+    return steam_ids
+# Design Rationale: The API key is only needed when a vanity name has to be resolved, so
+# queueing plain SteamIDs keeps working without one.
+
+def main(argv=None):
+    """Command line entry point: add jobs, run workers or show queue status."""
+    parser = argparse.ArgumentParser(description="Batch crawl Steam libraries and achievements")
+    parser.add_argument('--db', default='jobs.sqlite3', help="queue file shared by all workers")
+    parser.add_argument('--shared-fs', action='store_true',
+                        help="the queue file is on a network filesystem used by several machines")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="queue SteamIDs, profile URLs or custom profile names")
+    add.add_argument('steam_ids', nargs='*')
+    add.add_argument('--file', help="file with one SteamID, profile URL or name per line")
+    work = commands.add_parser('work', help="process jobs until the queue is drained")
+    work.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    work.add_argument('--api-base', help="Steam Web API root URL")
+    commands.add_parser('status', help="show job counts")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s')
+
+    if args.command == 'add':
+        steam_ids = list(args.steam_ids)
+        if args.file:
+            with open(args.file, 'r', encoding='utf-8') as f:
+                steam_ids += [line.strip() for line in f if line.strip()]
+        steam_ids = resolve_profiles(steam_ids)
+        jobs = JobQueue(args.db, wal=not args.shared_fs)
+        print(f"Queued {jobs.add(steam_ids)} new SteamIDs")
+    elif args.command == 'work':
+        api_key = Funcs.init(api_base=args.api_base)
+        for p in start_workers(args.db, args.processes, api_key, Funcs.API_BASE, wal=not args.shared_fs):
+            p.join()
+        jobs = JobQueue(args.db, wal=not args.shared_fs)
+    else:
+        jobs = JobQueue(args.db, wal=not args.shared_fs)
+    print(json.dumps(jobs.counts()))
+    jobs.close()
+
+if __name__ == "__main__":
+    main()
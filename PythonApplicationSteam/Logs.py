@@ -0,0 +1,134 @@
+import sys
+import json
+import time
+import queue
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Identical messages (same logger, level and format string) allowed per window before
+# further copies are suppressed; the next copy after the window reports how many were dropped
+RATE_LIMIT_BURST = 10
+RATE_LIMIT_WINDOW = 60.0
+# Fraction of DEBUG and INFO records kept (one in round(1 / rate)); warnings and errors
+# are never sampled out
+INFO_SAMPLE_RATE = 1.0
+
+_listener = None
+_handler = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves %-formatting to the listener thread."""
+    def prepare(self, record):
+        return record
+# Performance: The stock QueueHandler formats each message in the calling worker thread;
+# records only cross threads within this process, so formatting can wait for the listener.
+
+
+class RateLimitFilter(logging.Filter):
+    """Suppresses floods of identical messages and samples low-severity records."""
+    def __init__(self, burst=RATE_LIMIT_BURST, window=RATE_LIMIT_WINDOW, sample_rate=INFO_SAMPLE_RATE):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.sample_every = max(1, round(1 / sample_rate)) if sample_rate > 0 else None
+        self.windows = {}    # key -> [window_start, emitted, suppressed]
+        self.seen = 0
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING and self.sample_every != 1:
+            if self.sample_every is None:
+                return False
+            with self.lock:
+                self.seen += 1
+                if self.seen % self.sample_every:
+                    return False
+        key = (record.name, record.levelno, record.msg)
+        now = time.monotonic()
+        with self.lock:
+            state = self.windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self.windows[key] = [now, 1, 0]
+                if len(self.windows) > 10000:
+                    self._expire(now)
+            elif state[1] < self.burst:
+                state[1] += 1
+                return True
+            else:
+                state[2] += 1
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+    # Performance: The key is the unformatted %-style template, so a CDN outage that logs
+    # "Failed to download image %s" for thousands of URLs is one key, checked before
+    # anything is formatted or queued.
+
+    def _expire(self, now):
+        for key in [k for k, s in self.windows.items() if now - s[0] >= self.window]:
+            del self.windows[key]
+
+
+class _SuppressedCountFormatter(logging.Formatter):
+    def format(self, record):
+        message = super().format(record)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            message += f" ({suppressed} similar messages suppressed)"
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+    def format(self, record):
+        entry = {
+            'time': record.created,
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup(level=logging.INFO, json_output=False, stream=None, rate_limit=True,
+          sample_rate=INFO_SAMPLE_RATE):
+    """Route all logging through a queue drained by a background listener thread.
+
+    Replaces any previous setup; call shutdown() before exit to flush pending records.
+    """
+    global _listener, _handler
+    shutdown()
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if json_output else _SuppressedCountFormatter(TEXT_FORMAT))
+    records = queue.SimpleQueue()
+    _handler = _DeferredQueueHandler(records)
+    if rate_limit:
+        _handler.addFilter(RateLimitFilter(sample_rate=sample_rate))
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_handler)
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+# Performance: Worker threads only append to a lock-free SimpleQueue; the single listener
+# thread does the formatting and the stderr writes, so workers never contend on its lock.
+
+def shutdown():
+    """Detach the queue handler and flush records still queued for the listener."""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,247 @@
+import os
+import gc
+import time
+import logging
+import threading
+from collections import deque
+# Design Rationale: Only the standard library is used; RSS is read from /proc where
+# available, so the governor adds no dependency to kiosk builds.
+
+# Memory pressure levels
+NORMAL = 'normal'
+ELEVATED = 'elevated'
+CRITICAL = 'critical'
+
+# Memory ceiling for the app and its decode processes in MiB; 0 disables the governor
+LIMIT_MB = int(os.getenv('STEAM_MEMORY_LIMIT_MB') or 0)
+# Caches are shrunk above SOFT_LIMIT of the ceiling; pools are cut further above HARD_LIMIT
+SOFT_LIMIT = 0.80
+HARD_LIMIT = 0.95
+# A level is only left once usage is this far below its threshold, so it does not flap
+RECOVERY = 0.90
+# Seconds between RSS samples
+CHECK_INTERVAL = 2.0
+# Smallest fraction of a cache dropped per shrink, per level
+MIN_SHRINK = {ELEVATED: 0.25, CRITICAL: 0.5}
+# Fraction of normal worker counts and the decoded-image budget kept at each level
+POOL_SCALE = {NORMAL: 1.0, ELEVATED: 0.5, CRITICAL: 0.25}
+# Share of the ceiling that decoded images (Tk pixel buffers) may use at the normal level
+IMAGE_BUDGET = 0.25
+# Recent actions kept for status()
+ACTION_HISTORY = 100
+
+
+def _statm_bytes(path):
+    with open(path) as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+def _child_pids():
+    pids = []
+    try:
+        for tid in os.listdir('/proc/self/task'):
+            with open(f'/proc/self/task/{tid}/children') as f:
+                pids.extend(f.read().split())
+    except OSError:
+        pass
+    return pids
+
+def rss_bytes():
+    """Return the resident memory of this process and its child processes, or None if unknown."""
+    try:
+        total = _statm_bytes('/proc/self/statm')
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+        except ImportError:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak, not current
+    for pid in _child_pids():
+        try:
+            total += _statm_bytes(f'/proc/{pid}/statm')
+        except (OSError, ValueError):
+            pass  # The child exited between the listing and the read
+    return total
+# Design Rationale: Decode workers are separate processes, and the kiosk's OOM killer
+# counts them too, so their memory is part of what the governor keeps under the ceiling.
+
+
+class Governor:
+    """Keeps memory under a ceiling by shrinking registered caches and announcing pressure levels.
+
+    Caches are registered with size() -> bytes and, if they can shrink, shrink(fraction) ->
+    bytes freed. Listeners are called with the new level whenever it changes, and scale
+    worker pools and budgets with scaled() and image_budget().
+    """
+    def __init__(self, limit_bytes, soft=SOFT_LIMIT, hard=HARD_LIMIT, measure=rss_bytes):
+        self.limit = limit_bytes
+        self.soft = soft
+        self.hard = hard
+        self.measure = measure
+        self.level = NORMAL
+        self.rss = None
+        self.caches = {}        # name -> (size, shrink or None)
+        self.listeners = []
+        self.actions = deque(maxlen=ACTION_HISTORY)
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def enabled(self):
+        return self.limit > 0
+
+    def register(self, name, size, shrink=None):
+        """Track a cache; caches without shrink are reported but never shrunk."""
+        with self.lock:
+            self.caches[name] = (size, shrink)
+
+    def unregister(self, name):
+        with self.lock:
+            self.caches.pop(name, None)
+
+    def add_listener(self, listener):
+        """Call listener(level) on every level change, from the governor's thread."""
+        with self.lock:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+
+    def scaled(self, count, minimum=1):
+        """Return a worker count scaled down for the current level."""
+        return max(minimum, int(count * POOL_SCALE[self.level]))
+
+    def image_budget(self):
+        """Return the bytes decoded images may use at the current level, or None for no limit."""
+        if not self.enabled:
+            return None
+        return int(self.limit * IMAGE_BUDGET * POOL_SCALE[self.level])
+
+    def _record(self, action, **details):
+        entry = dict(details, time=time.time(), level=self.level, rss=self.rss, action=action)
+        with self.lock:
+            self.actions.append(entry)
+        logging.warning("Memory governor: %s (RSS %.0f MB of %.0f MB)", action,
+                        (self.rss or 0) / 2 ** 20, self.limit / 2 ** 20)
+
+    def _level_for(self, rss):
+        hard, soft = self.limit * self.hard, self.limit * self.soft
+        if rss >= hard or (self.level == CRITICAL and rss >= hard * RECOVERY):
+            return CRITICAL
+        if rss >= soft or (self.level != NORMAL and rss >= soft * RECOVERY):
+            return ELEVATED
+        return NORMAL
+
+    def check(self):
+        """Sample memory, shrink caches if it is above the soft limit and return the level."""
+        if not self.enabled:
+            return self.level
+        rss = self.measure()
+        if rss is None:
+            return self.level
+        self.rss = rss
+        level = self._level_for(rss)
+        if level != self.level:
+            previous, self.level = self.level, level
+            self._record(f"pressure {previous} -> {level}", previous=previous)
+            with self.lock:
+                listeners = list(self.listeners)
+            for listener in listeners:
+                try:
+                    listener(level)
+                except Exception as e:
+                    logging.error("Memory pressure listener failed: %s", e)
+        if level != NORMAL:
+            self._shrink(rss - self.limit * self.soft * RECOVERY)
+        return level
+
+    def _shrink(self, excess):
+        with self.lock:
+            caches = [(name, size, shrink) for name, (size, shrink) in self.caches.items() if shrink]
+        sized = []
+        for name, size, shrink in caches:
+            try:
+                sized.append((size(), name, shrink))
+            except Exception as e:
+                logging.error("Cannot size cache %s: %s", name, e)
+        for current, name, shrink in sorted(sized, key=lambda item: item[0], reverse=True):
+            if excess <= 0:
+                break
+            if current <= 0:
+                continue
+            fraction = min(1.0, max(MIN_SHRINK[self.level], excess / current))
+            try:
+                freed = shrink(fraction) or 0
+            except Exception as e:
+                logging.error("Cannot shrink cache %s: %s", name, e)
+                continue
+            excess -= freed
+            self._record(f"shrank {name} by {fraction:.0%}, freeing {freed / 2 ** 20:.1f} MB",
+                         cache=name, fraction=fraction, freed=freed)
+        if self.level == CRITICAL:
+            gc.collect()
+    # Design Rationale: The largest caches are shrunk first, just enough to get back under
+    # the soft limit, so a small hot cache survives a large cold one being trimmed.
+
+    def status(self):
+        """Return {'limit', 'rss', 'level', 'caches': {name: bytes}, 'actions': [...]}."""
+        with self.lock:
+            caches = dict(self.caches)
+            actions = list(self.actions)
+        sizes = {}
+        for name, (size, _) in caches.items():
+            try:
+                sizes[name] = size()
+            except Exception:
+                sizes[name] = None
+        return {'limit': self.limit, 'rss': self.rss, 'level': self.level, 'caches': sizes, 'actions': actions}
+
+    def start(self, interval=CHECK_INTERVAL):
+        """Check memory every interval seconds on a daemon thread; does nothing when disabled."""
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="memory-governor", daemon=True)
+        self._thread.start()
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error("Memory governor check failed: %s", e)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+def init(limit_mb=None):
+    """Start the process-wide governor with a ceiling in MiB (default LIMIT_MB) and return it."""
+    global _governor
+    limit_mb = LIMIT_MB if limit_mb is None else limit_mb
+    with _governor_lock:
+        if _governor is not None:
+            _governor.stop()
+        _governor = Governor(int(limit_mb * 2 ** 20))
+    _governor.start()
+    if _governor.enabled:
+        logging.info("Memory governor keeping usage under %s MB", limit_mb)
+    return _governor
+
+def get_governor():
+    """Return the process-wide governor; a disabled one until init() sets a ceiling."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = Governor(0)
+        return _governor
+# Design Rationale: Components register with the governor whether or not a ceiling is
+# configured; a disabled governor only records them, at no cost.
@@ -0,0 +1,180 @@
+import time
+import heapq
+import logging
+import threading
+from collections import OrderedDict
+import Cache
+import Scheduler
+
+# Milliseconds the pointer must rest on a game before its achievements are prefetched
+HOVER_MS = 80
+# Milliseconds the game list must stay still before the visible games are prefetched
+DWELL_MS = 400
+# Visible games prefetched per dwell, highest score first
+DWELL_GAMES = 3
+# Minutes played in the last two weeks count this many times a lifetime minute
+RECENT_WEIGHT = 10
+# Achievement icons downloaded per prefetched game, i.e. roughly the first screenful
+ICONS = 12
+# Prefetched games kept in memory
+MAX_ENTRIES = 32
+# Approximate memory of one prefetched achievement, used to report the cache size
+ACHIEVEMENT_BYTES = 2048
+
+
+def score(game):
+    """Return how likely a game is to be opened, from its recent and lifetime playtime."""
+    return game.get('playtime_2weeks', 0) * RECENT_WEIGHT + game.get('playtime_forever', 0)
+# Design Rationale: Recent play is the strongest sign of the next click; lifetime playtime
+# breaks ties between games nobody has played lately.
+
+
+class Prefetcher:
+    """Loads achievements for games the user is about to open, ahead of the click.
+
+    hover()/leave() and viewport_changed() are called on the UI thread; load(steam_id,
+    appid) runs on the scheduler at background priority and take() hands its result to
+    the click, waiting for a prefetch that is already running; load() queues anything
+    else through submit().
+    """
+    def __init__(self, root, scheduler, load, visible_games, max_entries=MAX_ENTRIES):
+        self.root = root
+        self.scheduler = scheduler
+        self.load = load
+        self.visible_games = visible_games
+        self.max_entries = max_entries
+        self.results = OrderedDict()    # (steam_id, appid) -> (loaded_at, result), oldest first
+        self.pending = {}               # (steam_id, appid) -> (future, reason)
+        self.lock = threading.Lock()
+        self.hover_job = None
+        self.dwell_job = None
+        self.hits = 0
+        self.misses = 0
+
+    def hover(self, steam_id, game):
+        """The pointer entered a game; prefetch it if it stays for HOVER_MS."""
+        self._cancel_job('hover_job')
+        self.hover_job = self.root.after(HOVER_MS, self._hovered, steam_id, game['appid'])
+
+    def _hovered(self, steam_id, appid):
+        self.hover_job = None
+        self._start(steam_id, appid, 'hover')
+
+    def leave(self, steam_id, game):
+        """The pointer left a game; drop its prefetch unless it has started."""
+        self._cancel_job('hover_job')
+        key = (steam_id, game['appid'])
+        self._cancel(lambda k, reason: k == key and reason == 'hover')
+
+    def viewport_changed(self, steam_id):
+        """The game list scrolled or grew; prefetch what is visible once it stays still."""
+        self._cancel_job('dwell_job')
+        self.dwell_job = self.root.after(DWELL_MS, self._dwell, steam_id)
+
+    def _dwell(self, steam_id):
+        self.dwell_job = None
+        visible = self.visible_games()
+        keys = {(steam_id, game['appid']) for game in visible}
+        self._cancel(lambda key, reason: reason == 'dwell' and key not in keys)
+        for game in heapq.nlargest(DWELL_GAMES, visible, key=score):
+            self._start(steam_id, game['appid'], 'dwell')
+    # Performance: Only the few most played games in view are fetched, and prefetches for
+    # games scrolled past are dropped, so slow scrolling does not queue a whole library.
+
+    def _cancel_job(self, name):
+        job = getattr(self, name)
+        if job is not None:
+            self.root.after_cancel(job)
+            setattr(self, name, None)
+
+    def _start(self, steam_id, appid, reason):
+        key = (steam_id, appid)
+        with self.lock:
+            if key in self.pending or self._fresh(key):
+                return
+            future = self.scheduler.submit(self._run, key, priority=Scheduler.BACKGROUND, group='prefetch')
+            self.pending[key] = (future, reason)
+
+    def submit(self, fn, *args):
+        """Queue follow-up work of a prefetch, such as icon downloads, that a click need not wait for."""
+        return self.scheduler.submit(fn, *args, priority=Scheduler.BACKGROUND, group='prefetch')
+    # Performance: load() returns as soon as the API calls are done, so a click waiting on a
+    # running prefetch is not held up behind its background icon downloads.
+
+    def _cancel(self, matches):
+        with self.lock:
+            keys = [key for key, (_, reason) in self.pending.items() if matches(key, reason)]
+            for key in keys:
+                future, _ = self.pending[key]
+                if future.cancel():
+                    del self.pending[key]
+    # Design Rationale: A prefetch that is already running is left to finish; its result
+    # is cheap to keep and may still be clicked.
+
+    def _fresh(self, key):
+        entry = self.results.get(key)
+        return entry is not None and Cache.is_fresh(entry[0], 'player_achievements')
+
+    def _run(self, key):
+        try:
+            result = self.load(*key)
+        except BaseException:
+            with self.lock:
+                self.pending.pop(key, None)
+            raise
+        with self.lock:
+            self.pending.pop(key, None)
+            self.results.pop(key, None)
+            self.results[key] = (time.time(), result)
+            while len(self.results) > self.max_entries:
+                del self.results[next(iter(self.results))]
+        return result
+
+    def take(self, steam_id, appid):
+        """Return the prefetched result for a click, or None if the caller must load it."""
+        key = (steam_id, appid)
+        with self.lock:
+            if self._fresh(key):
+                self.hits += 1
+                return self.results[key][1]
+            pending = self.pending.pop(key, None)
+        if pending is not None and not pending[0].cancel():
+            try:
+                result = pending[0].result()
+                with self.lock:
+                    self.hits += 1
+                return result
+            except Exception as e:
+                logging.warning("Prefetch of appid %s failed, loading it again: %s", appid, e)
+        with self.lock:
+            self.misses += 1
+        return None
+    # Design Rationale: A click on a game still queued for prefetch cancels it and loads at
+    # interactive priority; one already loading is waited for instead of fetched twice.
+
+    def cancel(self):
+        """Drop queued prefetches and timers, e.g. when the game list is cleared."""
+        self._cancel_job('hover_job')
+        self._cancel_job('dwell_job')
+        self._cancel(lambda key, reason: True)
+        self.scheduler.cancel(group='prefetch')
+
+    def forget(self, appid):
+        """Drop prefetched results for a game, e.g. when its schema changes."""
+        with self.lock:
+            for key in [key for key in self.results if key[1] == appid]:
+                del self.results[key]
+
+    def size_bytes(self):
+        """Return the approximate memory held by prefetched results."""
+        with self.lock:
+            return sum(len(result[0]) + 1 for _, result in self.results.values()) * ACHIEVEMENT_BYTES
+
+    def trim(self, fraction):
+        """Forget the oldest fraction of prefetched results; return the approximate bytes freed."""
+        with self.lock:
+            freed = 0
+            for _ in range(int(len(self.results) * fraction + 0.999)):
+                _, result = self.results.pop(next(iter(self.results)))
+                freed += (len(result[0]) + 1) * ACHIEVEMENT_BYTES
+            return freed
@@ -0,0 +1,88 @@
+import re
+import logging
+import threading
+import Funcs
+
+# Profile URLs: steamcommunity.com/profiles/<SteamID64> or steamcommunity.com/id/<vanity name>
+_PROFILE_URL = re.compile(r'(?:https?://)?(?:www\.)?steamcommunity\.com/(profiles|id)/([^/?#\s]+)/?(?:[?#]\S*)?',
+                          re.IGNORECASE)
+# Characters Steam allows in a custom profile name
+_VANITY_NAME = re.compile(r'[A-Za-z0-9_-]{3,32}')
+# ResolveVanityURL success codes
+MATCH = 1
+NO_MATCH = 42
+
+_resolved = {}      # lower-case vanity name -> SteamID64, for this process
+_resolved_lock = threading.Lock()
+
+
+def is_steam_id(text):
+    """Return True for a 17-digit SteamID64."""
+    return len(text) == 17 and text.isdigit()
+
+def parse(text):
+    """Return ('steam_id', id) or ('vanity', name) for a SteamID64, profile URL or vanity name.
+
+    Returns None when the text cannot name a profile, without any network request.
+    """
+    text = text.strip()
+    match = _PROFILE_URL.fullmatch(text)
+    if match:
+        kind, text = match.group(1).lower(), match.group(2)
+        if kind == 'profiles':
+            return ('steam_id', text) if is_steam_id(text) else None
+    if text.isdigit():
+        return ('steam_id', text) if is_steam_id(text) else None
+    if _VANITY_NAME.fullmatch(text):
+        return ('vanity', text.lower())
+    return None
+# Design Rationale: Digits only are read as a SteamID64, so a mistyped ID is reported
+# at once instead of being looked up as a name. Vanity names are case-insensitive.
+
+def resolve_vanity(name):
+    """Return the SteamID64 using a vanity name, or None if no profile uses it or Steam is unreachable."""
+    name = name.lower()
+    with _resolved_lock:
+        steam_id = _resolved.get(name)
+    if steam_id is not None:
+        return steam_id
+    response = Funcs.resolve_vanity_url(name)
+    if response is None:
+        return None
+    if response.get('success') == MATCH and is_steam_id(str(response.get('steamid', ''))):
+        steam_id = str(response['steamid'])
+    elif response.get('success') == NO_MATCH:
+        steam_id = None
+    else:
+        logging.warning("Unexpected ResolveVanityURL response for %s: %s", name, response)
+        return None
+    if steam_id is not None:
+        with _resolved_lock:
+            _resolved[name] = steam_id
+    return steam_id
+# Performance: Answers are remembered for the process and, through the response store,
+# on disk for a day, so a repeat lookup of the same name needs no request at all.
+# Design Rationale: Only matches are kept in memory; a name nobody used yet is asked
+# again once its cached answer expires, and errors are never cached.
+
+def resolve(text):
+    """Return the SteamID64 for a SteamID64, profile URL or vanity name, or None."""
+    parsed = parse(text)
+    if parsed is None:
+        return None
+    kind, value = parsed
+    return value if kind == 'steam_id' else resolve_vanity(value)
+
+def resolve_many(texts):
+    """Return {text: SteamID64 or None}, resolving each distinct vanity name once."""
+    return {text: resolve(text) for text in dict.fromkeys(texts)}
+
+def display_names(steam_ids):
+    """Return {steam_id: persona name} for the profiles Steam knows, in GetPlayerSummaries batches."""
+    return {steam_id: summary.get('personaname', steam_id)
+            for steam_id, summary in Funcs.get_player_summaries(steam_ids).items()}
+
+def clear():
+    """Forget the vanity names resolved by this process; the disk cache is kept."""
+    with _resolved_lock:
+        _resolved.clear()
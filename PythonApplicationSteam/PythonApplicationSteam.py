@@ -1,81 +1,125 @@
-import requests
 import tkinter as tk
 from tkinter import messagebox, Scrollbar, Canvas, Frame
-from PIL import Image, ImageTk, UnidentifiedImageError
 import io
 import os
 import threading
 import logging
+import argparse
 import Funcs
-from queue import Queue, Empty
-#import PIL.UnidentifiedImageError
-
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-# Performance: INFO level reduces logging overhead in production while retaining useful info.
-
-# Steam API key from environment variable
-API_KEY = os.getenv('STEAM_API_KEY')
-if not API_KEY:
-    raise ValueError("STEAM_API_KEY environment variable not set")
-# Security: Using environment variable prevents hardcoding sensitive API key.
-# Design Rationale: Fail early if key is missing to avoid runtime issues.
-
-# Cache directory for images
+import Cache
+import Scheduler
+import Snapshot
+import History
+import Schema
+import Thumbnails
+import Assets
+import Breaker
+import Wakeup
+import Logs
+import Memory
+import Prefetch
+import Profiles
+from AchievementView import AchievementPanel
+from queue import Empty
+# Performance: requests and PIL are imported lazily in download_image so the first
+# window can be drawn before the HTTP and imaging stacks are loaded.
+
+# Cache directory for images, created by init()
 CACHE_DIR = 'image_cache'
-if not os.path.exists(CACHE_DIR):
-    try:
-        os.makedirs(CACHE_DIR)
-    except OSError as e:
-        logging.error(f"Failed to create cache directory {CACHE_DIR}: {e}")
-        raise
-# Design Rationale: Early check ensures cache directory is writable.
-
-def download_image(url, cache_path, resize_dims=(184, 69)):
+# Directory for cached Steam API responses and their validators
+API_CACHE_DIR = 'api_cache'
+# Directory for the last-session snapshot used for instant start and offline mode
+SNAPSHOT_DIR = 'session_snapshot'
+# SQLite database of achievement unlocks and playtime over time
+HISTORY_DB = 'history.sqlite3'
+
+# Game buttons created before the first frame is drawn, then per idle callback
+RENDER_FIRST_CHUNK = 50
+RENDER_CHUNK = 200
+# Performance: Chunked rendering keeps time to first useful pixel flat for 5k-game libraries.
+# Images applied per image-queue wakeup before yielding to pending input events
+IMAGE_BATCH = 100
+# Bind tag shared by every game button, so hover handlers are bound once per class
+GAME_TAG = 'GameButton'
+
+def init(api_key=None, offline=False, log_json=False, memory_limit_mb=None):
+    """Configure logging, the Steam API key, the image cache, session snapshots, history and the memory ceiling."""
+    # Setup logging
+    Logs.setup(level=logging.INFO, json_output=log_json)
+    # Performance: INFO level reduces logging overhead in production while retaining useful info;
+    # records are formatted and written by a listener thread, never by the UI or workers.
+
+    Funcs.init(api_key, offline=offline, response_store=Cache.ResponseStore(API_CACHE_DIR))
+    Snapshot.init(SNAPSHOT_DIR)
+    History.init(HISTORY_DB)
+    Memory.init(memory_limit_mb)
+
+    if not os.path.exists(CACHE_DIR):
+        try:
+            os.makedirs(CACHE_DIR)
+        except OSError as e:
+            logging.error("Failed to create cache directory %s: %s", CACHE_DIR, e)
+            raise
+    Assets.init(CACHE_DIR)
+# Design Rationale: Explicit initialisation keeps imports side-effect free; the cache
+# directory is still checked before the first window so an unwritable cache fails early.
+
+def download_image(url, cache_path, resize_dims=(184, 69), asset_type='header'):
     """Download and cache an image, return ImageTk.PhotoImage with specified resize dimensions."""
+    from PIL import Image, ImageTk, UnidentifiedImageError
+    img_data = Thumbnails.fetch_image_bytes(url, cache_path, asset_type)
+    if img_data is None:
+        return None
     try:
-        if os.path.exists(cache_path):
-            with open(cache_path, 'rb') as f:
-                img_data = f.read()
-        else:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            img_data = response.content
-            try:
-                with open(cache_path, 'wb') as f:
-                    f.write(img_data)
-            except OSError as e:
-                logging.error(f"Cannot write to cache {cache_path}: {e}")
-                return None
-        try:
-            img = Image.open(io.BytesIO(img_data))
-            img = img.resize(resize_dims, Image.LANCZOS)
-            return ImageTk.PhotoImage(img)
-        except PIL.UnidentifiedImageError as e:
-            logging.error(f"Invalid image data for {url}: {e}")
-            return None
-    except requests.RequestException as e:
-        logging.error(f"Failed to download image {url}: {e}")
+        img = Image.open(io.BytesIO(img_data))
+        img = img.resize(resize_dims, Image.LANCZOS)
+        return ImageTk.PhotoImage(img)
+    except UnidentifiedImageError as e:
+        logging.error("Invalid image data for %s: %s", url, e)
         return None
 # Performance: Flexible resize_dims parameter avoids redundant image processing.
 # Design Rationale: Specific exception handling improves debugging and robustness.
-# Performance: Caching reduces API calls; timeout of 5s balances reliability and speed.
+
+def circuit_label(name):
+    """Return a short label for a breaker name: the API method for endpoints, else the host."""
+    if '/' not in name:
+        return name
+    return name.rstrip('/').rsplit('/', 2)[-2]
 
 
 class SteamApp:
     def __init__(self, root):
         self.root = root
-        self.root.title("Steam User Game and Achievement Viewer")
+        title = "Steam User Game and Achievement Viewer"
+        self.root.title(f"{title} (offline)" if Funcs.OFFLINE else title)
         self.root.geometry("800x600")
         # Design Rationale: Fixed size is simple; consider resizable UI for future scalability.
 
-        self.queue = Queue()
-        self.image_queue = Queue()  # For lazy loading images
+        self.queue = Wakeup.UiQueue(root, self.check_queue)
+        self.image_queue = Wakeup.UiQueue(root, self.check_image_queue)  # For lazy loading images
         # Performance: Separate queue for image loading enables asynchronous UI updates.
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        # Performance: Worker threads wake Tk when they put a result; nothing polls while idle.
+        self.scheduler = Scheduler.get_scheduler()
+        self.thumbnails = Thumbnails.ThumbnailPipeline(self.image_queue, self.scheduler)
+        # Performance: Game headers are decoded in worker processes, so a cold cache
+        # uses every core instead of contending for the GIL.
+        self.photos = Thumbnails.PhotoRegistry()
+        # Performance: Widgets showing identical images share one Tk image, freed when the
+        # game list or achievement list holding its last reference is cleared.
+        self.governor = Memory.get_governor()
+        self.governor.register('photos', lambda: self.photos.bytes)
+        self.governor.register('schemas', Schema.size_bytes, Schema.trim)
+        self.governor.add_listener(self.on_memory_pressure)
+        self.photos.max_bytes = self.governor.image_budget()
+        # Design Rationale: Images over the budget are shown as the placeholder rather than
+        # decoded into Tk buffers; visible images are never taken back from their widgets.
 
         # Placeholder image for failed downloads
-        self.placeholder_img = ImageTk.PhotoImage(Image.new('RGB', (64, 64), color='gray'))
+        self.placeholder_img = tk.PhotoImage(width=64, height=64)
+        self.placeholder_img.put('#808080', to=(0, 0, 64, 64))
         # Design Rationale: Placeholder improves UX when images fail to load.
+        # Performance: Drawn with Tk directly so PIL is not needed to show the first window.
 
         # SteamID entry and search button
         self.steam_id_entry = tk.Entry(root, width=30)
@@ -89,6 +133,14 @@ class SteamApp:
         self.loading_label = tk.Label(root, text="")
         self.loading_label.pack(pady=5)
 
+        # Connection status, shown while a circuit breaker is open
+        self.status_label = tk.Label(root, text="", fg="#b00000")
+        self.status_label.pack()
+        self.open_circuits = {}
+        Breaker.add_listener(self.on_breaker_change)
+        # Design Rationale: Breakers change state on worker threads, so the listener only
+        # queues a message and check_queue updates the label.
+
         # Canvas for scrollable game list
         self.canvas = Canvas(root, height=300)
         self.scrollbar = Scrollbar(root, orient="vertical", command=self.canvas.yview)
@@ -100,7 +152,7 @@ class SteamApp:
         )
 
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.configure(yscrollcommand=self.on_games_scroll)
 
         self.canvas.pack(side="top", fill="both", expand=True)
         self.scrollbar.pack(side="right", fill="y")
@@ -108,85 +160,198 @@ class SteamApp:
         # Achievement display frame
         self.achievement_frame = Frame(root)
         self.achievement_frame.pack(side="bottom", fill="both", expand=True)
+        self.achievement_panel = AchievementPanel(self.achievement_frame, self.placeholder_img,
+                                                  request_icon=self.request_achievement_icon)
+
+        self.prefetcher = Prefetch.Prefetcher(root, self.scheduler, self.prefetch_achievements, self.visible_games)
+        root.bind_class(GAME_TAG, '<Enter>', self.on_game_enter)
+        root.bind_class(GAME_TAG, '<Leave>', self.on_game_leave)
+        self.governor.register('prefetched', self.prefetcher.size_bytes, self.prefetcher.trim)
+        Schema.add_listener(self.prefetcher.forget)
+        # Performance: Achievements of games the user hovers over or lingers on are loaded
+        # before the click, so most clicks render from memory.
 
         self.games = []
         self.game_buttons = []
-        self.achievement_labels = []
+        self.current_steam_id = None
+        self.render_generation = 0
 
-        # Start queue checkers
-        self.check_queue()
-        self.check_image_queue()
-        # Performance: Separate queue for images allows lazy loading without blocking main UI.
+        self.restore_session()
 
     def check_queue(self):
-        """Check for messages in the main queue to update the UI."""
+        """Handle every message waiting in the main queue; called when a worker puts one."""
         assert threading.current_thread() == threading.main_thread(), "UI updates must occur in main thread"
-        try:
-            msg = self.queue.get_nowait()
+        while True:
+            try:
+                msg = self.queue.get_nowait()
+            except Empty:
+                return
             if msg['type'] == 'search_result':
                 self.handle_search_result(msg['steam_id'], msg['games'])
+            elif msg['type'] == 'refresh_result':
+                self.handle_refresh_result(msg['steam_id'], msg['games'])
             elif msg['type'] == 'achievements_result':
                 self.handle_achievements_result(msg['steam_id'], msg['appid'], msg['game_name'], msg['achievements'], msg['global_achievements'])
+            elif msg['type'] == 'breaker_state':
+                self.handle_breaker_state(msg['name'], msg['state'])
             elif msg['type'] == 'error':
                 self.loading_label.config(text="")
+                self.search_button.config(state='normal')
                 messagebox.showerror("Error", msg['message'])
-        except Empty:
-            pass
-        self.root.after(100, self.check_queue)
-        # Performance: 100ms polling is efficient; thread safety assertion prevents future bugs.
+        # Design Rationale: Thread safety assertion prevents future bugs; draining the queue
+        # means a burst of results costs one wakeup.
 
     def check_image_queue(self):
-        """Check for lazy-loaded images to update UI."""
+        """Apply up to IMAGE_BATCH lazy-loaded images, deferring the rest until Tk is idle."""
         assert threading.current_thread() == threading.main_thread(), "UI updates must occur in main thread"
-        try:
-            msg = self.image_queue.get_nowait()
+        for _ in range(IMAGE_BATCH):
+            try:
+                msg = self.image_queue.get_nowait()
+            except Empty:
+                return
             widget = msg['widget']
-            photo = msg['photo']
-            if photo:
-                widget.config(image=photo)
-                widget.image = photo  # Preserve reference
+            if 'key' in msg:
+                photo = self.photos.acquire(msg['key'], lambda: Thumbnails.photo_from_pixels(*msg['pixels']),
+                                            msg['group'])
+            elif 'pixels' in msg:
+                photo = Thumbnails.photo_from_pixels(*msg['pixels'])
             else:
-                widget.config(image=self.placeholder_img)
-                widget.image = self.placeholder_img
-        except Empty:
-            pass
-        self.root.after(100, self.check_image_queue)
-        # Performance: Lazy loading images improves initial UI rendering speed.
+                photo = msg['photo']
+            try:
+                if photo:
+                    widget.config(image=photo)
+                    widget.image = photo  # Preserve reference
+                else:
+                    widget.config(image=self.placeholder_img)
+                    widget.image = self.placeholder_img
+            except tk.TclError:
+                pass  # The widget was destroyed by a new search while its image loaded
+                # Its reference is dropped with the rest of its group at the next clear
+        self.root.after_idle(self.check_image_queue)
+        # Performance: Lazy loading images improves initial UI rendering speed; batching keeps
+        # a cold-cache flood of thumbnails from starving input events.
+
+    def on_memory_pressure(self, level):
+        """Scale worker pools and the decoded-image budget to memory pressure; called by the governor."""
+        self.scheduler.resize(self.governor.scaled(Scheduler.WORKERS, Scheduler.RESERVED_WORKERS + 1))
+        self.thumbnails.resize(self.governor.scaled(Thumbnails.DECODE_WORKERS))
+        self.photos.max_bytes = self.governor.image_budget()
+    # Performance: Each decode process holds its own PIL heap and each network thread a
+    # stack, so fewer workers is the quickest memory to give back under pressure.
+
+    def close(self):
+        """Stop the UI queues and destroy the window."""
+        self.queue.close()
+        self.image_queue.close()
+        self.root.destroy()
+
+    def on_breaker_change(self, name, state):
+        """Forward circuit breaker changes from any thread to the UI queue."""
+        self.queue.put({'type': 'breaker_state', 'name': name, 'state': state})
+
+    def handle_breaker_state(self, name, state):
+        """Show which Steam endpoints are failing and being served from cache."""
+        if state == Breaker.CLOSED:
+            self.open_circuits.pop(name, None)
+        else:
+            self.open_circuits[name] = state
+        if not self.open_circuits:
+            self.status_label.config(text="")
+            return
+        names = ", ".join(sorted(circuit_label(n) for n in self.open_circuits))
+        probing = any(s == Breaker.HALF_OPEN for s in self.open_circuits.values())
+        self.status_label.config(text=f"Steam unavailable ({names}); showing cached data, "
+                                      f"{'checking now' if probing else 'retrying soon'}")
 
     def clear_games(self):
         """Clear the game list."""
         for button in self.game_buttons:
             button.destroy()
         self.game_buttons = []
+        self.render_generation += 1  # Cancel any pending render chunks
+        self.thumbnails.cancel()
+        self.prefetcher.cancel()
+        self.photos.release('thumbnails')
         # Performance: Frees memory for large game lists.
 
     def clear_achievements(self):
         """Clear the achievement display."""
-        for label in self.achievement_labels:
-            label.destroy()
-        self.achievement_labels = []
+        self.achievement_panel.reset()
+        self.scheduler.cancel(group='icons')
+        self.photos.release('icons')
+        # Design Rationale: The panel's own widgets are hidden and reused, not destroyed.
 
     def start_search(self):
         """Start a threaded search for a user's games."""
-        steam_id = self.steam_id_entry.get().strip()
-        if not steam_id.isdigit() or len(steam_id) != 17:
-            messagebox.showerror("Error", "Please enter a valid 17-digit SteamID64")
+        profile = Profiles.parse(self.steam_id_entry.get())
+        if profile is None:
+            messagebox.showerror("Error", "Please enter a 17-digit SteamID64, a profile URL or a custom profile name")
             return
 
+        kind, value = profile
+        self.current_steam_id = value if kind == 'steam_id' else None
         self.clear_games()
         self.clear_achievements()
-        self.loading_label.config(text="Loading games...")
+        self.loading_label.config(text="Loading games..." if kind == 'steam_id' else "Finding profile...")
         self.search_button.config(state='disabled')
 
-        threading.Thread(target=self.search_user, args=(steam_id,), daemon=True).start()
+        if kind == 'steam_id':
+            self.scheduler.submit(self.search_user, value, priority=Scheduler.INTERACTIVE)
+        else:
+            self.scheduler.submit(self.search_vanity, value, priority=Scheduler.INTERACTIVE)
+        # Design Rationale: Input is parsed on the UI thread, so only a vanity name costs a
+        # request (ResolveVanityURL, cached on disk) before the library is fetched.
+
+    def search_vanity(self, name):
+        """Resolve a custom profile name, then search that user's games, in a separate thread."""
+        steam_id = Profiles.resolve_vanity(name)
+        if steam_id is None:
+            message = ("No saved profile for this name in offline mode." if Funcs.OFFLINE else
+                       f"Could not find a Steam profile named '{name}'.")
+            self.queue.put({
+                'type': 'error',
+                'message': message
+            })
+            return
+        self.search_user(steam_id)
 
-    def search_user(self, steam_id):
+    def restore_session(self):
+        """Render the last searched library from disk, then refresh it in the background."""
+        session = Snapshot.load_last_session()
+        if session is None:
+            return
+        steam_id, games = session
+        self.current_steam_id = steam_id
+        self.steam_id_entry.delete(0, tk.END)
+        self.steam_id_entry.insert(0, steam_id)
+        self.handle_search_result(steam_id, games)
+        if not Funcs.OFFLINE:
+            self.loading_label.config(text="Refreshing games...")
+            self.scheduler.submit(self.search_user, steam_id, True, priority=Scheduler.BACKGROUND)
+        # Performance: The snapshot is drawn before any network round trip, so startup
+        # shows a useful library immediately; the refresh only redraws if it changed.
+
+    def search_user(self, steam_id, refresh=False):
         """Search for a user's games in a separate thread."""
-        games = Funcs.get_owned_games(steam_id)
-        if games is None:
+        if Funcs.OFFLINE:
+            games = Snapshot.load_library(steam_id)
+        else:
+            games = Funcs.get_owned_games(steam_id)
+            if games is not None:
+                Snapshot.save_library(steam_id, games)
+                History.record_library(steam_id, games)
+        if refresh:
+            self.queue.put({
+                'type': 'refresh_result',
+                'steam_id': steam_id,
+                'games': games
+            })
+        elif games is None:
+            message = ("No saved library for this SteamID in offline mode." if Funcs.OFFLINE else
+                       "Could not fetch games. Ensure the SteamID is valid and the profile is public.")
             self.queue.put({
                 'type': 'error',
-                'message': "Could not fetch games. Ensure the SteamID is valid and the profile is public."
+                'message': message
             })
         else:
             self.queue.put({
@@ -202,13 +367,28 @@ class SteamApp:
         self.loading_label.config(text="")
         self.search_button.config(state='normal')
 
+        self.current_steam_id = steam_id
+        self.clear_games()
         self.games = games
-        for game in self.games:
+        self.render_games(steam_id, 0, self.render_generation)
+
+    def handle_refresh_result(self, steam_id, games):
+        """Apply a background library refresh if it is still current and has changed."""
+        assert threading.current_thread() == threading.main_thread(), "UI updates must occur in main thread"
+        if steam_id != self.current_steam_id:
+            return  # The user has searched for someone else since
+        self.loading_label.config(text="")
+        if games is not None and games != self.games:
+            self.handle_search_result(steam_id, games)
+
+    def render_games(self, steam_id, start, generation):
+        """Create game buttons in chunks, yielding to Tk between chunks."""
+        if generation != self.render_generation:
+            return  # Superseded by a newer search or refresh
+        end = min(start + (RENDER_FIRST_CHUNK if start == 0 else RENDER_CHUNK), len(self.games))
+        for game in self.games[start:end]:
             appid = game['appid']
             name = game['name']
-            img_url = f"https://steamcdn-a.akamaihd.net/steam/apps/{appid}/header.jpg"
-            cache_path = os.path.join(CACHE_DIR, f"{appid}.jpg")
-
             # Create button with placeholder image initially
             button = tk.Button(
                 self.scrollable_frame,
@@ -218,34 +398,73 @@ class SteamApp:
                 command=lambda a=appid, n=name: self.start_show_achievements(steam_id, a, n)
             )
             button.image = self.placeholder_img  # Initial reference
+            button.game = game
+            button.bindtags((GAME_TAG,) + button.bindtags())
             button.pack(fill="x", pady=2)
             self.game_buttons.append(button)
 
-            # Queue image loading in background
-            threading.Thread(
-                target=self.load_image_async,
-                args=(img_url, cache_path, (184, 69), button),
-                daemon=True
-            ).start()
+            # Queue image loading in background; the first chunk is what the user sees
+            priority = Scheduler.VISIBLE if start == 0 else Scheduler.BACKGROUND
+            self.thumbnails.submit_game(appid, (184, 69), CACHE_DIR, button, priority=priority)
+        if end < len(self.games):
+            self.root.after(1, self.render_games, steam_id, end, generation)
         # Performance: Lazy loading images prevents UI lag during initial rendering.
         # Design Rationale: Placeholder image ensures buttons render immediately.
 
-    def load_image_async(self, url, cache_path, resize_dims, widget):
-        """Load an image in a background thread and queue for UI update."""
-        photo = download_image(url, cache_path, resize_dims)
-        self.image_queue.put({'widget': widget, 'photo': photo})
+    def on_games_scroll(self, first, last):
+        """Update the scrollbar and schedule a prefetch of the games left in view."""
+        self.scrollbar.set(first, last)
+        if self.current_steam_id and self.game_buttons:
+            self.prefetcher.viewport_changed(self.current_steam_id)
+
+    def visible_games(self):
+        """Return the games whose buttons are in the visible part of the game list."""
+        count = len(self.game_buttons)
+        if not count:
+            return []
+        first, last = self.canvas.yview()
+        return self.games[int(first * count):min(count, int(last * count) + 1)]
+    # Performance: Buttons share one height, so the view fractions map straight to list
+    # indices without asking Tk for each button's position.
+
+    def on_game_enter(self, event):
+        game = getattr(event.widget, 'game', None)
+        if game is not None and self.current_steam_id:
+            self.prefetcher.hover(self.current_steam_id, game)
+
+    def on_game_leave(self, event):
+        game = getattr(event.widget, 'game', None)
+        if game is not None and self.current_steam_id:
+            self.prefetcher.leave(self.current_steam_id, game)
+
+    def load_image_async(self, url, cache_path, resize_dims, widget, asset_type='header', group='icons'):
+        """Load and decode an image in a background thread and queue its pixels for the UI."""
+        img_data = Thumbnails.fetch_image_bytes(url, cache_path, asset_type)
+        if img_data is None:
+            self.image_queue.put({'widget': widget, 'photo': None})
+            return
+        try:
+            pixels = Thumbnails.decode_thumbnail(img_data, resize_dims)
+        except Exception as e:
+            logging.error("Invalid image data for %s: %s", url, e)
+            self.image_queue.put({'widget': widget, 'photo': None})
+            return
+        self.image_queue.put({'widget': widget, 'pixels': pixels,
+                              'key': Thumbnails.image_key(img_data, resize_dims), 'group': group})
         # Performance: Async image loading improves responsiveness for large game lists.
+        # Design Rationale: The PhotoImage is created on the UI thread, where identical icons
+        # are shared through the photo registry.
 
     def start_show_achievements(self, steam_id, appid, game_name):
         """Start a threaded fetch of achievements."""
         self.clear_achievements()
         self.loading_label.config(text="Loading achievements...")
-        threading.Thread(target=self.show_achievements, args=(steam_id, appid, game_name), daemon=True).start()
+        self.scheduler.submit(self.show_achievements, steam_id, appid, game_name, priority=Scheduler.INTERACTIVE)
 
     def show_achievements(self, steam_id, appid, game_name):
         """Fetch achievements in a separate thread."""
-        achievements = Funcs.get_player_achievements(steam_id, appid)
-        global_achievements = Funcs.get_global_achievements(appid)
+        prefetched = self.prefetcher.take(steam_id, appid)
+        achievements, global_achievements = prefetched or self.load_achievements(steam_id, appid)
         self.queue.put({
             'type': 'achievements_result',
             'steam_id': steam_id,
@@ -255,34 +474,48 @@ class SteamApp:
             'global_achievements': global_achievements
         })
 
+    def load_achievements(self, steam_id, appid):
+        """Fetch, snapshot and merge a game's achievements; returns (achievements, global_achievements)."""
+        if Funcs.OFFLINE:
+            achievements, global_achievements = Snapshot.load_achievements(steam_id, appid) or ([], [])
+        else:
+            achievements = Funcs.get_player_achievements(steam_id, appid)
+            global_achievements = Funcs.get_global_achievements(appid)
+            if achievements:
+                Snapshot.save_achievements(steam_id, appid, achievements, global_achievements)
+                History.record_achievements(steam_id, appid, achievements)
+        if achievements:
+            achievements = Schema.merged(appid, achievements)
+        # Design Rationale: Snapshots keep only unlock state; names and icons come from the
+        # per-game schema, which offline mode reads from the response store.
+        return achievements, global_achievements
+
+    def prefetch_achievements(self, steam_id, appid):
+        """Load a game's achievements ahead of a click and queue the icons of its first rows."""
+        achievements, global_achievements = self.load_achievements(steam_id, appid)
+        for ach in achievements[:Prefetch.ICONS]:
+            icon_url = ach.get('icon') if ach.get('achieved', 0) == 1 else ach.get('icongray')
+            if icon_url:
+                self.prefetcher.submit(Thumbnails.fetch_image_bytes, icon_url,
+                                       Schema.icon_cache_path(CACHE_DIR, appid, icon_url), 'icon')
+        return achievements, global_achievements
+    # Design Rationale: Icons are only written to the disk cache; decoding them into Tk
+    # images waits until their rows are actually drawn.
+    # Performance: Each icon is its own background task, so the prefetch resolves once the
+    # API calls finish and a click never waits for downloads it does not need.
+
     def handle_achievements_result(self, steam_id, appid, game_name, achievements, global_achievements):
         """Handle the achievements result in the main thread."""
         assert threading.current_thread() == threading.main_thread(), "UI updates must occur in main thread"
         self.loading_label.config(text="")
 
         if not achievements:
-            tk.Label(self.achievement_frame, text="No achievements available for this game.").pack()
+            self.achievement_panel.show_empty()
             return
 
-        tk.Label(self.achievement_frame, text=f"Achievements for {game_name}", font=("Arial", 14, "bold")).pack(pady=5)
-
-        ach_canvas = Canvas(self.achievement_frame)
-        ach_scrollbar = Scrollbar(self.achievement_frame, orient="vertical", command=ach_canvas.yview)
-        ach_frame = Frame(ach_canvas)
-
-        ach_frame.bind(
-            "<Configure>",
-            lambda e: ach_canvas.configure(scrollregion=ach_canvas.bbox("all"))
-        )
-
-        ach_canvas.create_window((0, 0), window=ach_frame, anchor="nw")
-        ach_canvas.configure(yscrollcommand=ach_scrollbar.set)
-
-        ach_canvas.pack(side="left", fill="both", expand=True)
-        ach_scrollbar.pack(side="right", fill="y")
-
         global_percentages = {ach['name']: ach['percent'] for ach in global_achievements}
 
+        rows = []
         for ach in achievements:
             ach_name = ach.get('apiname', 'Unknown')
             display_name = ach.get('name', ach_name)
@@ -291,40 +524,49 @@ class SteamApp:
             icon_url = ach.get('icon') if unlocked else ach.get('icongray')
             percent = global_percentages.get(ach_name, 'N/A')
 
-            frame = Frame(ach_frame)
             status = "Unlocked" if unlocked else "Locked"
             color = "green" if unlocked else "gray"
-            text = f"{display_name}\n{description}\nStatus: {status}\nGlobal Unlock: {percent}%"
-
-            # Create label with placeholder image
-            label = tk.Label(
-                frame,
-                image=self.placeholder_img,
-                text=text,
-                compound="left",
-                anchor="w",
-                justify="left",
-                fg=color,
-                wraplength=400
-            )
-            label.image = self.placeholder_img  # Initial reference
-            label.pack(fill="x", pady=5)
-            frame.pack(fill="x", padx=5)
-            self.achievement_labels.append(frame)
-
-            # Queue image loading in background
-            if icon_url:
-                cache_path = os.path.join(CACHE_DIR, f"{appid}_{ach_name}.jpg")
-                threading.Thread(
-                    target=self.load_image_async,
-                    args=(icon_url, cache_path, (64, 64), label),
-                    daemon=True
-                ).start()
-            # Performance: Lazy loading achievement icons reduces initial rendering time.
-            # Design Rationale: Placeholder ensures UI renders smoothly while images load.
-
-if __name__ == "__main__":
+            rows.append({
+                'text': f"{display_name}\n{description}\nStatus: {status}\nGlobal Unlock: {percent}%",
+                'color': color,
+                'icon_url': icon_url,
+                'cache_path': Schema.icon_cache_path(CACHE_DIR, appid, icon_url) if icon_url else None
+            })
+        self.achievement_panel.show(game_name, rows)
+        # Performance: Rows are drawn as canvas items for the visible range only, so
+        # games with thousands of achievements render in constant time.
+
+    def request_achievement_icon(self, index, row):
+        """Load an achievement icon in the background once its row becomes visible."""
+        if row['icon_url']:
+            self.scheduler.submit(self.load_image_async, row['icon_url'], row['cache_path'], (64, 64),
+                                  self.achievement_panel.list.icon_slot(index), 'icon',
+                                  priority=Scheduler.VISIBLE, group='icons')
+        # Design Rationale: Placeholder ensures rows render smoothly while icons load.
+
+def main(argv=None):
+    """Initialise configuration and run the application."""
+    parser = argparse.ArgumentParser(description="Steam User Game and Achievement Viewer")
+    parser.add_argument('--offline', action='store_true',
+                        help="show the last saved session without touching the network")
+    parser.add_argument('--log-json', action='store_true',
+                        help="write log records as JSON lines")
+    parser.add_argument('--memory-limit-mb', type=int,
+                        help="keep memory under this many MiB by shrinking caches and worker pools")
+    args = parser.parse_args(argv)
+    init(offline=args.offline, log_json=args.log_json, memory_limit_mb=args.memory_limit_mb)
     root = tk.Tk()
     app = SteamApp(root)
     root.mainloop()
+    Breaker.remove_listener(app.on_breaker_change)
+    Schema.remove_listener(app.prefetcher.forget)
+    Memory.get_governor().remove_listener(app.on_memory_pressure)
+    Memory.get_governor().stop()
+    app.thumbnails.shutdown()
+    app.scheduler.shutdown()
+    History.close()
+    Logs.shutdown()
+
+if __name__ == "__main__":
+    main()
 
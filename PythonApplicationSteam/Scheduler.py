@@ -0,0 +1,205 @@
+import heapq
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+# Priority classes; lower values run first
+INTERACTIVE = 0   # Work the user is waiting on, e.g. a click or a search
+VISIBLE = 1       # Images for widgets currently on screen
+BACKGROUND = 2    # Off-screen images, refreshes, revalidation and prefetch
+
+# Shared worker threads for all network work
+WORKERS = 16
+# Workers kept free of background work so a click never waits for a worker
+RESERVED_WORKERS = 4
+# Concurrent requests per host
+PER_HOST = 6
+
+_local = threading.local()
+
+def current_priority():
+    """Return the priority of the task running on this thread (INTERACTIVE if unscheduled)."""
+    return getattr(_local, 'priority', INTERACTIVE)
+# Design Rationale: Code that calls Funcs directly is waiting on the result, so it is
+# treated as interactive; scheduled tasks pass their own class down to their requests.
+
+def host_of(url):
+    """Return the host part of a URL, used to key per-host limits."""
+    return urlsplit(url).hostname or ''
+
+
+class _Task:
+    __slots__ = ('priority', 'group', 'fn', 'args', 'kwargs', 'future')
+
+    def __init__(self, priority, group, fn, args, kwargs):
+        self.priority = priority
+        self.group = group
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+
+
+class NetworkScheduler:
+    """Runs network work on shared threads in priority order with per-host limits."""
+    def __init__(self, workers=WORKERS, reserved_workers=RESERVED_WORKERS, per_host=PER_HOST, host_limits=None):
+        self.workers = workers
+        self.reserved_workers = reserved_workers
+        self.max_background = max(1, workers - reserved_workers)
+        self.per_host = per_host
+        self.host_limits = dict(host_limits or {})
+        self._cond = threading.Condition()
+        self._queue = []                  # heap of (priority, sequence, task)
+        self._sequence = itertools.count()
+        self._running_background = 0
+        self._host_active = {}
+        self._host_waiters = {}           # host -> heap of (priority, sequence)
+        self._threads = []
+        self._shutdown = False
+
+    def submit(self, fn, *args, priority=BACKGROUND, group=None, **kwargs):
+        """Queue fn(*args, **kwargs) and return a Future for its result."""
+        task = _Task(priority, group, fn, args, kwargs)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            heapq.heappush(self._queue, (priority, next(self._sequence), task))
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, name=f"network-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify_all()
+        return task.future
+
+    def cancel(self, group=None, priority=None):
+        """Cancel queued tasks matching a group and/or priority; returns the number cancelled."""
+        with self._cond:
+            keep, cancelled = [], []
+            for entry in self._queue:
+                task = entry[2]
+                if (group is None or task.group == group) and (priority is None or task.priority == priority):
+                    cancelled.append(task)
+                else:
+                    keep.append(entry)
+            heapq.heapify(keep)
+            self._queue = keep
+        for task in cancelled:
+            task.future.cancel()
+        return len(cancelled)
+    # Performance: A new search or click drops the queued work of the previous one
+    # instead of letting it compete for connections.
+
+    def pending(self):
+        """Return the number of queued tasks."""
+        with self._cond:
+            return len(self._queue)
+
+    def _next_task(self):
+        if not self._queue:
+            return None
+        priority, _, task = self._queue[0]
+        if priority >= BACKGROUND and self._running_background >= self.max_background:
+            return None
+        heapq.heappop(self._queue)
+        if priority >= BACKGROUND:
+            self._running_background += 1
+        return task
+    # Design Rationale: The heap keeps higher classes in front, so when its head is background
+    # work nothing more urgent is waiting; capping background work reserves workers for it.
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    if self._shutdown:
+                        return
+                    if len(self._threads) > self.workers:
+                        self._threads.remove(threading.current_thread())
+                        return
+                    self._cond.wait()
+                    task = self._next_task()
+            try:
+                if task.future.set_running_or_notify_cancel():
+                    _local.priority = task.priority
+                    try:
+                        task.future.set_result(task.fn(*task.args, **task.kwargs))
+                    except BaseException as e:
+                        logging.error("Scheduled task %s failed: %s", getattr(task.fn, '__name__', task.fn), e)
+                        task.future.set_exception(e)
+            finally:
+                _local.priority = INTERACTIVE
+                with self._cond:
+                    if task.priority >= BACKGROUND:
+                        self._running_background -= 1
+                    self._cond.notify_all()
+
+    def resize(self, workers):
+        """Change the number of worker threads; idle workers above the new count exit."""
+        with self._cond:
+            self.workers = max(1, workers)
+            self.max_background = max(1, self.workers - self.reserved_workers)
+            self._cond.notify_all()
+    # Performance: Used by the memory governor; each exiting thread returns its stack.
+
+    @contextmanager
+    def host_slot(self, host, priority=None):
+        """Hold one of a host's connection slots; waiters are admitted in priority order."""
+        if priority is None:
+            priority = current_priority()
+        limit = self.host_limits.get(host, self.per_host)
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            waiters = self._host_waiters.setdefault(host, [])
+            heapq.heappush(waiters, ticket)
+            while self._host_active.get(host, 0) >= limit or waiters[0] != ticket:
+                self._cond.wait()
+            heapq.heappop(waiters)
+            self._host_active[host] = self._host_active.get(host, 0) + 1
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            self.release_host_slot(host)
+    # Performance: When a host is saturated, a click's request takes the next free slot
+    # ahead of any queued header downloads.
+
+    def try_host_slot(self, host):
+        """Take a free host slot without waiting; returns False if none is free or others are queued."""
+        limit = self.host_limits.get(host, self.per_host)
+        with self._cond:
+            if self._host_active.get(host, 0) >= limit or self._host_waiters.get(host):
+                return False
+            self._host_active[host] = self._host_active.get(host, 0) + 1
+            return True
+    # Design Rationale: Speculative requests such as hedges never jump the queue; a slot
+    # somebody is already waiting for goes to them.
+
+    def release_host_slot(self, host):
+        """Return a slot taken with try_host_slot."""
+        with self._cond:
+            self._host_active[host] -= 1
+            self._cond.notify_all()
+
+    def shutdown(self, cancel_pending=True):
+        """Stop the workers once their current tasks finish."""
+        if cancel_pending:
+            self.cancel()
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+def get_scheduler():
+    """Return the process-wide scheduler shared by SteamApp, Funcs and the caches."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = NetworkScheduler()
+        return _default
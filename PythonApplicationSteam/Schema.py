@@ -0,0 +1,141 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+import Funcs
+import Cache
+
+# Schemas kept in memory; each is a few KB to a few hundred KB for large games
+MAX_SCHEMAS = 64
+# Approximate memory of one indexed achievement, used to report the cache size
+ACHIEVEMENT_BYTES = 1024
+# Seconds a schema must have been loaded before an unknown achievement revalidates it
+MIN_REVALIDATE = 60
+
+_schemas = OrderedDict()    # appid -> (loaded_at, schema), least recently used first
+_listeners = []
+_lock = threading.Lock()
+
+
+def _index(game):
+    achievements = game.get('availableGameStats', {}).get('achievements', [])
+    return {
+        'version': game.get('gameVersion'),
+        'achievements': {ach['name']: ach for ach in achievements if 'name' in ach},
+    }
+
+def get_schema(appid, revalidate=False):
+    """Return {'version', 'achievements': {apiname: entry}} for a game, or None if unavailable.
+
+    Schemas are shared across players: they are loaded once per process and kept on disk
+    by the response store, which revalidates them with conditional GETs. revalidate asks
+    Steam even while the cached schema is fresh.
+    """
+    with _lock:
+        cached = _schemas.get(appid)
+        if cached:
+            _schemas.move_to_end(appid)
+    if cached and not revalidate and Cache.is_fresh(cached[0], 'game_schema'):
+        return cached[1]
+    game = Funcs.get_game_schema(appid, revalidate=True) if revalidate else Funcs.get_game_schema(appid)
+    if game is None:
+        return cached[1] if cached else None
+    schema = _index(game)
+    with _lock:
+        _schemas[appid] = (time.time(), schema)
+        _schemas.move_to_end(appid)
+        while len(_schemas) > MAX_SCHEMAS:
+            _schemas.popitem(last=False)
+    if cached and cached[1]['version'] != schema['version']:
+        logging.info("Achievement schema of appid %s changed from version %s to %s",
+                     appid, cached[1]['version'], schema['version'])
+        _notify(appid)
+    return schema
+# Performance: A batch over many players of one game parses its schema once; the stored
+# payload's ETag turns later revalidations into 304s until the game's version changes.
+# Design Rationale: Hits move a schema to the end, so eviction drops the least recently
+# used game rather than the one loaded first.
+
+def merged(appid, achievements):
+    """Merge a player's achievements with the game's schema, revalidating it if it lacks some."""
+    schema = get_schema(appid)
+    if schema and any(ach.get('apiname') not in schema['achievements'] for ach in achievements):
+        with _lock:
+            cached = _schemas.get(appid)
+        if cached and time.time() - cached[0] >= MIN_REVALIDATE:
+            schema = get_schema(appid, revalidate=True)
+    return merge(achievements, schema)
+# Design Rationale: An achievement the schema does not know means the game was updated;
+# the schema is checked at once (a 304 if nothing changed) instead of waiting out the
+# TTL, at most once per MIN_REVALIDATE.
+
+def add_listener(callback):
+    """Call callback(appid) from any thread when a game's schema version changes."""
+    with _lock:
+        _listeners.append(callback)
+
+def remove_listener(callback):
+    with _lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+def _notify(appid):
+    with _lock:
+        listeners = list(_listeners)
+    for callback in listeners:
+        try:
+            callback(appid)
+        except Exception as e:
+            logging.error("Schema listener failed: %s", e)
+# Design Rationale: Merged achievements held elsewhere (e.g. prefetched results) carry
+# display names and icon URLs from the old schema; listeners drop them on a new version.
+
+def merge(achievements, schema):
+    """Combine per-player unlock state with display names, descriptions and icons."""
+    if not schema:
+        return achievements
+    entries = schema['achievements']
+    merged = []
+    for ach in achievements:
+        entry = entries.get(ach.get('apiname'))
+        if entry is None:
+            merged.append(ach)
+            continue
+        merged.append(dict(ach,
+                           name=entry.get('displayName', ach.get('apiname')),
+                           description=entry.get('description', ''),
+                           icon=entry.get('icon'),
+                           icongray=entry.get('icongray')))
+    return merged
+# Design Rationale: Player fields win over missing schema entries, so achievements added
+# after the cached schema still render with their API name until it is revalidated.
+
+def icon_cache_path(cache_dir, appid, icon_url):
+    """Return the cache file for an achievement icon, keyed by the hash in its URL."""
+    name = os.path.splitext(os.path.basename(urlsplit(icon_url).path))[0]
+    return os.path.join(cache_dir, f"{appid}_{name}.jpg")
+# Performance: Icon URLs are content hashes, so an icon shared by several achievements is
+# downloaded once and a changed icon gets a new file instead of a stale cache hit.
+
+def size_bytes():
+    """Return the approximate memory held by in-memory schemas."""
+    with _lock:
+        return sum(len(schema['achievements']) + 1 for _, schema in _schemas.values()) * ACHIEVEMENT_BYTES
+
+def trim(fraction):
+    """Forget the least recently used fraction of in-memory schemas; return the approximate bytes freed."""
+    with _lock:
+        freed = 0
+        for _ in range(int(len(_schemas) * fraction + 0.999)):
+            _, (_, schema) = _schemas.popitem(last=False)
+            freed += (len(schema['achievements']) + 1) * ACHIEVEMENT_BYTES
+        return freed
+# Design Rationale: Trimmed schemas are reloaded from the response store on next use, so
+# the memory governor can drop them without a network round trip.
+
+def reset():
+    """Forget the in-memory schemas."""
+    with _lock:
+        _schemas.clear()
@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import logging
+import Cache
+# Design Rationale: Only the standard library is used so loading a snapshot never
+# waits on the HTTP or imaging stacks.
+
+# Snapshot directory, set by init(); persistence is disabled until then
+SNAPSHOT_DIR = None
+LAST_SESSION_FILE = 'last_session.json'
+LIBRARY_FILE = 'library.json'
+
+def init(snapshot_dir='session_snapshot'):
+    """Enable session snapshots stored under snapshot_dir."""
+    global SNAPSHOT_DIR
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+    except OSError as e:
+        logging.error("Failed to create snapshot directory %s: %s", snapshot_dir, e)
+        raise
+    SNAPSHOT_DIR = snapshot_dir
+# Design Rationale: Opt-in persistence keeps tests and batch workers from writing
+# snapshots into the working directory.
+
+def _user_dir(steam_id):
+    return os.path.join(SNAPSHOT_DIR, str(steam_id))
+
+def _write_json(path, data):
+    """Write JSON atomically so a crash mid-write never corrupts the last snapshot."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        logging.error("Cannot write snapshot %s: %s", path, e)
+        return False
+
+def _read_json(path):
+    """Read a JSON snapshot file, returning None if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
+
+def save_library(steam_id, games):
+    """Persist a user's owned games and mark them as the last searched user."""
+    if SNAPSHOT_DIR is None:
+        return False
+    data = {'steam_id': steam_id, 'saved_at': time.time(), 'games': games}
+    if not _write_json(os.path.join(_user_dir(steam_id), LIBRARY_FILE), data):
+        return False
+    return _write_json(os.path.join(SNAPSHOT_DIR, LAST_SESSION_FILE), {'steam_id': steam_id})
+
+def _is_current(data, fresh_for):
+    return fresh_for is None or Cache.is_fresh(data.get('saved_at', 0), fresh_for)
+
+def load_library(steam_id, fresh_for=None):
+    """Return the snapshotted games for a user, or None if there is no snapshot.
+
+    With fresh_for (a Cache.REVALIDATE_INTERVALS asset type), a snapshot older than that
+    type's interval also counts as missing.
+    """
+    if SNAPSHOT_DIR is None:
+        return None
+    data = _read_json(os.path.join(_user_dir(steam_id), LIBRARY_FILE))
+    return data.get('games') if data and _is_current(data, fresh_for) else None
+
+def load_last_session():
+    """Return (steam_id, games) for the last searched user, or None."""
+    if SNAPSHOT_DIR is None:
+        return None
+    last = _read_json(os.path.join(SNAPSHOT_DIR, LAST_SESSION_FILE))
+    if not last or 'steam_id' not in last:
+        return None
+    games = load_library(last['steam_id'])
+    if games is None:
+        return None
+    return last['steam_id'], games
+
+def save_achievements(steam_id, appid, achievements, global_achievements):
+    """Persist a user's achievement data for one game."""
+    if SNAPSHOT_DIR is None:
+        return False
+    data = {
+        'saved_at': time.time(),
+        'achievements': achievements,
+        'global_achievements': global_achievements
+    }
+    return _write_json(os.path.join(_user_dir(steam_id), f"{appid}.json"), data)
+# Performance: One file per game keeps each click's write small even for large libraries.
+
+def load_achievements(steam_id, appid, fresh_for=None):
+    """Return (achievements, global_achievements) for a game, or None if not snapshotted.
+
+    fresh_for works as in load_library.
+    """
+    if SNAPSHOT_DIR is None:
+        return None
+    data = _read_json(os.path.join(_user_dir(steam_id), f"{appid}.json"))
+    if not data or not _is_current(data, fresh_for):
+        return None
+    return data.get('achievements', []), data.get('global_achievements', [])
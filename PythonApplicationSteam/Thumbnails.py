@@ -0,0 +1,289 @@
+import io
+import os
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import Funcs
+import Cache
+import Scheduler
+import Http
+import Breaker
+import Assets
+import CacheDaemon
+# Performance: PIL and requests are imported inside the functions that need them, so
+# spawned decode workers only load PIL and the UI process defers both until first use.
+
+# Decode processes; decoding and resizing are CPU-bound, so one per core
+DECODE_WORKERS = os.cpu_count() or 2
+
+def fetch_image_bytes(url, cache_path, asset_type='header'):
+    """Return image bytes from the cache, downloading and caching them if needed."""
+    if not Funcs.OFFLINE and CacheDaemon.enabled():
+        try:
+            return CacheDaemon.fetch_image(url, cache_path, asset_type)
+        except CacheDaemon.Unavailable:
+            pass
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                img_data = f.read()
+        except OSError as e:
+            logging.error("Cannot read cache %s: %s", cache_path, e)
+            return None
+        if not Funcs.OFFLINE:
+            Cache.schedule_image_revalidation(url, cache_path, asset_type)
+        return img_data
+    if Funcs.OFFLINE:
+        return None
+    return download_to_cache(url, cache_path)[1]
+# Performance: Caching reduces API calls; the 5s timeout is a ceiling that Http.get lowers
+# once the CDN's latency is known.
+# Design Rationale: Cache hits are served immediately and revalidated in the background
+# once their asset type's interval has passed, so updated store art eventually shows.
+# Design Rationale: When a cache daemon runs on the host it owns the image cache, so
+# processes never write the same file concurrently; without one, nothing changes.
+
+def download_to_cache(url, cache_path, before_request=None):
+    """Download an image into cache_path; return (status code or None on network errors, bytes or None).
+
+    before_request() is called first, e.g. to take a rate-limit token.
+    """
+    import requests
+    if before_request:
+        before_request()
+    if CacheDaemon.enabled():
+        try:
+            return CacheDaemon.download(url, cache_path)
+        except CacheDaemon.Unavailable:
+            pass
+    try:
+        response = Http.get(url, default_timeout=5)
+        response.raise_for_status()
+        img_data = response.content
+    except Breaker.CircuitOpenError:
+        return None, None
+    except requests.HTTPError as e:
+        if response.status_code != 404:
+            logging.error("Failed to download image %s: %s", url, e)
+        return response.status_code, None
+    except requests.RequestException as e:
+        logging.error("Failed to download image %s: %s", url, e)
+        return None, None
+    # Design Rationale: While the image host's breaker is open the placeholder stays up;
+    # the breaker logs the outage once instead of once per thumbnail. A 404 is expected
+    # for asset variants a game does not have, so it is left to the caller to report.
+    try:
+        with open(cache_path, 'wb') as f:
+            f.write(img_data)
+    except OSError as e:
+        logging.error("Cannot write to cache %s: %s", cache_path, e)
+        return response.status_code, None
+    Cache.write_image_validators(cache_path, response.headers)
+    return response.status_code, img_data
+
+def fetch_game_image(appid, size, cache_dir, before_request=None):
+    """Return bytes for the smallest cached or downloadable store-art variant covering size.
+
+    before_request() is called before each download down the chain.
+    """
+    chain = Assets.candidates(appid, size, cache_dir)
+    for variant, url, cache_path in chain:
+        if os.path.exists(cache_path):
+            return fetch_image_bytes(url, cache_path)
+    if Funcs.OFFLINE:
+        return None
+    for variant, url, cache_path in chain:
+        status, img_data = download_to_cache(url, cache_path, before_request)
+        if img_data is not None:
+            return img_data
+        if status != 404:
+            return None
+        Assets.mark_missing(appid, variant)
+    logging.warning("No store art found for appid %s", appid)
+    return None
+# Design Rationale: Any cached variant in the chain is used before downloading the best
+# one, so headers cached by earlier versions are not fetched again. Only 404s move down
+# the chain; other errors leave the placeholder and are retried next time.
+
+def decode_thumbnail(img_data, size):
+    """Decode and resize image bytes, returning (mode, size, raw pixel bytes)."""
+    from PIL import Image
+    img = Image.open(io.BytesIO(img_data))
+    img.draft('RGB', size)
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGB')
+    if img.size != size:
+        img = img.resize(size, Image.LANCZOS)
+    return img.mode, img.size, img.tobytes()
+# Performance: draft() lets the JPEG decoder scale by 1/2, 1/4 or 1/8 while decoding,
+# so LANCZOS only has to finish the last step from a much smaller image; right-sized
+# CDN variants skip the resize entirely.
+# Design Rationale: Module-level and returning plain bytes so it can run in a worker
+# process; Tk objects can only be created on the UI thread.
+
+def photo_from_pixels(mode, size, pixels):
+    """Create an ImageTk.PhotoImage from raw pixels; must run on the UI thread."""
+    from PIL import Image, ImageTk
+    return ImageTk.PhotoImage(Image.frombuffer(mode, size, pixels, 'raw', mode, 0, 1))
+
+def image_key(img_data, size):
+    """Return the registry key for image bytes shown at size."""
+    return hashlib.blake2b(img_data, digest_size=16).hexdigest(), tuple(size)
+# Design Rationale: Keyed by content rather than URL, so the same art cached under
+# different paths (e.g. a game found in two searches, or a shared locked icon) is one image.
+
+
+def _photo_bytes(key):
+    width, height = key[1]
+    return width * height * 4  # Tk keeps 32-bit pixels regardless of the source mode
+
+
+class PhotoRegistry:
+    """Shares one PhotoImage per (content hash, size) between widgets, with reference counts.
+
+    References are held per group ('thumbnails', 'icons'); release(group) drops a group's
+    references and frees every image no other group still uses. UI thread only.
+    """
+    def __init__(self):
+        self.photos = {}        # key -> [photo, refcount]
+        self.groups = {}        # group -> [key, ...], one entry per reference
+        self.bytes = 0          # Approximate pixel memory of the live images
+        self.max_bytes = None   # Budget for new images, set by the memory governor
+
+    def acquire(self, key, create, group):
+        """Return the shared image for key, calling create() only if none is alive.
+
+        Returns None instead of creating an image that would exceed max_bytes.
+        """
+        entry = self.photos.get(key)
+        if entry is None:
+            cost = _photo_bytes(key)
+            if self.max_bytes is not None and self.bytes + cost > self.max_bytes:
+                return None
+            entry = self.photos[key] = [create(), 0]
+            self.bytes += cost
+        entry[1] += 1
+        self.groups.setdefault(group, []).append(key)
+        return entry[0]
+
+    def release(self, group):
+        """Drop every reference held by group; return the number of images freed."""
+        freed = 0
+        for key in self.groups.pop(group, ()):
+            entry = self.photos[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.photos[key]
+                self.bytes -= _photo_bytes(key)
+                freed += 1
+        return freed
+
+    def __len__(self):
+        return len(self.photos)
+# Performance: Each PhotoImage owns a Tk pixel buffer; a page of locked achievements
+# that share one gray icon holds a single buffer instead of one per row.
+# Design Rationale: Tk deletes an image once its last Python reference goes, so dropping
+# the registry's reference after the widgets are destroyed is what frees the buffer.
+
+
+class ThumbnailPipeline:
+    """Download images on the network scheduler and decode them in a process pool."""
+    def __init__(self, result_queue, scheduler=None, decode_workers=DECODE_WORKERS, use_processes=True):
+        self.result_queue = result_queue
+        self.scheduler = scheduler or Scheduler.get_scheduler()
+        self.decode_workers = decode_workers
+        self.use_processes = use_processes
+        self.decode_pool = None
+        self._pool_lock = threading.Lock()
+    # Design Rationale: Results go to the image queue as {'widget', 'pixels', 'key', 'group'}
+    # messages so the UI thread creates or shares the PhotoImage through its PhotoRegistry.
+
+    def submit(self, url, cache_path, size, widget, asset_type='header', priority=Scheduler.VISIBLE):
+        """Queue a thumbnail for widget; the result is delivered through result_queue."""
+        return self.scheduler.submit(self._fetch, url, cache_path, tuple(size), widget, asset_type,
+                                     priority=priority, group='thumbnails')
+
+    def submit_game(self, appid, size, cache_dir, widget, priority=Scheduler.VISIBLE):
+        """Queue the smallest store-art variant of a game that covers size for widget."""
+        return self.scheduler.submit(self._fetch_game, appid, tuple(size), cache_dir, widget,
+                                     priority=priority, group='thumbnails')
+
+    def cancel(self):
+        """Drop queued thumbnails, e.g. when the game list is cleared."""
+        return self.scheduler.cancel(group='thumbnails')
+
+    def _submit_decode(self, img_data, size):
+        """Queue a decode in the process pool; returns None once decoding has moved to threads."""
+        with self._pool_lock:
+            if self.decode_pool is None and self.use_processes:
+                try:
+                    self.decode_pool = ProcessPoolExecutor(
+                        max_workers=self.decode_workers, mp_context=multiprocessing.get_context('spawn'))
+                except (OSError, NotImplementedError) as e:
+                    logging.warning("Process pool unavailable, decoding in threads: %s", e)
+                    self.use_processes = False
+            if self.decode_pool is None:
+                return None
+            try:
+                return self.decode_pool.submit(decode_thumbnail, img_data, size)
+            except BrokenProcessPool as e:
+                logging.warning("Process pool failed, decoding in threads: %s", e)
+                self.use_processes = False
+                self.decode_pool = None
+                return None
+    # Design Rationale: 'spawn' avoids forking a process that holds Tk and live threads;
+    # spawned workers only import this module and PIL.
+
+    def _fetch(self, url, cache_path, size, widget, asset_type):
+        self._decode(fetch_image_bytes(url, cache_path, asset_type), url, size, widget)
+
+    def _fetch_game(self, appid, size, cache_dir, widget):
+        self._decode(fetch_game_image(appid, size, cache_dir), f"app {appid}", size, widget)
+
+    def _decode(self, img_data, url, size, widget):
+        if img_data is None:
+            self.result_queue.put({'widget': widget, 'photo': None})
+            return
+        key = image_key(img_data, size)
+        future = self._submit_decode(img_data, size)
+        if future is not None:
+            future.add_done_callback(lambda f: self._deliver(f, url, widget, key))
+            return
+        self._deliver_pixels(url, widget, key, lambda: decode_thumbnail(img_data, size))
+
+    def _deliver(self, future, url, widget, key):
+        self._deliver_pixels(url, widget, key, future.result)
+
+    def _deliver_pixels(self, url, widget, key, get_pixels):
+        try:
+            pixels = get_pixels()
+        except Exception as e:
+            logging.error("Invalid image data for %s: %s", url, e)
+            self.result_queue.put({'widget': widget, 'photo': None})
+            return
+        self.result_queue.put({'widget': widget, 'pixels': pixels, 'key': key, 'group': 'thumbnails'})
+
+    def resize(self, decode_workers):
+        """Change the number of decode processes; the pool restarts at that size on next use."""
+        with self._pool_lock:
+            if decode_workers == self.decode_workers:
+                return
+            self.decode_workers = max(1, decode_workers)
+            pool, self.decode_pool = self.decode_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+    # Design Rationale: Decodes already submitted to the old pool still finish and deliver;
+    # only idle processes are given back. Submissions hold the same lock, so none can reach
+    # the old pool after it was shut down and be mistaken for a broken one.
+
+    def shutdown(self):
+        """Drop queued thumbnails and stop the decode processes."""
+        self.cancel()
+        with self._pool_lock:
+            pool, self.decode_pool = self.decode_pool, None
+            self.use_processes = False
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
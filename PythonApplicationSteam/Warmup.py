@@ -0,0 +1,169 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import threading
+import Funcs
+import Profiles
+import Cache
+import Scheduler
+import Schema
+import Assets
+import Thumbnails
+
+# Sizes the viewer shows: game buttons and achievement rows
+GAME_ART_SIZE = (184, 69)
+# Network requests per second across all warm-up workers
+DEFAULT_RATE = 20.0
+# Seconds between progress reports
+PROGRESS_INTERVAL = 5.0
+
+
+class RateLimiter:
+    """Token bucket shared by threads; acquire() blocks until a request may start."""
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+# Design Rationale: Warm-up runs beside the CDN and API budgets of live kiosks, so it is
+# limited by request rate rather than by concurrency alone.
+
+
+class Progress:
+    """Counts warmed apps and reports throughput every PROGRESS_INTERVAL seconds."""
+    def __init__(self, total, report=None, interval=PROGRESS_INTERVAL):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.downloads = 0
+        self.report = report or (lambda p: logging.info("%s", p))
+        self.interval = interval
+        self.started = self.last_report = time.monotonic()
+        self.lock = threading.Lock()
+
+    def update(self, downloads=0, failed=False):
+        with self.lock:
+            self.done += 1
+            self.failed += failed
+            self.downloads += downloads
+            now = time.monotonic()
+            due = now - self.last_report >= self.interval or self.done == self.total
+            if due:
+                self.last_report = now
+        if due:
+            self.report(self)
+
+    def __str__(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return (f"Warmed {self.done}/{self.total} apps ({self.failed} failed), "
+                f"{self.downloads} downloads, {self.done / elapsed:.1f} apps/s")
+
+
+def warm_app(appid, cache_dir, limiter):
+    """Fill the caches for one game; return the number of images downloaded."""
+    downloads = 0
+    Funcs.fetch_global_achievements(appid, before_request=limiter.acquire)
+
+    if not any(os.path.exists(path) for _, _, path in Assets.candidates(appid, GAME_ART_SIZE, cache_dir)):
+        if Thumbnails.fetch_game_image(appid, GAME_ART_SIZE, cache_dir, before_request=limiter.acquire) is not None:
+            downloads += 1
+
+    game = Funcs.fetch_game_schema(appid, before_request=limiter.acquire)
+    icons = set()
+    for entry in (game or {}).get('availableGameStats', {}).get('achievements', []):
+        icons.update(url for url in (entry.get('icon'), entry.get('icongray')) if url)
+    for url in sorted(icons):
+        cache_path = Schema.icon_cache_path(cache_dir, appid, url)
+        if os.path.exists(cache_path):
+            continue
+        if Thumbnails.download_to_cache(url, cache_path, before_request=limiter.acquire)[1] is not None:
+            downloads += 1
+    return downloads
+# Performance: Images already on disk and fresh API responses cost neither a token nor a
+# request; the limiter is only consulted just before something is sent.
+# Design Rationale: The raising fetchers are used so an unreachable API fails the app and
+# shows in the summary instead of counting as warmed with nothing cached.
+
+def warm(appids, cache_dir, rate=DEFAULT_RATE, scheduler=None, report=None):
+    """Warm the image and API caches for appids in parallel; return the Progress."""
+    appids = list(dict.fromkeys(appids))
+    scheduler = scheduler or Scheduler.get_scheduler()
+    limiter = RateLimiter(rate)
+    progress = Progress(len(appids), report)
+
+    def run(appid):
+        try:
+            progress.update(downloads=warm_app(appid, cache_dir, limiter))
+        except Exception as e:
+            logging.error("Cannot warm appid %s: %s", appid, e)
+            progress.update(failed=True)
+
+    futures = [scheduler.submit(run, appid, priority=Scheduler.BACKGROUND, group='warmup') for appid in appids]
+    for future in futures:
+        future.result()
+    return progress
+# Design Rationale: Runs as background work on the shared scheduler, so per-host limits
+# apply and a viewer in the same process keeps priority over warm-up requests.
+
+def appids_from_games(games):
+    """Return appids from an owned-games response, most played first."""
+    return [g['appid'] for g in sorted(games, key=lambda g: g.get('playtime_forever', 0), reverse=True)]
+
+def main(argv=None):
+    """Command line entry point: warm the caches for appid lists, users' libraries or popular games."""
+    parser = argparse.ArgumentParser(description="Fill the image and Steam API caches ahead of use")
+    parser.add_argument('appids', nargs='*', type=int, help="appids to warm")
+    parser.add_argument('--file', help="file with one appid per line")
+    parser.add_argument('--steam-id', action='append', default=[],
+                        help="also warm every game this user owns; a SteamID64, profile URL or name (repeatable)")
+    parser.add_argument('--popular', type=int, default=0, metavar='N',
+                        help="also warm Steam's N most played games")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help="requests per second (0 for no limit)")
+    parser.add_argument('--cache-dir', default='image_cache')
+    parser.add_argument('--api-cache-dir', default='api_cache')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    Funcs.init(response_store=Cache.ResponseStore(args.api_cache_dir))
+    os.makedirs(args.cache_dir, exist_ok=True)
+    Assets.init(args.cache_dir)
+
+    appids = list(args.appids)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            appids += [int(line) for line in f if line.strip()]
+    for profile in args.steam_id:
+        steam_id = Profiles.resolve(profile)
+        if steam_id is None:
+            parser.error(f"no Steam profile for {profile!r}")
+        appids += appids_from_games(Funcs.get_owned_games(steam_id) or [])
+    if args.popular:
+        appids += Funcs.get_most_played_games()[:args.popular]
+    if not appids:
+        parser.error("no appids to warm")
+
+    progress = warm(appids, args.cache_dir, rate=args.rate)
+    Scheduler.get_scheduler().shutdown()
+    return 1 if progress.failed else 0
+# Design Rationale: Uses the same default directories as the viewer, so running it from
+# the viewer's working directory off-hours warms exactly the caches the viewer reads.
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import unittest
+import os
+import sys
+import time
+import tkinter as tk
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import AchievementView
+from AchievementView import visible_range, ROW_HEIGHT, OVERSCAN
+
+HAS_DISPLAY = bool(os.environ.get('DISPLAY')) or sys.platform == 'win32'
+
+class TestVisibleRange(unittest.TestCase):
+    """Test cases for the visible row computation"""
+
+    def test_top_of_list(self):
+        first, last = visible_range(0, ROW_HEIGHT * 5, 1000)
+        self.assertEqual(first, 0)
+        self.assertEqual(last, 6 + OVERSCAN)
+
+    def test_scrolled_window(self):
+        first, last = visible_range(ROW_HEIGHT * 100, ROW_HEIGHT * 5, 1000)
+        self.assertEqual(first, 100 - OVERSCAN)
+        self.assertEqual(last, 106 + OVERSCAN)
+
+    def test_clamped_to_count(self):
+        self.assertEqual(visible_range(0, ROW_HEIGHT * 50, 3), (0, 3))
+        self.assertEqual(visible_range(0, ROW_HEIGHT * 5, 0), (0, 0))
+
+@unittest.skipUnless(HAS_DISPLAY, "requires a display")
+class TestAchievementList(unittest.TestCase):
+    """Test cases for the canvas-drawn AchievementList"""
+
+    def setUp(self):
+        self.root = tk.Tk()
+        self.root.geometry("600x400")
+        self.placeholder = tk.PhotoImage(width=64, height=64)
+        self.requested = []
+        self.view = AchievementView.AchievementList(
+            self.root, self.placeholder, request_icon=lambda index, row: self.requested.append(index))
+        self.view.canvas.pack(side="left", fill="both", expand=True)
+        self.view.scrollbar.pack(side="right", fill="y")
+        self.root.update()
+
+    def tearDown(self):
+        self.root.destroy()
+
+    def make_rows(self, count):
+        return [{'text': f"Achievement {i}\nDescription\nStatus: Locked\nGlobal Unlock: 1.0%",
+                 'color': 'gray'} for i in range(count)]
+
+    def test_large_list_draws_visible_rows_only(self):
+        """5,000 achievements render quickly and create items only for the viewport"""
+        start = time.perf_counter()
+        self.view.set_rows(self.make_rows(5000))
+        self.root.update()
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.5)
+        self.assertLess(len(self.view.items), 30)
+        self.assertEqual(len(self.view.canvas.find_all()), 2 * len(self.view.items))
+        self.assertEqual(sorted(self.requested), sorted(self.view.items))
+
+    def test_long_text_is_clamped_to_the_row(self):
+        """A description wrapping past ROW_HEIGHT is shortened with an ellipsis instead of overlapping"""
+        long_row = {'text': "Achievement\n" + "A very long description. " * 40 + "\nStatus: Locked\nGlobal Unlock: 1.0%"}
+        self.view.set_rows([long_row, self.make_rows(1)[0]])
+        self.root.update()
+        text_item = self.view.items[0][1]
+        x1, y1, x2, y2 = self.view.canvas.bbox(text_item)
+        self.assertLessEqual(y2, ROW_HEIGHT)
+        text = self.view.canvas.itemcget(text_item, 'text')
+        self.assertIn(AchievementView.ELLIPSIS, text)
+        self.assertTrue(text.endswith("Status: Locked\nGlobal Unlock: 1.0%"))
+        short_item = self.view.items[1][1]
+        self.assertEqual(self.view.canvas.itemcget(short_item, 'text'), self.make_rows(1)[0]['text'])
+
+    def test_scrolling_moves_drawn_window(self):
+        """Scrolling creates rows for the new range and deletes rows that left it"""
+        self.view.set_rows(self.make_rows(1000))
+        self.root.update()
+        self.view.canvas.yview_moveto(0.5)
+        self.root.update()
+        self.assertNotIn(0, self.view.items)
+        self.assertIn(500, self.view.items)
+
+    def test_icons_update_in_place(self):
+        """Loaded icons replace the placeholder without recreating items"""
+        self.view.set_rows(self.make_rows(10))
+        self.root.update()
+        image_item, text_item = self.view.items[0]
+        icon = tk.PhotoImage(width=64, height=64)
+        self.view.icon_slot(0).config(image=icon)
+        self.assertEqual(self.view.items[0], (image_item, text_item))
+        self.assertEqual(self.view.canvas.itemcget(image_item, 'image'), str(icon))
+
+    def test_stale_icons_are_ignored(self):
+        """Icons for a previous game are dropped after the rows are replaced"""
+        self.view.set_rows(self.make_rows(10))
+        slot = self.view.icon_slot(0)
+        self.view.set_rows(self.make_rows(10))
+        slot.config(image=tk.PhotoImage(width=64, height=64))
+        self.assertNotIn(0, self.view.icons)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+import random
+import tempfile
+import shutil
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Analytics
+import Snapshot
+import Funcs
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+GAMES = [
+    {'appid': 440, 'name': 'Team Fortress 2', 'playtime_forever': 6000},
+    {'appid': 570, 'name': 'Dota 2', 'playtime_forever': 0},
+    {'appid': 620, 'name': 'Portal 2', 'playtime_forever': 90},
+]
+ACHIEVEMENTS = {
+    440: [{'apiname': 'TF_A', 'achieved': 1}, {'apiname': 'TF_B', 'achieved': 0},
+          {'apiname': 'TF_C', 'achieved': 1}, {'apiname': 'TF_D', 'achieved': 0}],
+    620: [{'apiname': 'P2_A', 'achieved': 1}, {'apiname': 'P2_B', 'achieved': 1}],
+}
+GLOBAL = {
+    440: [{'name': 'TF_A', 'percent': 50.0}, {'name': 'TF_B', 'percent': 0.5}, {'name': 'TF_C', 'percent': 2.5}],
+    620: [{'name': 'P2_A', 'percent': 80.0}, {'name': 'P2_B', 'percent': 1.0}],
+}
+
+@unittest.skipUnless(HAS_NUMPY, "requires numpy")
+class TestAnalytics(unittest.TestCase):
+    """Test cases for the library aggregates in Analytics.py"""
+
+    def setUp(self):
+        self.library = Analytics.build(GAMES, ACHIEVEMENTS, GLOBAL)
+
+    def test_overall_completion(self):
+        self.assertAlmostEqual(Analytics.overall_completion(self.library), 4 / 6)
+
+    def test_completion_per_game(self):
+        completion = Analytics.completion_per_game(self.library)
+        self.assertEqual(completion[0], 0.5)
+        self.assertTrue(np.isnan(completion[1]))
+        self.assertEqual(completion[2], 1.0)
+
+    def test_rarest_unlocked(self):
+        """Locked achievements and ones without a global percentage are excluded"""
+        rarest = Analytics.rarest_unlocked(self.library, k=2)
+        self.assertEqual([(appid, name) for appid, _, name, _ in rarest], [(620, 'P2_B'), (440, 'TF_C')])
+        self.assertEqual(len(Analytics.rarest_unlocked(self.library, k=10)), 4)
+
+    def test_playtime_distribution(self):
+        playtime = Analytics.playtime_distribution(self.library)
+        self.assertEqual(playtime['total_hours'], 101.5)
+        self.assertEqual(playtime['unplayed'], 1)
+        self.assertEqual(sum(playtime['counts']), 3)
+
+    def test_summarize_empty_library(self):
+        summary = Analytics.summarize(Analytics.build([], {}))
+        self.assertEqual(summary['games'], 0)
+        self.assertEqual(summary['overall_completion'], 0.0)
+        self.assertEqual(summary['rarest_unlocked'], [])
+
+    @patch('Funcs.get_global_achievements')
+    @patch('Funcs.fetch_player_achievements')
+    def test_load_user_prefers_snapshot(self, mock_player, mock_global):
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, True)
+        self.addCleanup(setattr, Snapshot, 'SNAPSHOT_DIR', None)
+        Snapshot.init(snapshot_dir)
+        Snapshot.save_library("1", GAMES)
+        Snapshot.save_achievements("1", 440, ACHIEVEMENTS[440], GLOBAL[440])
+        mock_player.side_effect = lambda steam_id, appid: ACHIEVEMENTS.get(appid, [])
+        mock_global.side_effect = lambda appid: GLOBAL.get(appid, [])
+
+        library = Analytics.load_user("1")
+
+        self.assertEqual(len(library), 3)
+        self.assertEqual(len(library.ach_unlocked), 6)
+        self.assertNotIn(440, [call[0][1] for call in mock_player.call_args_list])
+
+    @patch('Funcs.get_global_achievements')
+    @patch('Funcs.fetch_player_achievements')
+    @patch('Funcs.get_owned_games')
+    def test_load_user_refreshes_stale_snapshot(self, mock_owned, mock_player, mock_global):
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, True)
+        self.addCleanup(setattr, Snapshot, 'SNAPSHOT_DIR', None)
+        Snapshot.init(snapshot_dir)
+        Snapshot.save_library("1", GAMES[:1])
+        Snapshot.save_achievements("1", 440, ACHIEVEMENTS[440], GLOBAL[440])
+        mock_owned.return_value = GAMES
+        mock_player.side_effect = lambda steam_id, appid: ACHIEVEMENTS.get(appid, [])
+        mock_global.side_effect = lambda appid: GLOBAL.get(appid, [])
+
+        with patch.dict('Cache.REVALIDATE_INTERVALS', {'owned_games': -1, 'player_achievements': -1}):
+            library = Analytics.load_user("1")
+            self.assertEqual(len(library), 3)
+            self.assertIn(440, [call[0][1] for call in mock_player.call_args_list])
+
+            # Offline, the stale snapshot is still used
+            Funcs.OFFLINE = True
+            try:
+                self.assertEqual(len(Analytics.load_user("1")), 1)
+            finally:
+                Funcs.OFFLINE = False
+
+@unittest.skipUnless(HAS_NUMPY, "requires numpy")
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run benchmarks")
+class TestAnalyticsBenchmark(unittest.TestCase):
+    """Aggregates over 20k games and 500k achievements must take milliseconds"""
+
+    def test_large_library(self):
+        rng = random.Random(0)
+        games = [{'appid': i, 'name': f'Game {i}', 'playtime_forever': rng.randrange(0, 100000)} for i in range(20000)]
+        achievements, global_percentages = {}, {}
+        for appid in range(0, 20000, 2):  # Half the games have 50 achievements each
+            achievements[appid] = [{'apiname': f'A{j}', 'achieved': rng.random() < 0.4} for j in range(50)]
+            global_percentages[appid] = [{'name': f'A{j}', 'percent': rng.uniform(0.1, 99.9)} for j in range(50)]
+
+        start = time.perf_counter()
+        library = Analytics.build(games, achievements, global_percentages)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        summary = Analytics.summarize(library, k=25)
+        aggregate_time = time.perf_counter() - start
+
+        print(f"\n20k games / {summary['achievements']} achievements: "
+              f"build {build_time * 1000:.0f} ms, aggregates {aggregate_time * 1000:.1f} ms")
+        self.assertEqual(summary['achievements'], 500000)
+        self.assertEqual(len(summary['rarest_unlocked']), 25)
+        self.assertLess(aggregate_time, 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
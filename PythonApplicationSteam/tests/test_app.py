@@ -44,7 +44,8 @@ class TestSteamApp(unittest.TestCase):
     def tearDown(self):
         """Clean up after tests"""
         # Close tkinter root
-        self.root.destroy()
+        self.app.thumbnails.shutdown()
+        self.app.close()
         
         # Restore original cache directory
         PythonApplicationSteam.CACHE_DIR = self.original_cache_dir
@@ -60,8 +61,8 @@ class TestSteamApp(unittest.TestCase):
         self.assertIsNotNone(self.app.placeholder_img)
         self.assertEqual(len(self.app.game_buttons), 0)
         
-    @patch('PythonApplicationSteam.threading.Thread')
-    def test_start_search(self, mock_thread):
+    @patch('PythonApplicationSteam.Scheduler.NetworkScheduler.submit')
+    def test_start_search(self, mock_submit):
         """Test start_search method with valid SteamID"""
         # Set up test
         self.app.steam_id_entry.delete(0, tk.END)
@@ -71,7 +72,8 @@ class TestSteamApp(unittest.TestCase):
         self.app.start_search()
         
         # Verify behavior
-        mock_thread.assert_called_once()
+        mock_submit.assert_called_once_with(self.app.search_user, self.test_steam_id,
+                                            priority=PythonApplicationSteam.Scheduler.INTERACTIVE)
         self.assertEqual(self.app.loading_label.cget("text"), "Loading games...")
         self.assertEqual(self.app.search_button.cget("state"), "disabled")
         
@@ -89,6 +91,31 @@ class TestSteamApp(unittest.TestCase):
         # Verify state
         self.assertNotEqual(self.app.loading_label.cget("text"), "Loading games...")
         self.assertNotEqual(self.app.search_button.cget("state"), "disabled")
+
+    @patch('PythonApplicationSteam.Scheduler.NetworkScheduler.submit')
+    def test_start_search_profile_url(self, mock_submit):
+        """Test start_search resolves a custom profile URL on a worker"""
+        self.app.steam_id_entry.delete(0, tk.END)
+        self.app.steam_id_entry.insert(0, "https://steamcommunity.com/id/GabeLoganNewell/")
+
+        self.app.start_search()
+
+        mock_submit.assert_called_once_with(self.app.search_vanity, "gabelogannewell",
+                                            priority=PythonApplicationSteam.Scheduler.INTERACTIVE)
+        self.assertEqual(self.app.search_button.cget("state"), "disabled")
+
+    @patch('Funcs.get_owned_games', return_value=[])
+    @patch('Profiles.resolve_vanity')
+    def test_search_vanity(self, mock_resolve, mock_get_games):
+        """Test search_vanity loads the resolved user's games or reports an unknown name"""
+        mock_resolve.return_value = self.test_steam_id
+        self.app.search_vanity("gabelogannewell")
+        mock_get_games.assert_called_once_with(self.test_steam_id)
+        self.assertEqual(self.app.queue.get_nowait()['steam_id'], self.test_steam_id)
+
+        mock_resolve.return_value = None
+        self.app.search_vanity("nobody_here")
+        self.assertEqual(self.app.queue.get_nowait()['type'], 'error')
         
     @patch('Funcs.get_owned_games')
     def test_search_user_success(self, mock_get_games):
@@ -123,9 +150,7 @@ class TestSteamApp(unittest.TestCase):
         self.assertEqual(msg['type'], 'error')
         self.assertIn("profile is public", msg['message'])
         
-    @patch('PythonApplicationSteam.download_image')
-    @patch('threading.Thread')
-    def test_handle_search_result(self, mock_thread, mock_download):
+    def test_handle_search_result(self):
         """Test handle_search_result method"""
         # Prepare test data
         test_games = [
@@ -134,18 +159,48 @@ class TestSteamApp(unittest.TestCase):
         ]
         
         # Call method
-        self.app.handle_search_result(self.test_steam_id, test_games)
+        with patch.object(self.app.thumbnails, 'submit_game') as mock_submit:
+            self.app.handle_search_result(self.test_steam_id, test_games)
         
         # Verify behavior
         self.assertEqual(self.app.loading_label.cget("text"), "")
         self.assertEqual(self.app.search_button.cget("state"), "normal")
         self.assertEqual(len(self.app.game_buttons), 2)
         self.assertEqual(len(self.app.games), 2)
-        self.assertEqual(mock_thread.call_count, 2)  # One thread per game for image loading
+        self.assertEqual(mock_submit.call_count, 2)  # One thumbnail per game
+        mock_submit.assert_any_call(440, (184, 69), self.temp_cache_dir,
+                                    self.app.game_buttons[0], priority=PythonApplicationSteam.Scheduler.VISIBLE)
+
+    def test_check_image_queue_pixels(self):
+        """Test that raw pixel buffers from the thumbnail pipeline become PhotoImages"""
+        label = tk.Label(self.root)
+        pixels = ('RGB', (4, 2), bytes(4 * 2 * 3))
+        self.app.image_queue.put({'widget': label, 'pixels': pixels})
+
+        self.app.check_image_queue()
+
+        self.assertEqual(label.image.width(), 4)
+        self.assertEqual(label.image.height(), 2)
+
+    def test_check_image_queue_shares_identical_images(self):
+        """Test that identical images share one PhotoImage until their group is cleared"""
+        labels = [tk.Label(self.root) for _ in range(3)]
+        pixels = ('RGB', (4, 2), bytes(4 * 2 * 3))
+        for label in labels:
+            self.app.image_queue.put({'widget': label, 'pixels': pixels,
+                                      'key': ('hash', (4, 2)), 'group': 'icons'})
+
+        self.app.check_image_queue()
+
+        self.assertIs(labels[0].image, labels[2].image)
+        self.assertEqual(len(self.app.photos), 1)
+        self.app.clear_achievements()
+        self.assertEqual(len(self.app.photos), 0)
         
+    @patch('Funcs.get_game_schema')
     @patch('Funcs.get_player_achievements')
     @patch('Funcs.get_global_achievements')
-    def test_show_achievements(self, mock_global, mock_player):
+    def test_show_achievements(self, mock_global, mock_player, mock_schema):
         """Test show_achievements method"""
         # Prepare mock responses
         mock_player.return_value = [
@@ -167,6 +222,11 @@ class TestSteamApp(unittest.TestCase):
             {'name': 'ACH1', 'percent': 55.5},
             {'name': 'ACH2', 'percent': 22.2}
         ]
+        mock_schema.return_value = {'gameVersion': '1', 'availableGameStats': {'achievements': [
+            {'name': 'ACH1', 'displayName': 'First Blood', 'description': 'Schema description',
+             'icon': 'http://example.com/apps/440/abc123.jpg', 'icongray': 'http://example.com/apps/440/def456.jpg'}
+        ]}}
+        PythonApplicationSteam.Schema.reset()
         
         # Call method
         self.app.show_achievements(self.test_steam_id, self.test_appid, self.test_game_name)
@@ -179,6 +239,11 @@ class TestSteamApp(unittest.TestCase):
         self.assertEqual(msg['game_name'], self.test_game_name)
         self.assertEqual(len(msg['achievements']), 2)
         self.assertEqual(len(msg['global_achievements']), 2)
+        # Display fields come from the shared schema; unlock state from the player
+        self.assertEqual(msg['achievements'][0]['name'], 'First Blood')
+        self.assertEqual(msg['achievements'][0]['achieved'], 1)
+        self.assertEqual(msg['achievements'][1]['name'], 'Achievement 2')
+        PythonApplicationSteam.Schema.reset()
         
     def test_clear_games(self):
         """Test clear_games method"""
@@ -193,18 +258,114 @@ class TestSteamApp(unittest.TestCase):
         # Verify behavior
         self.assertEqual(len(self.app.game_buttons), 0)
         
-    def test_clear_achievements(self):
-        """Test clear_achievements method"""
-        # Create some dummy labels
-        label1 = tk.Label(self.app.achievement_frame)
-        label2 = tk.Label(self.app.achievement_frame)
-        self.app.achievement_labels = [label1, label2]
-        
-        # Call method
+    @patch('PythonApplicationSteam.Scheduler.NetworkScheduler.submit')
+    def test_restore_session(self, mock_submit_task):
+        """Test that the last session is rendered at startup and refreshed in the background"""
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, True)
+        self.addCleanup(setattr, PythonApplicationSteam.Snapshot, 'SNAPSHOT_DIR', None)
+        PythonApplicationSteam.Snapshot.init(snapshot_dir)
+        games = [{'appid': 440, 'name': 'Team Fortress 2'}, {'appid': 570, 'name': 'Dota 2'}]
+        PythonApplicationSteam.Snapshot.save_library(self.test_steam_id, games)
+
+        with patch('PythonApplicationSteam.Thumbnails.ThumbnailPipeline.submit_game') as mock_submit:
+            app = PythonApplicationSteam.SteamApp(tk.Toplevel(self.root))
+
+        self.assertEqual(app.games, games)
+        self.assertEqual(len(app.game_buttons), 2)
+        self.assertEqual(app.steam_id_entry.get(), self.test_steam_id)
+        self.assertEqual(mock_submit.call_count, 2)
+        # The refresh is queued as background work after the snapshot is drawn
+        mock_submit_task.assert_called_once_with(app.search_user, self.test_steam_id, True,
+                                                 priority=PythonApplicationSteam.Scheduler.BACKGROUND)
+
+    @patch('PythonApplicationSteam.Thumbnails.ThumbnailPipeline.submit_game')
+    def test_refresh_result_unchanged_keeps_buttons(self, mock_submit):
+        """Test that an unchanged background refresh does not rebuild the game list"""
+        games = [{'appid': 440, 'name': 'Team Fortress 2'}]
+        self.app.current_steam_id = self.test_steam_id
+        self.app.handle_search_result(self.test_steam_id, games)
+        buttons = list(self.app.game_buttons)
+
+        self.app.handle_refresh_result(self.test_steam_id, list(games))
+        self.assertEqual(self.app.game_buttons, buttons)
+
+        self.app.handle_refresh_result("76561198000000001", [{'appid': 570, 'name': 'Dota 2'}])
+        self.assertEqual(self.app.game_buttons, buttons)
+
+    @patch('Funcs.get_player_achievements')
+    def test_show_achievements_offline(self, mock_player):
+        """Test that offline mode serves achievements from the snapshot only"""
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, True)
+        self.addCleanup(setattr, PythonApplicationSteam.Snapshot, 'SNAPSHOT_DIR', None)
+        self.addCleanup(setattr, PythonApplicationSteam.Funcs, 'OFFLINE', False)
+        PythonApplicationSteam.Snapshot.init(snapshot_dir)
+        PythonApplicationSteam.Snapshot.save_achievements(
+            self.test_steam_id, self.test_appid, [{'apiname': 'ACH1', 'achieved': 1}], [])
+        PythonApplicationSteam.Funcs.OFFLINE = True
+
+        self.app.show_achievements(self.test_steam_id, self.test_appid, self.test_game_name)
+
+        msg = self.app.queue.get()
+        self.assertEqual(msg['achievements'], [{'apiname': 'ACH1', 'achieved': 1}])
+        mock_player.assert_not_called()
+
+def count_widgets(widget):
+    """Count a widget and all of its descendants."""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+def current_rss():
+    """Return the resident set size in bytes, or None where /proc is unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class TestAchievementPanelSoak(unittest.TestCase):
+    """Soak test: repeated achievement clicks must not leak widgets or memory"""
+
+    CLICKS = 1000
+    WARMUP_CLICKS = 100
+    RSS_GROWTH_LIMIT = 8 * 1024 * 1024
+
+    def setUp(self):
+        self.root = tk.Tk()
+        self.app = PythonApplicationSteam.SteamApp(self.root)
+        self.achievements = [
+            {'apiname': f'ACH{i}', 'achieved': i % 2, 'name': f'Achievement {i}',
+             'description': 'Description', 'icon': 'http://example.com/icon.jpg',
+             'icongray': 'http://example.com/icon_gray.jpg'}
+            for i in range(40)
+        ]
+        self.global_achievements = [{'name': f'ACH{i}', 'percent': 1.5} for i in range(40)]
+
+    def tearDown(self):
+        self.app.close()
+
+    def click(self, index):
         self.app.clear_achievements()
-        
-        # Verify behavior
-        self.assertEqual(len(self.app.achievement_labels), 0)
+        achievements = self.achievements if index % 10 else []  # Mix in games without achievements
+        self.app.handle_achievements_result("76561198000000000", index, f"Game {index}",
+                                            achievements, self.global_achievements)
+        self.root.update()
+
+    @patch('PythonApplicationSteam.Scheduler.NetworkScheduler.submit')
+    def test_click_through_games(self, mock_submit):
+        """Widget count and RSS stay flat across 1,000 game clicks"""
+        for index in range(self.WARMUP_CLICKS):
+            self.click(index)
+        widgets_before = count_widgets(self.root)
+        rss_before = current_rss()
+
+        for index in range(self.WARMUP_CLICKS, self.CLICKS):
+            self.click(index)
+
+        self.assertEqual(count_widgets(self.root), widgets_before)
+        self.assertEqual(len(self.app.achievement_frame.pack_slaves()), 3)
+        if rss_before is not None:
+            self.assertLess(current_rss() - rss_before, self.RSS_GROWTH_LIMIT)
 
 @patch('PIL.Image.open')
 @patch('requests.get')
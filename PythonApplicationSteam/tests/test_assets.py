@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import time
+import tempfile
+import shutil
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Assets
+import Thumbnails
+import Breaker
+import Http
+
+def make_response(status_code=200, content=b''):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    return response
+
+class TestVariantChain(unittest.TestCase):
+    """Test cases for choosing CDN variants in Assets.py"""
+
+    def test_smallest_covering_variant_first(self):
+        self.assertEqual(Assets.variant_chain((184, 69))[0], 'capsule_184x69.jpg')
+        self.assertEqual(Assets.variant_chain((200, 80))[0], 'capsule_231x87.jpg')
+        self.assertEqual(Assets.variant_chain((460, 215))[0], 'header.jpg')
+
+    def test_header_always_in_chain(self):
+        for size in ((16, 16), (184, 69), (600, 300), (2000, 2000)):
+            self.assertIn(Assets.FALLBACK_VARIANT, Assets.variant_chain(size))
+
+    def test_header_keeps_legacy_cache_name(self):
+        self.assertEqual(Assets.variant_cache_path('cache', 440, 'header.jpg'), os.path.join('cache', '440.jpg'))
+        self.assertEqual(Assets.variant_cache_path('cache', 440, 'capsule_184x69.jpg'),
+                         os.path.join('cache', '440_capsule_184x69.jpg'))
+
+class TestNegativeCache(unittest.TestCase):
+    """Test cases for remembering missing variants"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, Assets.NEGATIVE_CACHE_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_persisted_across_instances(self):
+        Assets.NegativeCache(self.path).add('440/capsule_184x69.jpg')
+        cache = Assets.NegativeCache(self.path)
+        self.assertIn('440/capsule_184x69.jpg', cache)
+        self.assertNotIn('570/capsule_184x69.jpg', cache)
+
+    def test_entries_expire(self):
+        cache = Assets.NegativeCache(self.path, ttl=60)
+        cache.missing['440/header.jpg'] = time.time() - 120
+        self.assertNotIn('440/header.jpg', cache)
+
+class TestFetchGameImage(unittest.TestCase):
+    """Test cases for Thumbnails.fetch_game_image and its fallback chain"""
+
+    def setUp(self):
+        Http.reset()
+        Breaker.reset()
+        self.temp_dir = tempfile.mkdtemp()
+        Assets.init(self.temp_dir)
+
+    def tearDown(self):
+        Assets._negative = Assets.NegativeCache()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch('requests.get')
+    def test_downloads_right_sized_variant(self, mock_get):
+        mock_get.return_value = make_response(200, b'capsule')
+        self.assertEqual(Thumbnails.fetch_game_image(440, (184, 69), self.temp_dir), b'capsule')
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args[0][0].endswith('/440/capsule_184x69.jpg'))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, '440_capsule_184x69.jpg')))
+
+    @patch('requests.get')
+    def test_falls_back_on_404_and_remembers(self, mock_get):
+        """Missing variants are skipped without a request on the next lookup"""
+        def respond(url, **kwargs):
+            return make_response(200, b'header') if url.endswith('header.jpg') else make_response(404)
+        mock_get.side_effect = respond
+
+        self.assertEqual(Thumbnails.fetch_game_image(10, (184, 69), self.temp_dir), b'header')
+        tried = [call[0][0].rsplit('/', 1)[1] for call in mock_get.call_args_list]
+        self.assertEqual(tried[-1], 'header.jpg')
+
+        os.remove(os.path.join(self.temp_dir, '10.jpg'))
+        mock_get.reset_mock()
+        Assets.init(self.temp_dir)  # A new run reads the 404s back from disk
+        self.assertEqual(Thumbnails.fetch_game_image(10, (184, 69), self.temp_dir), b'header')
+        self.assertEqual([call[0][0].rsplit('/', 1)[1] for call in mock_get.call_args_list], ['header.jpg'])
+
+    @patch('requests.get')
+    def test_server_error_does_not_fall_back(self, mock_get):
+        mock_get.return_value = make_response(503)
+        self.assertIsNone(Thumbnails.fetch_game_image(440, (184, 69), self.temp_dir))
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(Assets.candidates(440, (184, 69), self.temp_dir)[0][0], 'capsule_184x69.jpg')
+
+    @patch('requests.get')
+    def test_uses_cached_legacy_header(self, mock_get):
+        with open(os.path.join(self.temp_dir, '440.jpg'), 'wb') as f:
+            f.write(b'old_header')
+        os.utime(os.path.join(self.temp_dir, '440.jpg'))
+        self.assertEqual(Thumbnails.fetch_game_image(440, (184, 69), self.temp_dir), b'old_header')
+        mock_get.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
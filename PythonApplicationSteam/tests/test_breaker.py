@@ -0,0 +1,205 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import time
+import tempfile
+import shutil
+import threading
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Breaker
+import Http
+import Funcs
+import Cache
+import PythonApplicationSteam
+
+API_URL = "http://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
+IMAGE_URL = "https://cdn.example.com/steam/apps/440/header.jpg"
+
+def make_response(status_code=200, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.headers = {}
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+    return response
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for the CircuitBreaker state machine"""
+
+    def setUp(self):
+        self.changes = []
+        Breaker.add_listener(self.record_change)
+
+    def tearDown(self):
+        Breaker.remove_listener(self.record_change)
+        Breaker.reset()
+
+    def record_change(self, name, state):
+        self.changes.append((name, state))
+
+    def wait_for(self, breaker, state, timeout=2):
+        deadline = time.monotonic() + timeout
+        while self.changes[-1:] != [(breaker.name, state)] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return breaker.state
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = Breaker.CircuitBreaker('api', failure_threshold=3, cooldown=60)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        self.assertEqual(self.changes, [('api', Breaker.OPEN)])
+
+    def test_successful_probe_closes(self):
+        """After the cooldown the probe runs in the background and closes the breaker"""
+        breaker = Breaker.CircuitBreaker('api', failure_threshold=1, cooldown=0.05)
+        probed = threading.Event()
+
+        def probe():
+            probed.set()
+            breaker.record_success()
+
+        breaker.record_failure(probe)
+        self.assertTrue(probed.wait(2))
+        self.assertEqual(self.wait_for(breaker, Breaker.CLOSED), Breaker.CLOSED)
+        self.assertEqual([s for _, s in self.changes], [Breaker.OPEN, Breaker.HALF_OPEN, Breaker.CLOSED])
+
+    def test_failed_probe_reopens_with_backoff(self):
+        breaker = Breaker.CircuitBreaker('api', failure_threshold=1, cooldown=0.05, max_cooldown=0.08)
+        recovered = threading.Event()
+        breaker.record_failure(lambda: breaker.record_success() if recovered.is_set() else breaker.record_failure())
+        deadline = time.monotonic() + 2
+        while self.changes.count(('api', Breaker.OPEN)) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertGreaterEqual(self.changes.count(('api', Breaker.OPEN)), 3)
+        self.assertEqual(breaker.cooldown, 0.08)
+        self.assertFalse(breaker.allow())
+        recovered.set()
+        self.assertEqual(self.wait_for(breaker, Breaker.CLOSED), Breaker.CLOSED)
+
+class TestHttpBreaker(unittest.TestCase):
+    """Test cases for circuit breaking in Http.get"""
+
+    def setUp(self):
+        Http.reset()
+        Breaker.reset()
+
+    def tearDown(self):
+        Http.reset()
+        Breaker.reset()
+
+    @patch('requests.get')
+    def test_fails_fast_while_open(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("refused")
+        for _ in range(Breaker.FAILURE_THRESHOLD):
+            with self.assertRaises(requests.ConnectionError):
+                Http.get(API_URL, endpoint=API_URL)
+        with self.assertRaises(Breaker.CircuitOpenError):
+            Http.get(API_URL, endpoint=API_URL)
+        self.assertEqual(mock_get.call_count, Breaker.FAILURE_THRESHOLD)
+        self.assertEqual(Breaker.states(), {API_URL: Breaker.OPEN, 'api.steampowered.com': Breaker.OPEN})
+
+    @patch('requests.get')
+    def test_client_errors_do_not_open(self, mock_get):
+        """A 403 for a private profile means the endpoint is up"""
+        mock_get.return_value = make_response(403)
+        for _ in range(Breaker.FAILURE_THRESHOLD + 1):
+            Http.get(API_URL, endpoint=API_URL)
+        self.assertEqual(Breaker.states(), {})
+
+    @patch('requests.get')
+    def test_server_errors_open(self, mock_get):
+        mock_get.return_value = make_response(503)
+        for _ in range(Breaker.FAILURE_THRESHOLD):
+            Http.get(IMAGE_URL)
+        self.assertEqual(Breaker.states(), {'cdn.example.com': Breaker.OPEN})
+
+    @patch('requests.get')
+    def test_host_breaker_covers_other_endpoints(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("refused")
+        for _ in range(Breaker.FAILURE_THRESHOLD):
+            with self.assertRaises(requests.ConnectionError):
+                Http.get(API_URL, endpoint=API_URL)
+        other = "http://api.steampowered.com/ISteamUserStats/GetPlayerAchievements/v1/"
+        with self.assertRaises(Breaker.CircuitOpenError):
+            Http.get(other, endpoint=other)
+
+    @patch('requests.get')
+    def test_probe_retries_failed_request(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("refused")
+        for _ in range(Breaker.FAILURE_THRESHOLD):
+            with self.assertRaises(requests.ConnectionError):
+                Http.get(IMAGE_URL)
+        breaker = Breaker.get_breaker('cdn.example.com')
+        mock_get.side_effect = None
+        mock_get.return_value = make_response(200)
+
+        breaker.probe()
+
+        self.assertEqual(Breaker.states(), {})
+        self.assertEqual(mock_get.call_args[0][0], IMAGE_URL)
+
+class TestBreakerFallbacks(unittest.TestCase):
+    """Open breakers fall back to cached data and placeholders"""
+
+    def setUp(self):
+        Http.reset()
+        Breaker.reset()
+        self.temp_dir = tempfile.mkdtemp()
+        Funcs.init('test_api_key', response_store=Cache.ResponseStore(self.temp_dir))
+
+    def tearDown(self):
+        Funcs.RESPONSE_STORE = None
+        Http.reset()
+        Breaker.reset()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def open_breaker(self, name):
+        breaker = Breaker.get_breaker(name)
+        breaker.state = Breaker.OPEN
+
+    @patch('requests.get')
+    def test_funcs_uses_stored_payload(self, mock_get):
+        params = {'key': 'test_api_key', 'steamid': '1', 'include_appinfo': True, 'include_played_free_games': True}
+        games = [{'appid': 440, 'name': 'Team Fortress 2'}]
+        Funcs.RESPONSE_STORE.put(API_URL, params, {'response': {'games': games}}, {})
+        past = time.time() - 3600
+        os.utime(Funcs.RESPONSE_STORE._path(API_URL, params), (past, past))
+        self.open_breaker('api.steampowered.com')
+
+        self.assertEqual(Funcs.get_owned_games('1'), games)
+        mock_get.assert_not_called()
+
+    @patch('requests.get')
+    def test_funcs_without_cache_returns_empty(self, mock_get):
+        self.open_breaker('api.steampowered.com')
+        self.assertIsNone(Funcs.get_owned_games('1'))
+        self.assertEqual(Funcs.get_player_achievements('1', 440), [])
+        mock_get.assert_not_called()
+
+    @patch('requests.get')
+    def test_download_image_returns_none(self, mock_get):
+        """download_image returns None, so the caller shows the placeholder"""
+        self.open_breaker('cdn.example.com')
+        cache_path = os.path.join(self.temp_dir, "440.jpg")
+        self.assertIsNone(PythonApplicationSteam.download_image(IMAGE_URL, cache_path))
+        mock_get.assert_not_called()
+
+    def test_circuit_label(self):
+        self.assertEqual(PythonApplicationSteam.circuit_label(API_URL), 'GetOwnedGames')
+        self.assertEqual(PythonApplicationSteam.circuit_label('cdn.example.com'), 'cdn.example.com')
+
+if __name__ == '__main__':
+    unittest.main()
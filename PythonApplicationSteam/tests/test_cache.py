@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import time
+import tempfile
+import shutil
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Cache
+import Http
+import Breaker
+
+def make_response(status_code=200, content=b'', headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+class TestValidators(unittest.TestCase):
+    """Test cases for validator helpers in Cache.py"""
+
+    def test_conditional_headers(self):
+        headers = Cache.conditional_headers({'etag': '"abc"', 'last_modified': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+        self.assertEqual(headers, {'If-None-Match': '"abc"',
+                                   'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT'})
+        self.assertEqual(Cache.conditional_headers(None), {})
+
+    def test_validators_ignore_missing_headers(self):
+        self.assertEqual(Cache.validators_from({'ETag': '"abc"'}), {'etag': '"abc"', 'last_modified': None})
+
+    def test_is_fresh_per_asset_type(self):
+        now = time.time()
+        self.assertTrue(Cache.is_fresh(now - 3600, 'header', now))
+        self.assertFalse(Cache.is_fresh(now - 3600, 'player_achievements', now))
+
+class TestImageRevalidation(unittest.TestCase):
+    """Test cases for conditional revalidation of cached images"""
+
+    def setUp(self):
+        Http.reset()
+        Breaker.reset()
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, "440.jpg")
+        self.url = "https://example.com/440/header.jpg"
+        with open(self.cache_path, 'wb') as f:
+            f.write(b'old_image')
+        Cache.write_image_validators(self.cache_path, {'ETag': '"v1"'})
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def age(self, seconds):
+        past = time.time() - seconds
+        os.utime(self.cache_path + '.meta', (past, past))
+
+    @patch('requests.get')
+    def test_not_modified_keeps_image(self, mock_get):
+        """A 304 keeps the cached bytes and marks the entry as checked"""
+        mock_get.return_value = make_response(304)
+        self.age(30 * 24 * 3600)
+
+        self.assertFalse(Cache.revalidate_image(self.url, self.cache_path))
+
+        mock_get.assert_called_once_with(self.url, params=None, headers={'If-None-Match': '"v1"'}, timeout=5)
+        with open(self.cache_path, 'rb') as f:
+            self.assertEqual(f.read(), b'old_image')
+        self.assertTrue(Cache.is_fresh(Cache.image_checked_at(self.cache_path), 'header'))
+
+    @patch('requests.get')
+    def test_modified_replaces_image(self, mock_get):
+        """A 200 replaces the cached bytes and stores the new validators"""
+        mock_get.return_value = make_response(200, b'new_image', {'ETag': '"v2"'})
+
+        self.assertTrue(Cache.revalidate_image(self.url, self.cache_path))
+
+        with open(self.cache_path, 'rb') as f:
+            self.assertEqual(f.read(), b'new_image')
+        self.assertEqual(Cache.read_image_validators(self.cache_path)['etag'], '"v2"')
+
+    @patch('requests.get')
+    def test_network_error_keeps_image(self, mock_get):
+        mock_get.side_effect = requests.RequestException("Network error")
+        self.assertFalse(Cache.revalidate_image(self.url, self.cache_path))
+        with open(self.cache_path, 'rb') as f:
+            self.assertEqual(f.read(), b'old_image')
+
+    @patch('Cache.revalidate_image')
+    def test_schedule_only_when_stale(self, mock_revalidate):
+        """Background revalidation only runs once the interval has elapsed"""
+        self.assertIsNone(Cache.schedule_image_revalidation(self.url, self.cache_path, 'header'))
+
+        self.age(8 * 24 * 3600)
+        future = Cache.schedule_image_revalidation(self.url, self.cache_path, 'header')
+        future.result(timeout=5)
+        mock_revalidate.assert_called_once_with(self.url, self.cache_path)
+
+class TestResponseStore(unittest.TestCase):
+    """Test cases for the ResponseStore"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = Cache.ResponseStore(self.temp_dir)
+        self.url = "http://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        self.store.put(self.url, {'steamid': 1}, {'response': {'games': []}}, {'ETag': '"abc"'})
+        entry = self.store.get(self.url, {'steamid': 1})
+        self.assertEqual(entry['payload'], {'response': {'games': []}})
+        self.assertEqual(entry['etag'], '"abc"')
+        self.assertIsNone(self.store.get(self.url, {'steamid': 2}))
+
+    def test_api_key_not_part_of_key_or_file(self):
+        """Entries are shared across API keys and never contain the key"""
+        self.store.put(self.url, {'key': 'secret', 'steamid': 1}, {'ok': True}, {})
+        self.assertIsNotNone(self.store.get(self.url, {'key': 'other', 'steamid': 1}))
+        for name in os.listdir(self.temp_dir):
+            with open(os.path.join(self.temp_dir, name), 'rb') as f:
+                self.assertNotIn(b'secret', f.read())
+
+if __name__ == '__main__':
+    unittest.main()
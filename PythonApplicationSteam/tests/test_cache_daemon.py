@@ -0,0 +1,166 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import time
+import socket
+import tempfile
+import shutil
+import threading
+import multiprocessing
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import CacheDaemon
+import Thumbnails
+import Funcs
+import Cache
+import Breaker
+import Http
+
+IMAGE_URL = "https://steamcdn-a.akamaihd.net/steam/apps/440/header.jpg"
+
+def slow_response(*args, **kwargs):
+    time.sleep(0.1)
+    response = MagicMock(status_code=200, content=b'image_data', headers={})
+    response.json.return_value = {'achievementpercentages': {'achievements': [{'name': 'ACH1', 'percent': 5.0}]}}
+    return response
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "the cache daemon needs Unix sockets")
+class TestCacheDaemon(unittest.TestCase):
+    """Test cases for sharing caches between processes through CacheDaemon.py"""
+
+    def setUp(self):
+        Http.reset()
+        Breaker.reset()
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, "440.jpg")
+        self.socket_path = os.path.join(self.temp_dir, "cache.sock")
+        patcher = patch.object(CacheDaemon, 'SOCKET_PATH', self.socket_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        CacheDaemon._down_until = 0.0
+        self.server = CacheDaemon.CacheServer(self.socket_path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        while self.server.server is None or not os.path.exists(self.socket_path):
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.stop_server()
+        conn = getattr(CacheDaemon._local, 'conn', None)
+        if conn:
+            conn[1].close()
+            CacheDaemon._local.conn = None
+        CacheDaemon._down_until = 0.0
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def stop_server(self):
+        self.server.shutdown()
+        self.thread.join(timeout=5)
+
+    def fetch_concurrently(self, fn, count=8):
+        results = [None] * count
+        def run(i):
+            results[i] = fn()
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    @patch('requests.get', side_effect=slow_response)
+    def test_concurrent_fetches_are_deduplicated(self, mock_get):
+        results = self.fetch_concurrently(lambda: Thumbnails.fetch_image_bytes(IMAGE_URL, self.cache_path))
+        self.assertEqual(results, [b'image_data'] * 8)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.get', side_effect=slow_response)
+    def test_hits_are_served_from_shared_memory(self, mock_get):
+        Thumbnails.fetch_image_bytes(IMAGE_URL, self.cache_path)
+        self.assertIn(self.cache_path, self.server.segments)
+        with patch('CacheDaemon._read_shared', wraps=CacheDaemon._read_shared) as mock_read:
+            self.assertEqual(Thumbnails.fetch_image_bytes(IMAGE_URL, self.cache_path), b'image_data')
+        mock_read.assert_called_once()
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.get', side_effect=slow_response)
+    def test_api_requests_go_through_daemon(self, mock_get):
+        self.addCleanup(setattr, Funcs, 'RESPONSE_STORE', None)
+        Funcs.RESPONSE_STORE = Cache.ResponseStore(os.path.join(self.temp_dir, 'api_cache'))
+        results = self.fetch_concurrently(lambda: Funcs.get_global_achievements(440))
+        self.assertEqual(results, [[{'name': 'ACH1', 'percent': 5.0}]] * 8)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.get', side_effect=slow_response)
+    def test_falls_back_when_daemon_stops(self, mock_get):
+        self.stop_server()
+        self.assertEqual(Thumbnails.fetch_image_bytes(IMAGE_URL, self.cache_path), b'image_data')
+        self.assertFalse(CacheDaemon.enabled())
+
+    @patch('requests.get', side_effect=slow_response)
+    def test_processes_share_one_download(self, mock_get):
+        """Worker processes found through STEAM_CACHE_SOCKET share the daemon's download"""
+        with patch.dict(os.environ, {'STEAM_CACHE_SOCKET': self.socket_path}):
+            with multiprocessing.get_context('spawn').Pool(3) as pool:
+                results = pool.starmap(Thumbnails.fetch_image_bytes, [(IMAGE_URL, self.cache_path)] * 6)
+        self.assertEqual(results, [b'image_data'] * 6)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), "needs POSIX open-file limits")
+    def test_sharing_stays_within_the_open_files_limit(self):
+        """More images than the descriptor limit allows are still shared, oldest evicted first"""
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (256, hard))
+        self.addCleanup(resource.setrlimit, resource.RLIMIT_NOFILE, (soft, hard))
+        server = CacheDaemon.CacheServer(os.path.join(self.temp_dir, "other.sock"))
+        self.addCleanup(server.trim, 1.0)
+        self.assertLessEqual(server.max_segments, 256 * CacheDaemon.SEGMENT_FD_FRACTION)
+        for i in range(600):
+            path = os.path.join(self.temp_dir, f"{i}.jpg")
+            with open(path, 'wb') as f:
+                f.write(b'image_%d' % i)
+            reply = server._share(path, b'image_%d' % i)
+            self.assertIn('shm', reply)
+        self.assertEqual(len(server.segments), server.max_segments)
+        self.assertEqual(CacheDaemon._read_shared(reply['shm'], reply['size']), b'image_599')
+
+    def test_socket_is_private(self):
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+        self.assertTrue(CacheDaemon.enabled())
+
+    def test_socket_of_another_user_is_ignored(self):
+        with patch('os.getuid', return_value=os.getuid() + 1):
+            self.assertFalse(CacheDaemon.enabled())
+            with self.assertRaises(CacheDaemon.Unavailable):
+                CacheDaemon.get_json("http://api.steampowered.com/x", {}, 'game_schema')
+
+    def test_non_socket_path_is_ignored(self):
+        path = os.path.join(self.temp_dir, "planted.sock")
+        os.symlink(self.socket_path, path)
+        with patch.object(CacheDaemon, 'SOCKET_PATH', path):
+            self.assertFalse(CacheDaemon.enabled())
+
+    def test_server_refuses_shared_directory(self):
+        shared = os.path.join(self.temp_dir, "shared")
+        os.mkdir(shared)
+        os.chmod(shared, 0o777)
+        with self.assertRaises(PermissionError):
+            CacheDaemon.CacheServer(os.path.join(shared, "cache.sock"))._prepare_socket_dir()
+
+    def test_default_socket_is_in_a_private_directory(self):
+        runtime = os.path.join(self.temp_dir, "runtime")
+        os.mkdir(runtime, 0o700)
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': runtime}):
+            self.assertEqual(CacheDaemon._default_socket_path(), os.path.join(runtime, "steam-cache.sock"))
+        with patch.dict(os.environ, {'XDG_RUNTIME_DIR': ''}):
+            path = CacheDaemon._default_socket_path()
+        self.assertNotEqual(os.path.dirname(path), tempfile.gettempdir())
+        self.assertEqual(os.path.dirname(os.path.dirname(path)), tempfile.gettempdir())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+import shutil
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Codec
+import Cache
+
+def make_games(count, seed=1):
+    rng = random.Random(seed)
+    games = []
+    for i in range(count):
+        game = {'appid': 10 + i * 10, 'name': f"Game {i} — édition", 'playtime_forever': rng.randint(0, 100000),
+                'img_icon_url': '%040x' % rng.getrandbits(160), 'has_community_visible_stats': True,
+                'playtime_windows_forever': rng.randint(0, 1000), 'rtime_last_played': 1600000000 + i}
+        if i % 3 == 0:
+            game['playtime_2weeks'] = 5
+        if i % 7 == 0:
+            game['content_descriptorids'] = [2, 5]
+        if i % 2:
+            del game['has_community_visible_stats']
+        games.append(game)
+    return games
+
+class TestCodec(unittest.TestCase):
+    """Test cases for the binary payload codec in Codec.py"""
+
+    def assertRoundTrip(self, value):
+        expected = json.loads(json.dumps(value))
+        for compress in (False, True):
+            decoded = Codec.loads(Codec.dumps(value, compress=compress))
+            self.assertEqual(decoded, expected)
+            self.assertEqual(json.dumps(decoded, sort_keys=True), json.dumps(expected, sort_keys=True))  # Same types, e.g. 1 vs 1.0
+
+    def test_owned_games_round_trip(self):
+        self.assertRoundTrip({'response': {'game_count': 50, 'games': make_games(50)}})
+
+    def test_achievements_round_trip(self):
+        achievements = [{'apiname': f"ACH_{i}", 'achieved': i % 2, 'unlocktime': 1600000000 + i if i % 2 else 0,
+                         'name': f"Achievement {i}", 'description': '' if i % 5 else None} for i in range(20)]
+        self.assertRoundTrip({'playerstats': {'success': True, 'gameName': 'Portal', 'achievements': achievements}})
+        self.assertRoundTrip({'achievementpercentages': {'achievements': [{'name': 'A', 'percent': 5.0},
+            {'name': 'B', 'percent': 12}, {'name': 'C', 'percent': 0.1}, {'name': 'D', 'percent': 7.5}]}})
+
+    def test_awkward_values_round_trip(self):
+        rows = [{'s': 'a\x00b', 'flag': True, 'n': 1}, {'s': '漢字', 'flag': 1, 'n': 2 ** 70},
+                {'s': '', 'flag': False, 'n': -5}, {'s': 'x', 'flag': None, 'n': 1.5, 'extra': {'k': [1, 'two']}}]
+        self.assertRoundTrip(rows)
+        self.assertRoundTrip([None, True, 0, -2 ** 63, 2 ** 63, 3.25, '', [], {}, [[1, 2], [3]], {'1': 'x'}])
+        self.assertRoundTrip([{} for _ in range(5)])
+
+    def test_rejects_other_versions_and_corrupt_data(self):
+        data = Codec.dumps({'a': 1}, compress=False)
+        with self.assertRaises(Codec.FormatError):
+            Codec.loads(data[:3] + bytes((Codec.VERSION + 1,)) + data[4:])
+        with self.assertRaises(Codec.FormatError):
+            Codec.loads(data[:-3])
+        with self.assertRaises(Codec.FormatError):
+            Codec.loads(b'{"a": 1}')
+
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run benchmarks")
+    def test_benchmark_parse_against_json(self):
+        entry = {'etag': '"abc"', 'last_modified': None,
+                 'payload': {'response': {'game_count': 10000, 'games': make_games(10000)}}}
+        text = json.dumps(entry, separators=(',', ':')).encode('utf-8')
+        shipped = Codec.dumps(entry, compress=Cache.COMPRESS_RESPONSES)
+        compressed = Codec.dumps(entry, compress=True)
+        parsers = {'json': lambda: json.loads(text), 'codec': lambda: Codec.loads(shipped),
+                   'codec+zlib': lambda: Codec.loads(compressed)}
+        best = dict.fromkeys(parsers, float('inf'))
+        for _ in range(20):
+            for name, parse in parsers.items():
+                start = time.perf_counter()
+                parse()
+                best[name] = min(best[name], (time.perf_counter() - start) * 1000)
+        print(f"\njson: {len(text)} bytes, {best['json']:.1f} ms")
+        print(f"codec (shipped): {len(shipped)} bytes, {best['codec']:.1f} ms")
+        print(f"codec (zlib): {len(compressed)} bytes, {best['codec+zlib']:.1f} ms")
+        self.assertLess(len(shipped), len(text))
+        self.assertLess(best['codec'], 0.8 * best['json'])
+
+class TestResponseStoreFormat(unittest.TestCase):
+    """Test cases for ResponseStore files written with the codec"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = Cache.ResponseStore(self.temp_dir)
+        self.url = "http://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
+        self.payload = {'response': {'games': make_games(10)}}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reads_and_replaces_json_entries(self):
+        legacy = self.store._json_path(self.url, {'steamid': 1})
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({'etag': '"old"', 'payload': self.payload}, f)
+        self.assertEqual(self.store.get(self.url, {'steamid': 1})['etag'], '"old"')
+
+        self.store.put(self.url, {'steamid': 1}, self.payload, {'ETag': '"new"'})
+        self.assertFalse(os.path.exists(legacy))
+        entry = self.store.get(self.url, {'steamid': 1})
+        self.assertEqual((entry['etag'], entry['payload']), ('"new"', self.payload))
+
+    def test_other_version_is_a_miss(self):
+        self.store.put(self.url, {'steamid': 1}, self.payload, {})
+        path = self.store._path(self.url, {'steamid': 1})
+        with open(path, 'r+b') as f:
+            f.seek(3)
+            f.write(bytes((Codec.VERSION + 1,)))
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(self.store.get(self.url, {'steamid': 1}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+import random
+import tempfile
+import shutil
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Friends
+import Snapshot
+import Scheduler
+import Breaker
+
+LIBRARIES = {
+    "1": [{'appid': 440, 'name': 'Team Fortress 2', 'playtime_forever': 100},
+          {'appid': 570, 'name': 'Dota 2', 'playtime_forever': 5},
+          {'appid': 620, 'name': 'Portal 2', 'playtime_forever': 0}],
+    "2": [{'appid': 440, 'playtime_forever': 900}, {'appid': 570, 'playtime_forever': 50}],
+    "3": [{'appid': 440, 'playtime_forever': 10}, {'appid': 730, 'playtime_forever': 70}],
+    "4": None,
+}
+ACHIEVEMENTS = {
+    ("1", 440): [{'apiname': 'A', 'achieved': 1}, {'apiname': 'B', 'achieved': 0}],
+    ("2", 440): [{'apiname': 'A', 'achieved': 1}, {'apiname': 'B', 'achieved': 1}],
+    ("3", 440): [{'apiname': 'A', 'achieved': 0}, {'apiname': 'B', 'achieved': 0}],
+}
+
+class TestFriendIndex(unittest.TestCase):
+    """Test cases for the friends library overlap index in Friends.py"""
+
+    def setUp(self):
+        self.index = Friends.FriendIndex(LIBRARIES)
+        self.scheduler = Scheduler.NetworkScheduler(workers=4, reserved_workers=1)
+        self.addCleanup(self.scheduler.shutdown)
+
+    def test_index(self):
+        self.assertEqual(self.index.members, ["1", "2", "3"])
+        self.assertEqual(self.index.unavailable, ["4"])
+        self.assertEqual(self.index.owner_ids(440), ["1", "2", "3"])
+        self.assertEqual(self.index.owner_ids(999), [])
+        self.assertEqual(self.index.names[440], 'Team Fortress 2')
+
+    def test_intersections(self):
+        self.assertEqual(self.index.shared(["1", "2"]), [440, 570])
+        self.assertEqual(self.index.shared(["2", "3"]), [440])
+        self.assertEqual(self.index.shared(["unknown"]), [])
+        self.assertEqual(self.index.shared_with_friends(), [(440, 2), (570, 1)])
+        self.assertEqual(self.index.shared_with_friends(min_friends=2), [(440, 2)])
+        self.assertEqual(self.index.overlap(), [("2", 2), ("3", 1)])
+
+    def test_playtime_leaderboard(self):
+        self.assertEqual(self.index.playtime_leaderboard(440), [("2", 900), ("1", 100), ("3", 10)])
+
+    @patch('Funcs.fetch_player_achievements')
+    def test_achievement_leaderboard_loads_once(self, mock_player):
+        mock_player.side_effect = lambda steam_id, appid: ACHIEVEMENTS.get((steam_id, appid), [])
+        expected = [("2", 2, 2), ("1", 1, 2), ("3", 0, 2)]
+        self.assertEqual(self.index.achievement_leaderboard(440, self.scheduler), expected)
+        self.assertEqual(self.index.achievement_leaderboard(440, self.scheduler), expected)
+        self.assertEqual(mock_player.call_count, 3)
+
+    @patch('Funcs.get_player_summaries', return_value={"1": {'steamid': "1", 'personaname': "Me"}})
+    @patch('Funcs.get_owned_games')
+    @patch('Funcs.get_friend_list', return_value=["2", "3", "4"])
+    def test_load_user_prefers_snapshots(self, mock_friends, mock_owned, mock_summaries):
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, True)
+        self.addCleanup(setattr, Snapshot, 'SNAPSHOT_DIR', None)
+        Snapshot.init(snapshot_dir)
+        Snapshot.save_library("2", LIBRARIES["2"])
+        mock_owned.side_effect = lambda steam_id: LIBRARIES[steam_id]
+
+        index = Friends.load_user("1", self.scheduler)
+
+        self.assertEqual(index.members, ["1", "2", "3"])
+        self.assertEqual(sorted(call[0][0] for call in mock_owned.call_args_list), ["1", "3", "4"])
+        mock_summaries.assert_called_once()
+        self.assertEqual(list(mock_summaries.call_args[0][0]), ["1", "2", "3", "4"])
+        self.assertEqual(index.profiles["1"]['personaname'], "Me")
+
+    @patch('Funcs.fetch_player_achievements')
+    @patch('Funcs.get_owned_games')
+    def test_stale_snapshots_are_refetched(self, mock_owned, mock_player):
+        snapshot_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, snapshot_dir, True)
+        self.addCleanup(setattr, Snapshot, 'SNAPSHOT_DIR', None)
+        Snapshot.init(snapshot_dir)
+        Snapshot.save_library("2", LIBRARIES["2"])
+        Snapshot.save_achievements("2", 440, ACHIEVEMENTS[("2", 440)], [])
+        mock_owned.return_value = LIBRARIES["3"]
+        mock_player.return_value = ACHIEVEMENTS[("3", 440)]
+
+        # Fresh snapshots are used as they are
+        self.assertEqual(Friends._load_library("2"), LIBRARIES["2"])
+        self.assertEqual(Friends._achievement_counts("2", 440), (2, 2))
+        mock_owned.assert_not_called()
+        mock_player.assert_not_called()
+
+        with patch.dict('Cache.REVALIDATE_INTERVALS', {'owned_games': -1, 'player_achievements': -1}):
+            self.assertEqual(Friends._load_library("2"), LIBRARIES["3"])
+            self.assertEqual(Friends._achievement_counts("2", 440), (0, 2))
+
+            # Failed refreshes fall back to the stale snapshot
+            mock_owned.return_value = None
+            mock_player.side_effect = Breaker.CircuitOpenError("steam")
+            self.assertEqual(Friends._load_library("2"), LIBRARIES["2"])
+            self.assertEqual(Friends._achievement_counts("2", 440), (2, 2))
+
+    @patch('Funcs.get_owned_games', return_value=None)
+    @patch('Funcs.get_friend_list', return_value=["2"])
+    def test_load_user_without_own_library(self, mock_friends, mock_owned):
+        self.assertIsNone(Friends.load_user("1", self.scheduler))
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run benchmarks")
+class TestFriendsBenchmark(unittest.TestCase):
+    """Queries over 250 friends with 2k games each must take milliseconds"""
+
+    def test_large_friend_list(self):
+        rng = random.Random(0)
+        libraries = {str(i): [{'appid': appid, 'playtime_forever': rng.randrange(1000)}
+                              for appid in rng.sample(range(20000), 2000)] for i in range(251)}
+        start = time.perf_counter()
+        index = Friends.FriendIndex(libraries)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        shared = index.shared_with_friends()
+        overlap = index.overlap()
+        common = index.shared(["0", "1", "2"])
+        leaders = index.playtime_leaderboard(shared[0][0])
+        query_time = time.perf_counter() - start
+        print(f"\n251 libraries: build {build_time * 1000:.0f} ms, queries {query_time * 1000:.1f} ms")
+        self.assertEqual(len(overlap), 250)
+        self.assertTrue(common and leaders)
+        self.assertLess(query_time, 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,9 @@ from unittest.mock import patch, MagicMock
 import os
 import sys
 import json
+import time
+import tempfile
+import shutil
 import requests
 
 # Add parent directory to path for imports
@@ -10,11 +13,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 # Import the module to test
 import Funcs
+import Cache
+import Breaker
 
 class TestFuncs(unittest.TestCase):
     """Test cases for the Steam API functions in Funcs.py"""
     
     def setUp(self):
+        Breaker.reset()
         # Setup common test data
         self.test_steam_id = "76561198000000000"
         self.test_appid = 440  # Team Fortress 2
@@ -200,5 +206,197 @@ class TestFuncs(unittest.TestCase):
         # Verify function behavior
         self.assertEqual(result, [])
 
+    @patch('requests.get')
+    def test_get_game_schema_success(self, mock_get):
+        """Test get_game_schema returns the game section of the schema"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'game': {
+                'gameName': 'Team Fortress 2',
+                'gameVersion': '42',
+                'availableGameStats': {'achievements': [{'name': 'TF_PLAY_GAME_EVERYCLASS',
+                                                         'displayName': 'Head of the Class'}]}
+            }
+        }
+        mock_get.return_value = mock_response
+
+        result = Funcs.get_game_schema(self.test_appid)
+
+        self.assertEqual(result['gameVersion'], '42')
+        self.assertEqual(mock_get.call_args[1]['params']['appid'], self.test_appid)
+
+    @patch('requests.get')
+    def test_get_game_schema_request_exception(self, mock_get):
+        mock_get.side_effect = requests.RequestException("API error")
+        self.assertIsNone(Funcs.get_game_schema(self.test_appid))
+
+    @patch('requests.get')
+    def test_get_most_played_games(self, mock_get):
+        """Test get_most_played_games returns appids in rank order"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'response': {'ranks': [{'rank': 2, 'appid': 570}, {'rank': 1, 'appid': 730}]}
+        }
+        mock_get.return_value = mock_response
+
+        self.assertEqual(Funcs.get_most_played_games(), [730, 570])
+
+    @patch('requests.get')
+    def test_get_friend_list(self, mock_get):
+        """Test get_friend_list returns friend SteamIDs and None for private lists"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'friendslist': {'friends': [
+            {'steamid': '76561198000000001', 'relationship': 'friend', 'friend_since': 0},
+            {'steamid': '76561198000000002', 'relationship': 'friend', 'friend_since': 0}]}}
+        mock_get.return_value = mock_response
+
+        self.assertEqual(Funcs.get_friend_list(self.test_steam_id), ['76561198000000001', '76561198000000002'])
+        self.assertEqual(mock_get.call_args[1]['params']['relationship'], 'friend')
+
+        mock_get.side_effect = requests.HTTPError("401 Unauthorized")
+        self.assertIsNone(Funcs.get_friend_list(self.test_steam_id))
+
+    @patch('requests.get')
+    def test_resolve_vanity_url(self, mock_get):
+        """Test resolve_vanity_url returns Steam's response and None on errors"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'response': {'steamid': self.test_steam_id, 'success': 1}}
+        mock_get.return_value = mock_response
+
+        self.assertEqual(Funcs.resolve_vanity_url('gaben'), {'steamid': self.test_steam_id, 'success': 1})
+        self.assertEqual(mock_get.call_args[1]['params']['vanityurl'], 'gaben')
+
+        mock_get.side_effect = requests.RequestException("API error")
+        self.assertIsNone(Funcs.resolve_vanity_url('gaben'))
+
+    @patch('requests.get')
+    def test_offline_mode_skips_network(self, mock_get):
+        """Test that offline mode never calls the Steam API"""
+        try:
+            Funcs.init(offline=True)
+            self.assertIsNone(Funcs.get_owned_games(self.test_steam_id))
+            self.assertEqual(Funcs.get_player_achievements(self.test_steam_id, self.test_appid), [])
+            self.assertEqual(Funcs.get_global_achievements(self.test_appid), [])
+        finally:
+            Funcs.OFFLINE = False
+        mock_get.assert_not_called()
+
+class TestFuncsResponseStore(unittest.TestCase):
+    """Test cases for Funcs fetchers backed by a Cache.ResponseStore"""
+
+    def setUp(self):
+        Breaker.reset()
+        self.temp_dir = tempfile.mkdtemp()
+        Funcs.init('test_api_key', response_store=Cache.ResponseStore(self.temp_dir))
+        self.test_steam_id = "76561198000000000"
+        self.payload = {'response': {'games': [{'appid': 440, 'name': 'Team Fortress 2'}]}}
+
+    def tearDown(self):
+        Funcs.RESPONSE_STORE = None
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_response(self, status_code=200, payload=None, headers=None):
+        mock_response = MagicMock()
+        mock_response.status_code = status_code
+        mock_response.json.return_value = payload
+        mock_response.headers = headers or {}
+        if status_code >= 400:
+            mock_response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+        return mock_response
+
+    def expire_store(self):
+        past = time.time() - 24 * 3600
+        for name in os.listdir(self.temp_dir):
+            os.utime(os.path.join(self.temp_dir, name), (past, past))
+
+    @patch('requests.get')
+    def test_fresh_entry_skips_network(self, mock_get):
+        mock_get.return_value = self.make_response(payload=self.payload, headers={'ETag': '"v1"'})
+        Funcs.get_owned_games(self.test_steam_id)
+        games = Funcs.get_owned_games(self.test_steam_id)
+        self.assertEqual(games[0]['appid'], 440)
+        mock_get.assert_called_once()
+
+    @patch('requests.get')
+    def test_stale_entry_revalidates_with_etag(self, mock_get):
+        mock_get.return_value = self.make_response(payload=self.payload, headers={'ETag': '"v1"'})
+        Funcs.get_owned_games(self.test_steam_id)
+        self.expire_store()
+
+        mock_get.return_value = self.make_response(status_code=304)
+        games = Funcs.get_owned_games(self.test_steam_id)
+
+        self.assertEqual(games[0]['appid'], 440)
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        # The 304 marks the entry fresh again
+        Funcs.get_owned_games(self.test_steam_id)
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.get')
+    def test_error_falls_back_to_cached_payload(self, mock_get):
+        mock_get.return_value = self.make_response(payload=self.payload)
+        Funcs.get_owned_games(self.test_steam_id)
+        self.expire_store()
+
+        mock_get.side_effect = requests.RequestException("API error")
+        self.assertEqual(Funcs.get_owned_games(self.test_steam_id)[0]['appid'], 440)
+
+    @patch('requests.get')
+    def test_offline_serves_cached_payload(self, mock_get):
+        mock_get.return_value = self.make_response(payload=self.payload)
+        Funcs.get_owned_games(self.test_steam_id)
+        Funcs.OFFLINE = True
+        try:
+            self.assertEqual(Funcs.get_owned_games(self.test_steam_id)[0]['appid'], 440)
+            self.assertIsNone(Funcs.get_owned_games("76561198000000001"))
+        finally:
+            Funcs.OFFLINE = False
+        mock_get.assert_called_once()
+
+    def summaries_response(self, params=None, **kwargs):
+        players = [{'steamid': s, 'personaname': f"Player {s[-3:]}"} for s in params['steamids'].split(',')
+                   if not s.endswith('999')]
+        return self.make_response(payload={'response': {'players': players}})
+
+    @patch('requests.get')
+    def test_player_summaries_batched_and_cached_per_id(self, mock_get):
+        mock_get.side_effect = lambda url, params=None, **kwargs: self.summaries_response(params)
+        steam_ids = [str(76561198000000000 + i) for i in range(150)]
+
+        summaries = Funcs.get_player_summaries(steam_ids)
+        self.assertEqual(len(summaries), 150)
+        self.assertEqual(summaries[steam_ids[7]]['personaname'], "Player 007")
+        self.assertEqual([len(call.kwargs['params']['steamids'].split(','))
+                          for call in mock_get.call_args_list], [100, 50])
+
+        # Only IDs without a cached summary are requested, in any combination
+        mock_get.reset_mock()
+        extra = [str(76561198000000500 + i) for i in range(3)]
+        summaries = Funcs.get_player_summaries(steam_ids[20:140] + extra + extra)
+        self.assertEqual(len(summaries), 123)
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.kwargs['params']['steamids'], ','.join(extra))
+
+    @patch('requests.get')
+    def test_player_summaries_skip_unknown_and_fall_back_to_stale(self, mock_get):
+        mock_get.side_effect = lambda url, params=None, **kwargs: self.summaries_response(params)
+        self.assertEqual(list(Funcs.get_player_summaries(["76561198000000001", "76561198000000999"])),
+                         ["76561198000000001"])
+        self.expire_store()
+
+        mock_get.side_effect = requests.RequestException("API error")
+        summaries = Funcs.get_player_summaries(["76561198000000001", "76561198000000002"])
+        self.assertEqual(list(summaries), ["76561198000000001"])
+
+        Funcs.OFFLINE = True
+        try:
+            self.assertEqual(list(Funcs.get_player_summaries(["76561198000000001"])), ["76561198000000001"])
+        finally:
+            Funcs.OFFLINE = False
+
 if __name__ == '__main__':
     unittest.main()
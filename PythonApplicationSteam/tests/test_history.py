@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+import shutil
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import History
+
+DAY = 24 * 3600
+
+class TestHistory(unittest.TestCase):
+    """Test cases for the achievement and playtime history in History.py"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        History.init(os.path.join(self.temp_dir, 'history.sqlite3'))
+        self.test_steam_id = "76561198000000000"
+        self.now = int(time.time())
+
+    def tearDown(self):
+        History.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def achievements(self, unlocked):
+        """Return API-style achievements; unlocked maps apiname -> unlocktime."""
+        names = ['ACH1', 'ACH2', 'ACH3']
+        return [{'apiname': name, 'achieved': int(name in unlocked), 'unlocktime': unlocked.get(name, 0)}
+                for name in names]
+
+    def test_only_new_unlocks_are_recorded(self):
+        """Refetching a game stores nothing that is already known"""
+        first = self.achievements({'ACH1': self.now - 10 * DAY})
+        self.assertEqual(History.record_achievements(self.test_steam_id, 440, first), 1)
+        self.assertEqual(History.record_achievements(self.test_steam_id, 440, first), 0)
+        later = self.achievements({'ACH1': self.now - 10 * DAY, 'ACH2': self.now - DAY})
+        self.assertEqual(History.record_achievements(self.test_steam_id, 440, later), 1)
+        self.assertEqual(History.unlocks_for_game(self.test_steam_id, 440),
+                         [('ACH1', self.now - 10 * DAY), ('ACH2', self.now - DAY)])
+
+    def test_unlocks_this_week(self):
+        History.record_achievements_batch(self.test_steam_id, {
+            440: self.achievements({'ACH1': self.now - 30 * DAY, 'ACH2': self.now - 2 * DAY}),
+            570: self.achievements({'ACH3': self.now - 3 * DAY}),
+        })
+        week = History.unlocks_between(self.test_steam_id, self.now - 7 * DAY)
+        self.assertEqual(week, [(570, 'ACH3', self.now - 3 * DAY), (440, 'ACH2', self.now - 2 * DAY)])
+        self.assertEqual(History.unlocks_between(self.test_steam_id, self.now - 7 * DAY, appid=440),
+                         [(440, 'ACH2', self.now - 2 * DAY)])
+        self.assertEqual(History.unlocks_between("76561198000000001", 0), [])
+
+    def test_playtime_stored_as_deltas(self):
+        games = [{'appid': 440, 'playtime_forever': 100}, {'appid': 570, 'playtime_forever': 0}]
+        self.assertEqual(History.record_library(self.test_steam_id, games, recorded_at=1000), 2)
+        self.assertEqual(History.record_library(self.test_steam_id, games, recorded_at=2000), 0)
+        games[0]['playtime_forever'] = 160
+        self.assertEqual(History.record_library(self.test_steam_id, games, recorded_at=3000), 1)
+        self.assertEqual(History.playtime_history(self.test_steam_id, 440), [(1000, 100), (3000, 160)])
+
+    def test_history_survives_reopen(self):
+        History.record_achievements(self.test_steam_id, 440, self.achievements({'ACH1': self.now}))
+        path = History.HISTORY_DB
+        History.close()
+        self.assertEqual(History.unlocks_for_game(self.test_steam_id, 440), [])  # Disabled
+        History.init(path)
+        self.assertEqual(History.unlocks_for_game(self.test_steam_id, 440), [('ACH1', self.now)])
+
+    def test_large_library_ingest(self):
+        """Ingesting 5,000 games of achievements is one transaction, not one per game"""
+        batch = {appid: [{'apiname': f"ACH{i}", 'achieved': 1, 'unlocktime': self.now - appid}
+                         for i in range(20)]
+                 for appid in range(5000)}
+        start = time.perf_counter()
+        self.assertEqual(History.record_achievements_batch(self.test_steam_id, batch), 100000)
+        self.assertLess(time.perf_counter() - start, 10.0)
+        self.assertEqual(len(History.unlocks_between(self.test_steam_id, self.now - 9)), 10 * 20)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import time
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Http
+import Breaker
+import Scheduler
+
+def make_response(text, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    return response
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test cases for adaptive timeouts in Http.py"""
+
+    def test_default_until_enough_samples(self):
+        tracker = Http.LatencyTracker()
+        for _ in range(Http.MIN_SAMPLES - 1):
+            tracker.record(0.1)
+        self.assertEqual(tracker.timeout(10), 10)
+
+    def test_timeout_follows_p95(self):
+        tracker = Http.LatencyTracker()
+        for _ in range(95):
+            tracker.record(1.0)
+        for _ in range(5):
+            tracker.record(3.0)
+        self.assertEqual(tracker.percentile(0.95), 3.0)
+        self.assertEqual(tracker.timeout(10), 9.0)
+        self.assertEqual(tracker.timeout(5), 5)
+
+    def test_timeout_floor(self):
+        tracker = Http.LatencyTracker()
+        for _ in range(50):
+            tracker.record(0.01)
+        self.assertEqual(tracker.timeout(10), Http.MIN_TIMEOUT)
+
+class TestHedgedGet(unittest.TestCase):
+    """Test cases for Http.get hedging"""
+
+    URL = "http://api.example.com/ISteamUserStats/GetPlayerAchievements/v1/"
+
+    def setUp(self):
+        Http.reset()
+        Breaker.reset()
+
+    def tearDown(self):
+        Http.reset()
+        Breaker.reset()
+
+    def warm_up(self, seconds=0.01):
+        tracker = Http.tracker(self.URL)
+        for _ in range(Http.MIN_SAMPLES):
+            tracker.record(seconds)
+        return tracker
+
+    @patch('requests.get')
+    def test_no_hedge_without_history(self, mock_get):
+        mock_get.return_value = make_response('response')
+        self.assertEqual(Http.get(self.URL, endpoint=self.URL).text, 'response')
+        mock_get.assert_called_once_with(self.URL, params=None, headers=None, timeout=10)
+
+    @patch('requests.get')
+    def test_slow_request_is_hedged(self, mock_get):
+        """A request running past p95 gets a duplicate, and the first response wins"""
+        tracker = self.warm_up()
+        calls = []
+
+        def respond(url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return make_response('slow')
+            return make_response('fast')
+
+        mock_get.side_effect = respond
+        start = time.monotonic()
+        self.assertEqual(Http.get(self.URL, endpoint=self.URL).text, 'fast')
+        self.assertLess(time.monotonic() - start, 0.4)
+        stats = tracker.stats()
+        self.assertEqual(stats['hedges'], 1)
+        self.assertEqual(stats['hedge_wins'], 1)
+
+    @patch('requests.get')
+    def test_hedge_volume_is_capped(self, mock_get):
+        """Once the budget is spent, slow requests are not duplicated"""
+        tracker = self.warm_up()
+
+        def respond(url, **kwargs):
+            time.sleep(0.08)
+            return make_response('response')
+
+        mock_get.side_effect = respond
+        for _ in range(Http.HEDGE_BURST + 5):
+            Http.get(self.URL, endpoint=self.URL)
+        self.assertLessEqual(tracker.stats()['hedges'], Http.HEDGE_BURST + 1)
+
+    @patch('requests.get')
+    def test_hedge_used_when_primary_fails(self, mock_get):
+        self.warm_up()
+        calls = []
+
+        def respond(url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                time.sleep(0.1)
+                raise requests.ConnectionError("reset")
+            time.sleep(0.2)
+            return make_response('hedge')
+
+        mock_get.side_effect = respond
+        self.assertEqual(Http.get(self.URL, endpoint=self.URL).text, 'hedge')
+
+    @patch('requests.get')
+    def test_no_hedge_without_a_free_host_slot(self, mock_get):
+        """A saturated host is not sent a hedge on top of its PER_HOST requests"""
+        tracker = self.warm_up()
+        scheduler = Scheduler.get_scheduler()
+        scheduler.host_limits['api.example.com'] = 1
+        self.addCleanup(scheduler.host_limits.pop, 'api.example.com')
+        mock_get.side_effect = lambda url, **kwargs: time.sleep(0.1) or make_response('response')
+        Http.get(self.URL, endpoint=self.URL)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(tracker.stats()['hedges'], 0)
+        self.assertTrue(scheduler.try_host_slot('api.example.com'))
+        scheduler.release_host_slot('api.example.com')
+
+    @patch('requests.get')
+    def test_hedge_slot_is_returned(self, mock_get):
+        """The hedge's host slot is held until both requests finish, then returned"""
+        tracker = self.warm_up()
+        scheduler = Scheduler.get_scheduler()
+        scheduler.host_limits['api.example.com'] = 2
+        self.addCleanup(scheduler.host_limits.pop, 'api.example.com')
+        calls = []
+
+        def respond(url, **kwargs):
+            calls.append(url)
+            time.sleep(0.3 if len(calls) == 1 else 0.01)
+            return make_response('response')
+
+        mock_get.side_effect = respond
+        Http.get(self.URL, endpoint=self.URL)
+        self.assertEqual(tracker.stats()['hedges'], 1)
+        self.assertTrue(scheduler.try_host_slot('api.example.com'))
+        self.assertFalse(scheduler.try_host_slot('api.example.com'))
+        scheduler.release_host_slot('api.example.com')
+        time.sleep(0.4)
+        self.assertTrue(scheduler.try_host_slot('api.example.com'))
+        self.assertTrue(scheduler.try_host_slot('api.example.com'))
+        scheduler.release_host_slot('api.example.com')
+        scheduler.release_host_slot('api.example.com')
+
+    @patch('requests.get')
+    def test_hedge_disabled(self, mock_get):
+        tracker = self.warm_up()
+        mock_get.side_effect = lambda url, **kwargs: time.sleep(0.1) or make_response('response')
+        Http.get(self.URL, endpoint=self.URL, hedge=False)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(tracker.stats()['hedges'], 0)
+
+    @patch('requests.get')
+    def test_timeouts_recorded_at_timeout(self, mock_get):
+        tracker = Http.tracker(self.URL)
+        mock_get.side_effect = requests.Timeout("timed out")
+        with self.assertRaises(requests.Timeout):
+            Http.get(self.URL, endpoint=self.URL, default_timeout=7)
+        self.assertEqual(list(tracker.samples), [7])
+
+if __name__ == '__main__':
+    unittest.main()
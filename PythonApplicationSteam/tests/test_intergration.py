@@ -79,7 +79,7 @@ class TestSteamAppIntegration(unittest.TestCase):
     def tearDown(self):
         """Clean up after tests"""
         # Destroy tkinter objects
-        self.root.destroy()
+        self.app.close()
         
         # Restore original cache directory
         PythonApplicationSteam.CACHE_DIR = self.original_cache_dir
@@ -113,9 +113,10 @@ class TestSteamAppIntegration(unittest.TestCase):
         # Since UI testing in unit tests is limited, we mainly check that buttons were created
         self.assertGreater(len(self.app.game_buttons), 0)
     
+    @patch('Funcs.get_game_schema', return_value=None)
     @patch('Funcs.get_player_achievements')
     @patch('Funcs.get_global_achievements')
-    def test_achievements_flow(self, mock_global, mock_player):
+    def test_achievements_flow(self, mock_global, mock_player, mock_schema):
         """Test the flow for displaying achievements"""
         # Setup mocks
         mock_player.return_value = self.test_achievements
@@ -134,10 +135,11 @@ class TestSteamAppIntegration(unittest.TestCase):
         self.assertEqual(msg['game_name'], self.test_game_name)
         self.assertEqual(len(msg['achievements']), 2)
     
+    @patch('Funcs.get_game_schema', return_value=None)
     @patch('Funcs.get_owned_games')
     @patch('Funcs.get_player_achievements')
     @patch('Funcs.get_global_achievements') 
-    def test_end_to_end_flow(self, mock_global, mock_player, mock_get_games):
+    def test_end_to_end_flow(self, mock_global, mock_player, mock_get_games, mock_schema):
         """Test the complete flow from search to achievements"""
         # Setup mocks
         mock_get_games.return_value = self.test_games
@@ -0,0 +1,244 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import json
+import time
+import tempfile
+import shutil
+import threading
+import multiprocessing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Jobs
+import Funcs
+import Breaker
+
+GAMES_PER_USER = 5
+
+class StandInSteam(BaseHTTPRequestHandler):
+    """Answers GetOwnedGames and GetPlayerAchievements after a fixed latency."""
+    latency = 0.0
+    achievements_status = 200
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path.startswith('/IPlayerService/GetOwnedGames'):
+            body = {'response': {'games': [{'appid': appid, 'name': f"Game {appid}", 'playtime_forever': appid}
+                                           for appid in range(1, GAMES_PER_USER + 1)]}}
+        elif url.path.startswith('/ISteamUserStats/GetPlayerAchievements'):
+            if self.achievements_status >= 500:
+                self.send_error(self.achievements_status)
+                return
+            if self.achievements_status == 403:
+                self.send_json(403, {'playerstats': {'error': "Profile is not public", 'success': False}})
+                return
+            body = {'playerstats': {'success': True, 'achievements': [
+                {'apiname': 'ACH1', 'achieved': 1, 'unlocktime': int(query['appid'][0])}]}}
+        else:
+            self.send_error(404)
+            return
+        self.send_json(200, body)
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(latency=0.0, achievements_status=200):
+    handler = type('Handler', (StandInSteam,), {'latency': latency, 'achievements_status': achievements_status})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def run_worker_after(barrier, path, api_key, api_base):
+    """Worker process that starts crawling once every worker has started up."""
+    import requests
+    Funcs.init(api_key, api_base=api_base)
+    barrier.wait()
+    Jobs.run_worker(path)
+
+def steam_ids(count):
+    return [str(76561198000000000 + i) for i in range(count)]
+
+class TestJobQueue(unittest.TestCase):
+    """Test cases for leasing, retries and idempotent results in Jobs.py"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'jobs.sqlite3')
+        self.jobs = Jobs.JobQueue(self.path, lease_seconds=60)
+
+    def tearDown(self):
+        self.jobs.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_jobs_are_added_once(self):
+        self.assertEqual(self.jobs.add(steam_ids(3)), 3)
+        self.assertEqual(self.jobs.add(steam_ids(4)), 1)
+        self.assertEqual(self.jobs.counts(), {Jobs.PENDING: 4})
+
+    @patch('Funcs.init')
+    @patch('Funcs.resolve_vanity_url')
+    def test_profiles_are_resolved_before_queueing(self, mock_resolve, mock_init):
+        mock_resolve.side_effect = lambda name: ({'steamid': "76561197960287930", 'success': 1}
+                                                 if name == 'gaben' else {'success': 42})
+        resolved = Jobs.resolve_profiles(["76561198000000001", "https://steamcommunity.com/id/gaben/",
+                                          "nobody_here", "123"])
+        self.assertEqual(resolved, ["76561198000000001", "76561197960287930"])
+        mock_init.assert_called_once()
+
+        mock_init.reset_mock()
+        self.assertEqual(Jobs.resolve_profiles(steam_ids(2)), steam_ids(2))
+        mock_init.assert_not_called()
+
+    def test_leases_are_exclusive(self):
+        self.jobs.add(steam_ids(5))
+        other = Jobs.JobQueue(self.path)
+        self.addCleanup(other.close)
+        first = self.jobs.lease('a', limit=3)
+        second = other.lease('b', limit=3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({j.id for j in first} & {j.id for j in second})
+        self.assertIsNone(first[0].appid)
+
+    def test_complete_stores_result_and_children(self):
+        self.jobs.add(['1'])
+        job, = self.jobs.lease('a')
+        self.jobs.complete(job, [{'appid': 440}], children=[('1', 440)])
+        self.assertEqual(self.jobs.result('1'), [{'appid': 440}])
+        child, = self.jobs.lease('a')
+        self.assertEqual((child.steam_id, child.appid), ('1', 440))
+
+    def test_expired_lease_is_retried_and_results_are_idempotent(self):
+        jobs = Jobs.JobQueue(self.path, lease_seconds=0.05)
+        self.addCleanup(jobs.close)
+        jobs.add(['1'])
+        lost, = jobs.lease('crashed')
+        self.assertEqual(jobs.heartbeat('crashed', [lost.id]), 1)
+        time.sleep(0.1)
+        retried, = jobs.lease('b')
+        self.assertEqual((retried.id, retried.attempts), (lost.id, 2))
+        self.assertEqual(jobs.heartbeat('crashed', [lost.id]), 0)  # The lease has moved on
+
+        jobs.complete(retried, ['games'])
+        jobs.complete(lost, ['games'])  # The first worker finishes late
+        self.assertEqual(jobs.counts(), {Jobs.DONE: 1})
+        self.assertEqual(jobs.result('1'), ['games'])
+
+    def test_failed_jobs_stop_after_max_attempts(self):
+        jobs = Jobs.JobQueue(self.path, max_attempts=2)
+        self.addCleanup(jobs.close)
+        jobs.add(['1'])
+        for _ in range(2):
+            job, = jobs.lease('a')
+            jobs.fail('a', job)
+        self.assertEqual(jobs.lease('a'), [])
+        self.assertEqual(jobs.counts(), {Jobs.FAILED: 1})
+
+class TestWorkers(unittest.TestCase):
+    """Test cases for worker processes crawling a stand-in Steam API"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'jobs.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def crawl(self, users, processes, latency=0.0):
+        """Crawl users with worker processes; return (JobQueue, seconds taken)."""
+        server, api_base = start_server(latency)
+        self.addCleanup(server.shutdown)
+        jobs = Jobs.JobQueue(self.path)
+        self.addCleanup(jobs.close)
+        jobs.add(steam_ids(users))
+        start = time.perf_counter()
+        workers = Jobs.start_workers(self.path, processes, api_key='test_api_key', api_base=api_base)
+        for worker in workers:
+            worker.join(timeout=120)
+        self.assertTrue(all(worker.exitcode == 0 for worker in workers))
+        return jobs, time.perf_counter() - start
+
+    def test_processes_drain_queue(self):
+        """Three processes crawl every user and every played game exactly once"""
+        jobs, _ = self.crawl(users=10, processes=3)
+        self.assertEqual(jobs.counts(), {Jobs.DONE: 10 * (1 + GAMES_PER_USER)})
+        self.assertEqual(len(jobs.result(steam_ids(1)[0])), GAMES_PER_USER)
+        self.assertEqual(jobs.result(steam_ids(1)[0], 3)[0]['unlocktime'], 3)
+
+    def crawl_in_process(self, achievements_status):
+        """Crawl one user with run_worker in this process against a server answering achievements with a status."""
+        server, api_base = start_server(achievements_status=achievements_status)
+        self.addCleanup(server.shutdown)
+        Funcs.init('test_api_key', api_base=api_base)
+        self.addCleanup(Funcs.init, 'test_api_key')
+        Breaker.reset()
+        self.addCleanup(Breaker.reset)
+        jobs = Jobs.JobQueue(self.path)
+        self.addCleanup(jobs.close)
+        jobs.add(steam_ids(1))
+        Jobs.run_worker(self.path, poll=0.01)
+        return jobs
+
+    def test_server_errors_are_retried_then_failed(self):
+        """Achievement jobs answered with 503 are retried and end FAILED, not DONE with []"""
+        jobs = self.crawl_in_process(503)
+        self.assertEqual(jobs.counts(), {Jobs.DONE: 1, Jobs.FAILED: GAMES_PER_USER})
+        self.assertIsNone(jobs.result(steam_ids(1)[0], 1))
+
+    def test_private_stats_are_an_empty_result(self):
+        """Steam's "no stats" answer completes achievement jobs with an empty result"""
+        jobs = self.crawl_in_process(403)
+        self.assertEqual(jobs.counts(), {Jobs.DONE: 1 + GAMES_PER_USER})
+        self.assertEqual(jobs.result(steam_ids(1)[0], 1), [])
+
+    def crawl_after_startup(self, users, processes, latency):
+        """Crawl users once all worker processes are up; return the seconds taken."""
+        server, api_base = start_server(latency)
+        self.addCleanup(server.shutdown)
+        path = os.path.join(self.temp_dir, f"scaling-{processes}.sqlite3")
+        jobs = Jobs.JobQueue(path)
+        jobs.add(steam_ids(users))
+        jobs.close()
+        context = multiprocessing.get_context('spawn')
+        barrier = context.Barrier(processes + 1)
+        workers = [context.Process(target=run_worker_after, args=(barrier, path, 'test_api_key', api_base))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        barrier.wait(timeout=60)
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join(timeout=120)
+        self.assertTrue(all(worker.exitcode == 0 for worker in workers))
+        return time.perf_counter() - start
+
+    @unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run benchmarks")
+    def test_scaling(self):
+        """Jobs per second with 1 and 4 worker processes against a 100 ms stand-in server"""
+        users = 30
+        one = self.crawl_after_startup(users, processes=1, latency=0.1)
+        four = self.crawl_after_startup(users, processes=4, latency=0.1)
+        total = users * (1 + GAMES_PER_USER)
+        print(f"\n1 process: {total / one:.0f} jobs/s, 4 processes: {total / four:.0f} jobs/s "
+              f"({one / four:.1f}x)")
+        self.assertGreaterEqual(one / four, 3.2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import io
+import json
+import logging
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Logs
+
+def make_record(msg, *args, level=logging.ERROR):
+    return logging.LogRecord('root', level, __file__, 1, msg, args, None)
+
+class TestRateLimitFilter(unittest.TestCase):
+    """Test cases for flood suppression and sampling in Logs.py"""
+
+    def test_identical_templates_are_suppressed(self):
+        """Thousands of failures for different URLs collapse to the burst allowance"""
+        limiter = Logs.RateLimitFilter(burst=3, window=60)
+        passed = [limiter.filter(make_record("Failed to download image %s: %s", f"http://cdn/{i}.jpg", "503"))
+                  for i in range(1000)]
+        self.assertEqual(sum(passed), 3)
+        self.assertTrue(limiter.filter(make_record("Cannot write snapshot %s: %s", "a", "b")))
+
+    def test_next_window_reports_suppressed_count(self):
+        limiter = Logs.RateLimitFilter(burst=1, window=0.01)
+        for _ in range(5):
+            limiter.filter(make_record("Error %s", 1))
+        threading.Event().wait(0.02)
+        record = make_record("Error %s", 2)
+        self.assertTrue(limiter.filter(record))
+        self.assertEqual(record.suppressed, 4)
+
+    def test_sampling_only_applies_below_warning(self):
+        limiter = Logs.RateLimitFilter(burst=10000, sample_rate=0.1)
+        info = sum(limiter.filter(make_record("Fetched %s", i, level=logging.INFO)) for i in range(1000))
+        errors = sum(limiter.filter(make_record("Failed %s", i)) for i in range(100))
+        self.assertEqual(info, 100)
+        self.assertEqual(errors, 100)
+
+class TestLoggingPipeline(unittest.TestCase):
+    """Test cases for the queue-based logging setup"""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.logger = logging.getLogger()
+        self.level = self.logger.level
+        # Detach other handlers (e.g. a test runner's capture) so only the pipeline runs
+        self.handlers = self.logger.handlers[:]
+        for handler in self.handlers:
+            self.logger.removeHandler(handler)
+
+    def tearDown(self):
+        Logs.shutdown()
+        self.logger.setLevel(self.level)
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+
+    def test_formatting_happens_on_listener_thread(self):
+        threads = []
+
+        class Arg:
+            def __str__(self):
+                threads.append(threading.current_thread())
+                return "arg"
+
+        Logs.setup(stream=self.stream)
+        logging.warning("Value %s", Arg())
+        Logs.shutdown()
+
+        self.assertIn("WARNING - Value arg", self.stream.getvalue())
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_json_output(self):
+        Logs.setup(stream=self.stream, json_output=True)
+        logging.error("Failed to download image %s: %s", "http://cdn/1.jpg", "timeout")
+        Logs.shutdown()
+
+        entry = json.loads(self.stream.getvalue().splitlines()[-1])
+        self.assertEqual(entry['level'], 'ERROR')
+        self.assertEqual(entry['message'], "Failed to download image http://cdn/1.jpg: timeout")
+
+    def test_disabled_levels_are_not_queued(self):
+        Logs.setup(level=logging.WARNING, stream=self.stream)
+        logging.info("Fetched %s games", 10)
+        Logs.shutdown()
+        self.assertEqual(self.stream.getvalue(), "")
+
+if __name__ == '__main__':
+    unittest.main()
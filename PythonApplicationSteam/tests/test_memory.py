@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Memory
+import Schema
+
+MB = 2 ** 20
+
+class FakeCache:
+    def __init__(self, size):
+        self.size = size
+        self.fractions = []
+
+    def shrink(self, fraction):
+        self.fractions.append(fraction)
+        freed = int(self.size * fraction)
+        self.size -= freed
+        return freed
+
+class TestGovernor(unittest.TestCase):
+    """Test cases for the memory governor in Memory.py"""
+
+    def setUp(self):
+        self.rss = 100 * MB
+        self.governor = Memory.Governor(1000 * MB, measure=lambda: self.rss)
+        self.levels = []
+        self.governor.add_listener(self.levels.append)
+
+    def test_levels_follow_rss_with_hysteresis(self):
+        self.assertEqual(self.governor.check(), Memory.NORMAL)
+        self.rss = 850 * MB
+        self.assertEqual(self.governor.check(), Memory.ELEVATED)
+        self.rss = 960 * MB
+        self.assertEqual(self.governor.check(), Memory.CRITICAL)
+        self.rss = 900 * MB   # Below the hard limit but not by RECOVERY
+        self.assertEqual(self.governor.check(), Memory.CRITICAL)
+        self.rss = 780 * MB
+        self.assertEqual(self.governor.check(), Memory.ELEVATED)
+        self.rss = 700 * MB
+        self.assertEqual(self.governor.check(), Memory.NORMAL)
+        self.assertEqual(self.levels, [Memory.ELEVATED, Memory.CRITICAL, Memory.ELEVATED, Memory.NORMAL])
+
+    def test_shrinks_largest_caches_first_until_under_soft_limit(self):
+        large, small = FakeCache(400 * MB), FakeCache(50 * MB)
+        self.governor.register('large', lambda: large.size, large.shrink)
+        self.governor.register('small', lambda: small.size, small.shrink)
+        self.governor.register('tracked', lambda: 300 * MB)
+        self.rss = 850 * MB
+
+        self.governor.check()
+
+        self.assertEqual(len(large.fractions), 1)
+        self.assertLessEqual(850 * MB - (400 * MB - large.size), 1000 * MB * Memory.SOFT_LIMIT * Memory.RECOVERY)
+        self.assertEqual(small.fractions, [])
+        actions = [entry['action'] for entry in self.governor.status()['actions']]
+        self.assertTrue(actions[0].startswith("pressure normal -> elevated"))
+        self.assertTrue(actions[1].startswith("shrank large"))
+
+    def test_scaled_pools_and_image_budget(self):
+        self.assertEqual(self.governor.scaled(16), 16)
+        self.assertEqual(self.governor.image_budget(), 250 * MB)
+        self.rss = 990 * MB
+        self.governor.check()
+        self.assertEqual(self.governor.scaled(16), 4)
+        self.assertEqual(self.governor.scaled(2, minimum=2), 2)
+        self.assertEqual(self.governor.image_budget(), int(250 * MB * 0.25))
+
+    def test_disabled_governor_does_nothing(self):
+        measure = MagicMock(return_value=10 ** 12)
+        governor = Memory.Governor(0, measure=measure)
+        self.assertEqual(governor.check(), Memory.NORMAL)
+        self.assertIsNone(governor.image_budget())
+        measure.assert_not_called()
+
+    def test_status_reports_cache_sizes(self):
+        self.governor.register('schemas', lambda: 3 * MB)
+        status = self.governor.status()
+        self.assertEqual(status['caches'], {'schemas': 3 * MB})
+        self.assertEqual(status['level'], Memory.NORMAL)
+
+    def test_rss_bytes(self):
+        rss = Memory.rss_bytes()
+        if rss is not None:
+            self.assertGreater(rss, MB)
+
+class TestSchemaTrim(unittest.TestCase):
+    """Test cases for shrinking the in-memory schema cache"""
+
+    def tearDown(self):
+        Schema.reset()
+
+    def test_trim_drops_oldest(self):
+        for appid in range(4):
+            Schema._schemas[appid] = (0, {'version': '1', 'achievements': {'A': {}, 'B': {}}})
+        self.assertEqual(Schema.size_bytes(), 4 * 3 * Schema.ACHIEVEMENT_BYTES)
+        self.assertEqual(Schema.trim(0.5), 2 * 3 * Schema.ACHIEVEMENT_BYTES)
+        self.assertEqual(list(Schema._schemas), [2, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+import threading
+import itertools
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Prefetch
+import Scheduler
+
+STEAM_ID = "76561198000000000"
+GAMES = [
+    {'appid': 10, 'playtime_forever': 5000},
+    {'appid': 20, 'playtime_forever': 100, 'playtime_2weeks': 600},
+    {'appid': 30, 'playtime_forever': 50},
+    {'appid': 40, 'playtime_forever': 0},
+    {'appid': 50, 'playtime_forever': 900},
+]
+
+class FakeRoot:
+    """Collects after() callbacks so tests can fire timers explicitly."""
+    def __init__(self):
+        self.jobs = {}
+        self.ids = itertools.count()
+
+    def after(self, ms, fn, *args):
+        job = f"after#{next(self.ids)}"
+        self.jobs[job] = (fn, args)
+        return job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_timers(self):
+        jobs, self.jobs = self.jobs, {}
+        for fn, args in jobs.values():
+            fn(*args)
+
+class TestPrefetcher(unittest.TestCase):
+    """Test cases for predictive achievement prefetch in Prefetch.py"""
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.scheduler = Scheduler.NetworkScheduler(workers=2, reserved_workers=0)
+        self.addCleanup(self.scheduler.shutdown)
+        self.loaded = []
+        self.visible = GAMES
+        self.prefetcher = Prefetch.Prefetcher(self.root, self.scheduler, self.load, lambda: self.visible)
+
+    def load(self, steam_id, appid):
+        self.loaded.append(appid)
+        return [{'apiname': 'A', 'achieved': 1}], []
+
+    def block_scheduler(self):
+        """Occupy both workers so new prefetches stay queued until the returned event is set."""
+        release, started = threading.Event(), threading.Semaphore(0)
+        def hold():
+            started.release()
+            release.wait(5)
+        for _ in range(2):
+            self.scheduler.submit(hold, priority=Scheduler.INTERACTIVE)
+        for _ in range(2):
+            self.assertTrue(started.acquire(timeout=5))
+        self.addCleanup(release.set)
+        return release
+
+    def wait_idle(self):
+        deadline = time.monotonic() + 5
+        while self.prefetcher.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_score_prefers_recent_playtime(self):
+        ranked = sorted(GAMES, key=Prefetch.score, reverse=True)
+        self.assertEqual([game['appid'] for game in ranked[:3]], [20, 10, 50])
+
+    def test_hover_prefetch_serves_the_click(self):
+        self.prefetcher.hover(STEAM_ID, GAMES[2])
+        self.root.run_timers()
+        self.wait_idle()
+        self.assertEqual(self.loaded, [30])
+        self.assertEqual(self.prefetcher.take(STEAM_ID, 30), ([{'apiname': 'A', 'achieved': 1}], []))
+        self.assertEqual(self.loaded, [30])
+        self.assertIsNone(self.prefetcher.take(STEAM_ID, 40))
+        self.assertEqual((self.prefetcher.hits, self.prefetcher.misses), (1, 1))
+
+    def test_leave_before_hover_delay_fetches_nothing(self):
+        self.prefetcher.hover(STEAM_ID, GAMES[2])
+        self.prefetcher.leave(STEAM_ID, GAMES[2])
+        self.root.run_timers()
+        self.assertEqual(self.prefetcher.pending, {})
+
+    def test_leave_cancels_queued_prefetch(self):
+        release = self.block_scheduler()
+        self.prefetcher.hover(STEAM_ID, GAMES[2])
+        self.root.run_timers()
+        self.assertIn((STEAM_ID, 30), self.prefetcher.pending)
+        self.prefetcher.leave(STEAM_ID, GAMES[2])
+        release.set()
+        self.assertEqual(self.prefetcher.pending, {})
+        time.sleep(0.05)
+        self.assertEqual(self.loaded, [])
+
+    def test_dwell_prefetches_top_visible_games(self):
+        self.prefetcher.viewport_changed(STEAM_ID)
+        self.prefetcher.viewport_changed(STEAM_ID)  # Scrolling restarts the dwell timer
+        self.assertEqual(len(self.root.jobs), 1)
+        self.root.run_timers()
+        self.wait_idle()
+        self.assertEqual(sorted(self.loaded), [10, 20, 50])
+
+    def test_scrolling_away_cancels_dwell_prefetches(self):
+        release = self.block_scheduler()
+        self.visible = GAMES[:2]
+        self.prefetcher.viewport_changed(STEAM_ID)
+        self.root.run_timers()
+        self.visible = GAMES[2:]
+        self.prefetcher.viewport_changed(STEAM_ID)
+        self.root.run_timers()
+        release.set()
+        self.wait_idle()
+        self.assertEqual(sorted(self.loaded), [30, 40, 50])
+
+    def test_click_waits_for_running_prefetch(self):
+        started, finish = threading.Event(), threading.Event()
+        def slow_load(steam_id, appid):
+            started.set()
+            finish.wait(5)
+            self.loaded.append(appid)
+            return ['slow'], []
+        self.prefetcher.load = slow_load
+        self.prefetcher.hover(STEAM_ID, GAMES[0])
+        self.root.run_timers()
+        self.assertTrue(started.wait(5))
+        threading.Timer(0.05, finish.set).start()
+        self.assertEqual(self.prefetcher.take(STEAM_ID, 10), (['slow'], []))
+        self.assertEqual(self.loaded, [10])
+
+    def test_click_does_not_wait_for_follow_up_work(self):
+        icons, fetched = threading.Event(), []
+        def load(steam_id, appid):
+            self.prefetcher.submit(lambda: icons.wait(5) and fetched.append(appid))
+            return ['loaded'], []
+        self.prefetcher.load = load
+        self.addCleanup(icons.set)
+        self.prefetcher.hover(STEAM_ID, GAMES[0])
+        self.root.run_timers()
+        self.wait_idle()
+        self.assertEqual(self.prefetcher.pending, {})
+        self.assertEqual(self.prefetcher.take(STEAM_ID, 10), (['loaded'], []))
+        self.assertEqual(fetched, [])
+
+    def test_cancel_drops_queued_follow_up_work(self):
+        release = self.block_scheduler()
+        fetched = []
+        self.prefetcher.submit(fetched.append, 'icon')
+        self.prefetcher.cancel()
+        release.set()
+        self.scheduler.submit(lambda: None, priority=Scheduler.INTERACTIVE).result(timeout=5)
+        self.assertEqual(fetched, [])
+
+    def test_stale_results_are_not_served(self):
+        self.prefetcher.hover(STEAM_ID, GAMES[0])
+        self.root.run_timers()
+        self.wait_idle()
+        with patch('time.time', return_value=time.time() + 3600):
+            self.assertIsNone(self.prefetcher.take(STEAM_ID, 10))
+
+    def test_trim_drops_oldest_results(self):
+        for game in GAMES[:4]:
+            self.prefetcher.hover(STEAM_ID, game)
+            self.root.run_timers()
+            self.wait_idle()
+        self.assertEqual(self.prefetcher.size_bytes(), 4 * 2 * Prefetch.ACHIEVEMENT_BYTES)
+        self.assertEqual(self.prefetcher.trim(0.5), 2 * 2 * Prefetch.ACHIEVEMENT_BYTES)
+        self.assertEqual([key[1] for key in self.prefetcher.results], [30, 40])
+
+    def test_forget_drops_results_of_one_game(self):
+        for game in GAMES[:2]:
+            self.prefetcher.hover(STEAM_ID, game)
+            self.root.run_timers()
+            self.wait_idle()
+        self.prefetcher.forget(10)
+        self.assertIsNone(self.prefetcher.take(STEAM_ID, 10))
+        self.assertIsNotNone(self.prefetcher.take(STEAM_ID, 20))
+
+if __name__ == '__main__':
+    unittest.main()
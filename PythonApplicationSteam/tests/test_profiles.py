@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Profiles
+
+STEAM_ID = "76561197960287930"
+
+class TestProfiles(unittest.TestCase):
+    """Test cases for profile input parsing and vanity name resolution in Profiles.py"""
+
+    def setUp(self):
+        Profiles.clear()
+        self.addCleanup(Profiles.clear)
+
+    def test_parse(self):
+        cases = {
+            STEAM_ID: ('steam_id', STEAM_ID),
+            f"  {STEAM_ID}\n": ('steam_id', STEAM_ID),
+            f"https://steamcommunity.com/profiles/{STEAM_ID}/": ('steam_id', STEAM_ID),
+            f"steamcommunity.com/profiles/{STEAM_ID}": ('steam_id', STEAM_ID),
+            "https://steamcommunity.com/id/GabeLoganNewell/": ('vanity', 'gabelogannewell'),
+            "http://www.steamcommunity.com/id/gabelogannewell?l=english": ('vanity', 'gabelogannewell'),
+            "Gabe_Logan-Newell": ('vanity', 'gabe_logan-newell'),
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(Profiles.parse(text), expected)
+
+    def test_parse_rejects_non_profiles(self):
+        for text in ("", "123", "7656119796028793", "https://steamcommunity.com/profiles/gaben",
+                     "https://example.com/id/gaben", "two words", "ab", "x" * 33):
+            with self.subTest(text=text):
+                self.assertIsNone(Profiles.parse(text))
+
+    @patch('Funcs.resolve_vanity_url')
+    def test_resolve_vanity_remembers_matches(self, mock_resolve):
+        mock_resolve.return_value = {'steamid': STEAM_ID, 'success': 1}
+        self.assertEqual(Profiles.resolve("https://steamcommunity.com/id/GabeLoganNewell"), STEAM_ID)
+        self.assertEqual(Profiles.resolve("gabelogannewell"), STEAM_ID)
+        mock_resolve.assert_called_once_with('gabelogannewell')
+
+    @patch('Funcs.resolve_vanity_url')
+    def test_resolve_misses_and_errors_are_retried(self, mock_resolve):
+        mock_resolve.return_value = {'success': 42, 'message': 'No match'}
+        self.assertIsNone(Profiles.resolve_vanity('nobody_here'))
+        mock_resolve.return_value = None
+        self.assertIsNone(Profiles.resolve_vanity('nobody_here'))
+        mock_resolve.return_value = {'steamid': STEAM_ID, 'success': 1}
+        self.assertEqual(Profiles.resolve_vanity('nobody_here'), STEAM_ID)
+        self.assertEqual(mock_resolve.call_count, 3)
+
+    @patch('Funcs.resolve_vanity_url')
+    def test_resolve_steam_id_needs_no_request(self, mock_resolve):
+        self.assertEqual(Profiles.resolve(STEAM_ID), STEAM_ID)
+        self.assertIsNone(Profiles.resolve("not a profile"))
+        mock_resolve.assert_not_called()
+
+    @patch('Funcs.resolve_vanity_url', return_value={'steamid': STEAM_ID, 'success': 1})
+    def test_resolve_many_resolves_each_name_once(self, mock_resolve):
+        resolved = Profiles.resolve_many(["gaben", "gaben", STEAM_ID, "??"])
+        self.assertEqual(resolved, {"gaben": STEAM_ID, STEAM_ID: STEAM_ID, "??": None})
+        mock_resolve.assert_called_once()
+
+    @patch('Funcs.get_player_summaries')
+    def test_display_names(self, mock_summaries):
+        mock_summaries.return_value = {STEAM_ID: {'steamid': STEAM_ID, 'personaname': 'Rabscuttle'},
+                                       "76561197960287931": {'steamid': "76561197960287931"}}
+        self.assertEqual(Profiles.display_names([STEAM_ID, "76561197960287931"]),
+                         {STEAM_ID: 'Rabscuttle', "76561197960287931": "76561197960287931"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+import os
+import sys
+import time
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Scheduler
+from Scheduler import INTERACTIVE, VISIBLE, BACKGROUND
+
+class TestNetworkScheduler(unittest.TestCase):
+    """Test cases for the NetworkScheduler in Scheduler.py"""
+
+    def setUp(self):
+        self.schedulers = []
+
+    def tearDown(self):
+        for scheduler in self.schedulers:
+            scheduler.shutdown()
+
+    def make_scheduler(self, **kwargs):
+        scheduler = Scheduler.NetworkScheduler(**kwargs)
+        self.schedulers.append(scheduler)
+        return scheduler
+
+    def block_workers(self, scheduler, count, priority=INTERACTIVE):
+        """Occupy count workers until the returned event is set."""
+        release = threading.Event()
+        started = threading.Semaphore(0)
+
+        def hold():
+            started.release()
+            release.wait(5)
+
+        for _ in range(count):
+            scheduler.submit(hold, priority=priority)
+        for _ in range(count):
+            self.assertTrue(started.acquire(timeout=5))
+        return release
+
+    def test_submit_returns_result(self):
+        scheduler = self.make_scheduler(workers=2)
+        self.assertEqual(scheduler.submit(lambda a, b: a + b, 1, b=2).result(timeout=5), 3)
+
+    def test_priority_order(self):
+        """Queued interactive work runs before visible and background work"""
+        scheduler = self.make_scheduler(workers=1, reserved_workers=0)
+        release = self.block_workers(scheduler, 1)
+        order = []
+        futures = [
+            scheduler.submit(order.append, 'background', priority=BACKGROUND),
+            scheduler.submit(order.append, 'visible', priority=VISIBLE),
+            scheduler.submit(order.append, 'interactive', priority=INTERACTIVE),
+        ]
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(order, ['interactive', 'visible', 'background'])
+
+    def test_reserved_workers_for_interactive(self):
+        """Background work cannot occupy every worker"""
+        scheduler = self.make_scheduler(workers=3, reserved_workers=1)
+        release = self.block_workers(scheduler, 2, priority=BACKGROUND)
+        try:
+            blocked = scheduler.submit(lambda: 'background', priority=BACKGROUND)
+            click = scheduler.submit(lambda: 'click', priority=INTERACTIVE)
+            self.assertEqual(click.result(timeout=5), 'click')
+            self.assertFalse(blocked.done())
+        finally:
+            release.set()
+        self.assertEqual(blocked.result(timeout=5), 'background')
+
+    def test_cancel_group(self):
+        scheduler = self.make_scheduler(workers=1, reserved_workers=0)
+        release = self.block_workers(scheduler, 1)
+        stale = [scheduler.submit(time.sleep, 0, priority=BACKGROUND, group='thumbnails') for _ in range(5)]
+        kept = scheduler.submit(lambda: 'kept', priority=BACKGROUND, group='icons')
+        self.assertEqual(scheduler.cancel(group='thumbnails'), 5)
+        release.set()
+        self.assertEqual(kept.result(timeout=5), 'kept')
+        self.assertTrue(all(future.cancelled() for future in stale))
+
+    def test_resize_retires_idle_workers(self):
+        scheduler = self.make_scheduler(workers=8, reserved_workers=2)
+        release = self.block_workers(scheduler, 8)
+        release.set()
+        scheduler.resize(3)
+        deadline = time.monotonic() + 5
+        while len(scheduler._threads) > 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(scheduler._threads), 3)
+        self.assertEqual(scheduler.max_background, 1)
+        self.assertEqual(scheduler.submit(lambda: 'ok').result(timeout=5), 'ok')
+
+    def test_tasks_inherit_priority(self):
+        scheduler = self.make_scheduler(workers=2)
+        self.assertEqual(scheduler.submit(Scheduler.current_priority, priority=VISIBLE).result(timeout=5), VISIBLE)
+        self.assertEqual(Scheduler.current_priority(), INTERACTIVE)
+
+    def test_host_slots_bound_concurrency(self):
+        """No more than per_host requests to one host run at once"""
+        scheduler = self.make_scheduler(workers=8, reserved_workers=0, per_host=2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def request():
+            with scheduler.host_slot('cdn.example.com'):
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        futures = [scheduler.submit(request) for _ in range(8)]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(peak[0], 2)
+
+    def test_try_host_slot_never_waits(self):
+        scheduler = self.make_scheduler(per_host=1)
+        self.assertTrue(scheduler.try_host_slot('api.example.com'))
+        self.assertFalse(scheduler.try_host_slot('api.example.com'))
+        scheduler.release_host_slot('api.example.com')
+        with scheduler.host_slot('api.example.com'):
+            self.assertFalse(scheduler.try_host_slot('api.example.com'))
+        self.assertTrue(scheduler.try_host_slot('api.example.com'))
+
+    def test_host_slot_admits_by_priority(self):
+        """A waiting interactive request takes the next free slot ahead of background ones"""
+        scheduler = self.make_scheduler(workers=4, reserved_workers=0, per_host=1)
+        release = threading.Event()
+        holding = threading.Event()
+        order = []
+
+        def hold_slot():
+            with scheduler.host_slot('api.example.com'):
+                holding.set()
+                release.wait(5)
+
+        def request(name):
+            with scheduler.host_slot('api.example.com'):
+                order.append(name)
+
+        holder = scheduler.submit(hold_slot, priority=BACKGROUND)
+        self.assertTrue(holding.wait(5))
+        background = scheduler.submit(request, 'background', priority=BACKGROUND)
+        time.sleep(0.05)
+        click = scheduler.submit(request, 'click', priority=INTERACTIVE)
+        time.sleep(0.05)
+        release.set()
+        for future in (holder, background, click):
+            future.result(timeout=5)
+        self.assertEqual(order, ['click', 'background'])
+
+    def test_host_of(self):
+        self.assertEqual(Scheduler.host_of("https://steamcdn-a.akamaihd.net/steam/apps/440/header.jpg"),
+                         "steamcdn-a.akamaihd.net")
+
+if __name__ == '__main__':
+    unittest.main()
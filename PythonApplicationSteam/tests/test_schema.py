@@ -0,0 +1,135 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Schema
+
+ICON_URL = "https://steamcdn-a.akamaihd.net/steamcommunity/public/images/apps/440/b1a1c1.jpg"
+
+def make_game(version='1', display_name='Head of the Class'):
+    return {
+        'gameName': 'Team Fortress 2',
+        'gameVersion': version,
+        'availableGameStats': {'achievements': [
+            {'name': 'TF_PLAY_GAME_EVERYCLASS', 'displayName': display_name,
+             'description': 'Play a complete round with every class.',
+             'icon': ICON_URL, 'icongray': ICON_URL.replace('b1a1c1', 'f00d42')}
+        ]}
+    }
+
+class TestSchema(unittest.TestCase):
+    """Test cases for the shared per-game achievement schema in Schema.py"""
+
+    def setUp(self):
+        Schema.reset()
+
+    def tearDown(self):
+        Schema.reset()
+
+    @patch('Funcs.get_game_schema')
+    def test_fetched_once_across_players(self, mock_fetch):
+        mock_fetch.return_value = make_game()
+        first = Schema.get_schema(440)
+        second = Schema.get_schema(440)
+        self.assertIs(first, second)
+        mock_fetch.assert_called_once_with(440)
+        self.assertEqual(first['version'], '1')
+
+    @patch('Funcs.get_game_schema')
+    def test_new_version_replaces_stale_schema(self, mock_fetch):
+        mock_fetch.return_value = make_game('1')
+        Schema.get_schema(440)
+        loaded_at, schema = Schema._schemas[440]
+        Schema._schemas[440] = (time.time() - 2 * 24 * 3600, schema)
+
+        mock_fetch.return_value = make_game('2', 'Renamed')
+        schema = Schema.get_schema(440)
+
+        self.assertEqual(schema['version'], '2')
+        self.assertEqual(schema['achievements']['TF_PLAY_GAME_EVERYCLASS']['displayName'], 'Renamed')
+
+    @patch('Funcs.get_game_schema')
+    def test_failed_refresh_keeps_stale_schema(self, mock_fetch):
+        mock_fetch.return_value = make_game('1')
+        Schema.get_schema(440)
+        loaded_at, schema = Schema._schemas[440]
+        Schema._schemas[440] = (time.time() - 2 * 24 * 3600, schema)
+        mock_fetch.return_value = None
+        self.assertIs(Schema.get_schema(440), schema)
+
+    @patch('Funcs.get_game_schema')
+    def test_memory_bounded(self, mock_fetch):
+        mock_fetch.return_value = make_game()
+        for appid in range(Schema.MAX_SCHEMAS + 5):
+            Schema.get_schema(appid)
+        self.assertEqual(len(Schema._schemas), Schema.MAX_SCHEMAS)
+        self.assertNotIn(0, Schema._schemas)
+
+    @patch('Funcs.get_game_schema')
+    def test_eviction_is_least_recently_used(self, mock_fetch):
+        mock_fetch.return_value = make_game()
+        for appid in range(Schema.MAX_SCHEMAS):
+            Schema.get_schema(appid)
+        Schema.get_schema(0)  # A hit makes it the most recently used
+        Schema.get_schema(Schema.MAX_SCHEMAS)
+        self.assertIn(0, Schema._schemas)
+        self.assertNotIn(1, Schema._schemas)
+        self.assertEqual(mock_fetch.call_count, Schema.MAX_SCHEMAS + 1)
+
+    @patch('Funcs.get_game_schema')
+    def test_version_change_notifies_listeners(self, mock_fetch):
+        changed = []
+        Schema.add_listener(changed.append)
+        self.addCleanup(Schema.remove_listener, changed.append)
+        mock_fetch.return_value = make_game('1')
+        Schema.get_schema(440)
+        Schema.get_schema(440, revalidate=True)
+        self.assertEqual(changed, [])
+
+        mock_fetch.return_value = make_game('2', 'Renamed')
+        Schema.get_schema(440, revalidate=True)
+        self.assertEqual(changed, [440])
+
+    @patch('Funcs.get_game_schema')
+    def test_unknown_achievement_revalidates_schema(self, mock_fetch):
+        mock_fetch.return_value = make_game('1')
+        achievements = [{'apiname': 'TF_PLAY_GAME_EVERYCLASS', 'achieved': 1},
+                        {'apiname': 'TF_NEW_IN_UPDATE', 'achieved': 0}]
+        Schema.merged(440, achievements)
+        mock_fetch.assert_called_once_with(440)  # Just loaded, not rechecked
+
+        loaded_at, schema = Schema._schemas[440]
+        Schema._schemas[440] = (loaded_at - Schema.MIN_REVALIDATE, schema)
+        game = make_game('2')
+        game['availableGameStats']['achievements'].append({'name': 'TF_NEW_IN_UPDATE', 'displayName': 'New'})
+        mock_fetch.return_value = game
+
+        merged = Schema.merged(440, achievements)
+
+        mock_fetch.assert_called_with(440, revalidate=True)
+        self.assertEqual(merged[1]['name'], 'New')
+
+    def test_merge_adds_display_fields(self):
+        schema = Schema._index(make_game())
+        merged = Schema.merge([{'apiname': 'TF_PLAY_GAME_EVERYCLASS', 'achieved': 1, 'unlocktime': 1700000000},
+                               {'apiname': 'NEW_ACHIEVEMENT', 'achieved': 0}], schema)
+        self.assertEqual(merged[0]['name'], 'Head of the Class')
+        self.assertEqual(merged[0]['achieved'], 1)
+        self.assertEqual(merged[0]['icon'], ICON_URL)
+        self.assertEqual(merged[1], {'apiname': 'NEW_ACHIEVEMENT', 'achieved': 0})
+
+    def test_merge_without_schema(self):
+        achievements = [{'apiname': 'ACH1', 'achieved': 1}]
+        self.assertIs(Schema.merge(achievements, None), achievements)
+
+    def test_icon_cache_path_uses_hash(self):
+        self.assertEqual(Schema.icon_cache_path('cache', 440, ICON_URL), os.path.join('cache', '440_b1a1c1.jpg'))
+
+if __name__ == '__main__':
+    unittest.main()
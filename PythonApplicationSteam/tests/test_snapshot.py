@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import time
+import tempfile
+import shutil
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Snapshot
+
+class TestSnapshot(unittest.TestCase):
+    """Test cases for the session snapshot store in Snapshot.py"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_dir = Snapshot.SNAPSHOT_DIR
+        Snapshot.init(self.temp_dir)
+
+        self.test_steam_id = "76561198000000000"
+        self.test_games = [
+            {'appid': 440, 'name': 'Team Fortress 2', 'playtime_forever': 1000},
+            {'appid': 570, 'name': 'Dota 2', 'playtime_forever': 2000}
+        ]
+
+    def tearDown(self):
+        Snapshot.SNAPSHOT_DIR = self.original_dir
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_library_round_trip(self):
+        """Saved libraries are restored as the last session"""
+        self.assertTrue(Snapshot.save_library(self.test_steam_id, self.test_games))
+        self.assertEqual(Snapshot.load_library(self.test_steam_id), self.test_games)
+        self.assertEqual(Snapshot.load_last_session(), (self.test_steam_id, self.test_games))
+
+    def test_last_session_tracks_latest_user(self):
+        """The last session points at the most recently saved user"""
+        Snapshot.save_library(self.test_steam_id, self.test_games)
+        Snapshot.save_library("76561198000000001", self.test_games[:1])
+        steam_id, games = Snapshot.load_last_session()
+        self.assertEqual(steam_id, "76561198000000001")
+        self.assertEqual(len(games), 1)
+
+    def test_achievements_round_trip(self):
+        """Saved achievement data is restored per game"""
+        achievements = [{'apiname': 'ACH1', 'achieved': 1}]
+        global_achievements = [{'name': 'ACH1', 'percent': 55.5}]
+        Snapshot.save_achievements(self.test_steam_id, 440, achievements, global_achievements)
+        self.assertEqual(Snapshot.load_achievements(self.test_steam_id, 440),
+                         (achievements, global_achievements))
+        self.assertIsNone(Snapshot.load_achievements(self.test_steam_id, 570))
+
+    def test_missing_and_corrupt_snapshots(self):
+        """Missing or corrupt files are treated as no snapshot"""
+        self.assertIsNone(Snapshot.load_last_session())
+        with open(os.path.join(self.temp_dir, Snapshot.LAST_SESSION_FILE), 'w') as f:
+            f.write('{not json')
+        self.assertIsNone(Snapshot.load_last_session())
+
+    def test_disabled_until_init(self):
+        """Nothing is read or written before init()"""
+        Snapshot.SNAPSHOT_DIR = None
+        self.assertFalse(Snapshot.save_library(self.test_steam_id, self.test_games))
+        self.assertIsNone(Snapshot.load_last_session())
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_large_library_loads_quickly(self):
+        """A 5k-game snapshot loads well within the one-second startup budget"""
+        games = [
+            {'appid': i, 'name': f'Game {i}', 'playtime_forever': i * 7, 'img_icon_url': 'a' * 40}
+            for i in range(5000)
+        ]
+        Snapshot.save_library(self.test_steam_id, games)
+        start = time.perf_counter()
+        steam_id, loaded = Snapshot.load_last_session()
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(loaded), 5000)
+        self.assertLess(elapsed, 0.25)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import subprocess
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Import-time budgets in microseconds, measured with `python -X importtime`
+FUNCS_IMPORT_BUDGET_US = 100000
+APP_IMPORT_BUDGET_US = 250000
+# Budget in seconds from interpreter start of the import to the first drawn window
+FIRST_WINDOW_BUDGET_S = 1.5
+
+# Modules that must not be loaded just by importing the application modules
+HEAVY_MODULES = ('requests', 'PIL')
+
+def run_python(code, *flags):
+    """Run a snippet in a fresh interpreter without STEAM_API_KEY set."""
+    env = dict(os.environ)
+    env.pop('STEAM_API_KEY', None)
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, timeout=60
+    )
+
+def import_times(module):
+    """Return {module name: cumulative import time in us} for importing a module."""
+    result = run_python(f"import {module}", '-X', 'importtime')
+    if result.returncode != 0:
+        raise AssertionError(f"Importing {module} failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+class TestImportBudget(unittest.TestCase):
+    """Guard the import cost and side effects of the application modules"""
+
+    def test_funcs_import_is_light(self):
+        """Importing Funcs must not load HTTP, imaging or GUI modules"""
+        times = import_times('Funcs')
+        for name in HEAVY_MODULES + ('tkinter',):
+            self.assertNotIn(name, times)
+        self.assertLess(times['Funcs'], FUNCS_IMPORT_BUDGET_US)
+
+    def test_app_import_defers_heavy_modules(self):
+        """Importing the application must not load requests or PIL"""
+        times = import_times('PythonApplicationSteam')
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, times)
+        self.assertLess(times['PythonApplicationSteam'], APP_IMPORT_BUDGET_US)
+
+    def test_import_without_api_key(self):
+        """Configuration is resolved by init(), not at import time"""
+        result = run_python("import Funcs, PythonApplicationSteam")
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_init_requires_api_key(self):
+        """init() fails early when no API key is configured"""
+        result = run_python("import Funcs; Funcs.init()")
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn("STEAM_API_KEY", result.stderr)
+
+    @unittest.skipUnless(os.environ.get('DISPLAY') or sys.platform == 'win32', "requires a display")
+    def test_time_to_first_window(self):
+        """Time from import to the first drawn window stays within budget"""
+        code = (
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import tkinter as tk\n"
+            "import PythonApplicationSteam\n"
+            "root = tk.Tk()\n"
+            "app = PythonApplicationSteam.SteamApp(root)\n"
+            "root.update()\n"
+            "print(time.perf_counter() - start)\n"
+            "root.destroy()\n"
+        )
+        result = run_python(code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertLess(float(result.stdout.strip().splitlines()[-1]), FIRST_WINDOW_BUDGET_S)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,255 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import io
+import time
+import queue
+import tempfile
+import shutil
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the modules to test
+import Funcs
+import Thumbnails
+import Breaker
+import PythonApplicationSteam
+
+def make_jpeg(size=(460, 215), color=(200, 30, 30)):
+    """Return the bytes of a synthetic JPEG the size of a Steam header."""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color=color).save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+class TestThumbnailFunctions(unittest.TestCase):
+    """Test cases for the fetch and decode helpers in Thumbnails.py"""
+
+    def setUp(self):
+        Breaker.reset()
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.temp_dir, "440.jpg")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_decode_thumbnail(self):
+        """Decoding returns raw pixels at the requested size"""
+        mode, size, pixels = Thumbnails.decode_thumbnail(make_jpeg(), (184, 69))
+        self.assertEqual(mode, 'RGB')
+        self.assertEqual(size, (184, 69))
+        self.assertEqual(len(pixels), 184 * 69 * 3)
+
+    def test_decode_thumbnail_invalid(self):
+        """Invalid data raises so callers can fall back to the placeholder"""
+        with self.assertRaises(Exception):
+            Thumbnails.decode_thumbnail(b'not an image', (184, 69))
+
+    @patch('requests.get')
+    def test_fetch_image_bytes_downloads_and_caches(self, mock_get):
+        """Downloaded bytes are written to the cache"""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = b'image_data'
+        mock_get.return_value = mock_response
+
+        self.assertEqual(Thumbnails.fetch_image_bytes("http://example.com/a.jpg", self.cache_path), b'image_data')
+        with open(self.cache_path, 'rb') as f:
+            self.assertEqual(f.read(), b'image_data')
+
+    @patch('requests.get')
+    def test_fetch_image_bytes_offline(self, mock_get):
+        """Offline mode only serves cached images"""
+        self.addCleanup(setattr, Funcs, 'OFFLINE', False)
+        Funcs.OFFLINE = True
+        self.assertIsNone(Thumbnails.fetch_image_bytes("http://example.com/a.jpg", self.cache_path))
+        mock_get.assert_not_called()
+
+    @patch('requests.get')
+    def test_fetch_image_bytes_network_error(self, mock_get):
+        mock_get.side_effect = requests.RequestException("Network error")
+        self.assertIsNone(Thumbnails.fetch_image_bytes("http://example.com/a.jpg", self.cache_path))
+        self.assertFalse(os.path.exists(self.cache_path))
+
+class TestThumbnailPipeline(unittest.TestCase):
+    """Test cases for the ThumbnailPipeline"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.results = queue.Queue()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_pipeline(self, use_processes):
+        cache_path = os.path.join(self.temp_dir, "440.jpg")
+        with open(cache_path, 'wb') as f:
+            f.write(make_jpeg())
+        pipeline = Thumbnails.ThumbnailPipeline(self.results, decode_workers=1, use_processes=use_processes)
+        try:
+            pipeline.submit("http://example.com/440.jpg", cache_path, (184, 69), 'widget')
+            return self.results.get(timeout=60)
+        finally:
+            pipeline.shutdown()
+
+    def test_delivers_pixels_from_process_pool(self):
+        msg = self.run_pipeline(use_processes=True)
+        self.assertEqual(msg['widget'], 'widget')
+        self.assertEqual(msg['pixels'][1], (184, 69))
+
+    def test_delivers_pixels_without_processes(self):
+        msg = self.run_pipeline(use_processes=False)
+        self.assertEqual(msg['pixels'][1], (184, 69))
+        self.assertEqual(msg['key'], Thumbnails.image_key(make_jpeg(), (184, 69)))
+        self.assertEqual(msg['group'], 'thumbnails')
+
+    def test_resize_during_decodes_keeps_process_decoding(self):
+        """Decodes racing a pool resize go to the new pool instead of falling back to threads"""
+        class FakeProcessPool(ThreadPoolExecutor):
+            def __init__(self, max_workers, mp_context=None):
+                super().__init__(max_workers)
+
+        data = make_jpeg()
+        with patch('Thumbnails.ProcessPoolExecutor', FakeProcessPool):
+            pipeline = Thumbnails.ThumbnailPipeline(self.results, decode_workers=1)
+            self.addCleanup(pipeline.shutdown)
+            done = threading.Event()
+
+            def resize():
+                workers = 1
+                while not done.is_set():
+                    workers = 3 - workers
+                    pipeline.resize(workers)
+
+            def decode():
+                for _ in range(50):
+                    pipeline._decode(data, "http://example.com/440.jpg", (184, 69), 'widget')
+
+            resizer = threading.Thread(target=resize)
+            resizer.start()
+            decoders = [threading.Thread(target=decode) for _ in range(4)]
+            for thread in decoders:
+                thread.start()
+            for thread in decoders:
+                thread.join()
+            done.set()
+            resizer.join()
+            self.assertTrue(pipeline.use_processes)
+        for _ in range(200):
+            self.assertIn('pixels', self.results.get(timeout=10))
+
+    @patch('requests.get')
+    def test_failed_download_delivers_placeholder(self, mock_get):
+        mock_get.side_effect = requests.RequestException("Network error")
+        pipeline = Thumbnails.ThumbnailPipeline(self.results, use_processes=False)
+        try:
+            pipeline.submit("http://example.com/1.jpg", os.path.join(self.temp_dir, "1.jpg"), (184, 69), 'widget')
+            self.assertEqual(self.results.get(timeout=10), {'widget': 'widget', 'photo': None})
+        finally:
+            pipeline.shutdown()
+
+class TestPhotoRegistry(unittest.TestCase):
+    """Test cases for sharing PhotoImages between widgets"""
+
+    def setUp(self):
+        self.registry = Thumbnails.PhotoRegistry()
+        self.created = []
+
+    def create(self):
+        photo = object()
+        self.created.append(photo)
+        return photo
+
+    def test_identical_images_are_shared(self):
+        key = Thumbnails.image_key(b'locked_icon', (64, 64))
+        photos = [self.registry.acquire(key, self.create, 'icons') for _ in range(50)]
+        self.assertEqual(len(self.created), 1)
+        self.assertTrue(all(photo is photos[0] for photo in photos))
+
+    def test_size_is_part_of_the_key(self):
+        self.registry.acquire(Thumbnails.image_key(b'art', (184, 69)), self.create, 'thumbnails')
+        self.registry.acquire(Thumbnails.image_key(b'art', (64, 64)), self.create, 'thumbnails')
+        self.assertEqual(len(self.registry), 2)
+
+    def test_release_frees_only_unused_images(self):
+        shared = Thumbnails.image_key(b'shared', (64, 64))
+        self.registry.acquire(shared, self.create, 'thumbnails')
+        self.registry.acquire(shared, self.create, 'icons')
+        self.registry.acquire(Thumbnails.image_key(b'own', (64, 64)), self.create, 'icons')
+
+        self.assertEqual(self.registry.release('icons'), 1)
+        self.assertEqual(len(self.registry), 1)
+        self.assertEqual(self.registry.release('thumbnails'), 1)
+        self.assertEqual(len(self.registry), 0)
+        self.assertEqual(self.registry.release('thumbnails'), 0)
+
+    def test_budget_limits_new_images(self):
+        self.registry.max_bytes = 2 * 64 * 64 * 4
+        first = Thumbnails.image_key(b'first', (64, 64))
+        self.assertIsNotNone(self.registry.acquire(first, self.create, 'icons'))
+        self.assertIsNotNone(self.registry.acquire(Thumbnails.image_key(b'second', (64, 64)), self.create, 'icons'))
+        self.assertIsNone(self.registry.acquire(Thumbnails.image_key(b'third', (64, 64)), self.create, 'icons'))
+        self.assertIsNotNone(self.registry.acquire(first, self.create, 'thumbnails'))  # Shared images cost nothing
+        self.registry.release('icons')
+        self.assertEqual(self.registry.bytes, 64 * 64 * 4)
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run benchmarks")
+class TestThumbnailBenchmark(unittest.TestCase):
+    """Cold-cache thumbnail throughput: threaded download_image vs the process pipeline"""
+
+    IMAGE_COUNT = 400
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = []
+        for i in range(self.IMAGE_COUNT):
+            path = os.path.join(self.temp_dir, f"{i}.jpg")
+            with open(path, 'wb') as f:
+                f.write(make_jpeg(color=(i % 256, 80, 160)))
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def threaded_throughput(self):
+        """Images per second for one thread per image calling download_image."""
+        with patch('PIL.ImageTk.PhotoImage', side_effect=lambda img: img):
+            start = time.perf_counter()
+            threads = [threading.Thread(target=PythonApplicationSteam.download_image, args=("", path))
+                       for path in self.paths]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return self.IMAGE_COUNT / (time.perf_counter() - start)
+
+    def pipeline_throughput(self):
+        """Images per second through ThumbnailPipeline, excluding process start-up."""
+        results = queue.Queue()
+        pipeline = Thumbnails.ThumbnailPipeline(results)
+        try:
+            pipeline.submit("", self.paths[0], (184, 69), None)  # Start the worker processes
+            results.get(timeout=60)
+            start = time.perf_counter()
+            for path in self.paths:
+                pipeline.submit("", path, (184, 69), None)
+            for _ in self.paths:
+                results.get(timeout=60)
+            return self.IMAGE_COUNT / (time.perf_counter() - start)
+        finally:
+            pipeline.shutdown()
+
+    def test_compare_throughput(self):
+        threaded = self.threaded_throughput()
+        pipelined = self.pipeline_throughput()
+        print(f"\nThumbnail throughput: threads {threaded:.0f} img/s, "
+              f"process pipeline {pipelined:.0f} img/s ({pipelined / threaded:.1f}x)")
+        self.assertGreater(pipelined, threaded)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,232 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import subprocess
+import tkinter as tk
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import PythonApplicationSteam
+
+# Regression limits per phase; UI_BENCHMARK_THRESHOLDS points at a machine-specific copy
+THRESHOLDS_FILE = os.environ.get('UI_BENCHMARK_THRESHOLDS') or os.path.join(
+    os.path.dirname(__file__), 'ui_benchmark_thresholds.json')
+# Frame ticks are scheduled this often; a gap longer than STALL_MS is a stalled frame
+FRAME_MS = 16
+STALL_MS = 50
+# Seconds a phase may take before it is reported as hung
+PHASE_TIMEOUT = 120
+
+_xvfb = None
+
+
+def setUpModule():
+    """Start a virtual display for the benchmarks when there is no display to use."""
+    global _xvfb
+    if not os.environ.get('RUN_BENCHMARKS') or has_display():
+        return
+    if not shutil.which('Xvfb'):
+        return
+    read_fd, write_fd = os.pipe()
+    _xvfb = subprocess.Popen(['Xvfb', '-displayfd', str(write_fd), '-screen', '0', '1280x1024x24', '-nolisten', 'tcp'],
+                             pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        display = f.readline().strip()  # Xvfb writes the display number once it accepts clients
+    if display:
+        os.environ['DISPLAY'] = f":{display}"
+    else:
+        tearDownModule()
+
+def tearDownModule():
+    global _xvfb
+    if _xvfb is not None:
+        _xvfb.terminate()
+        _xvfb.wait(timeout=10)
+        _xvfb = None
+        os.environ.pop('DISPLAY', None)
+
+def has_display():
+    return sys.platform in ('win32', 'darwin') or bool(os.environ.get('DISPLAY'))
+
+def rss_mb():
+    """Return the resident set size of this process in MiB, or None where unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+def make_games(count):
+    return [{'appid': 10 + i * 10, 'name': f"Synthetic Game {i:05d}", 'playtime_forever': i * 7 % 5000}
+            for i in range(count)]
+
+def make_achievements(count):
+    achievements = [{'apiname': f"ACH_{i:04d}", 'achieved': i % 3 == 0, 'name': f"Achievement {i}",
+                     'description': f"Do the thing number {i} without dying",
+                     'icon': f"https://example.invalid/{i}.jpg", 'icongray': "https://example.invalid/locked.jpg"}
+                    for i in range(count)]
+    percentages = [{'name': f"ACH_{i:04d}", 'percent': (i * 37 % 1000) / 10} for i in range(count)]
+    return achievements, percentages
+
+
+class FrameMonitor:
+    """Records the gaps between frame ticks scheduled on the Tk event loop."""
+    def __init__(self, root, interval_ms=FRAME_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.gaps = []
+        self.last = None
+        self.job = None
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.job = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.gaps.append((now - self.last) * 1000)
+        self.last = now
+        self.job = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        self.root.after_cancel(self.job)
+        self.gaps.append((time.perf_counter() - self.last) * 1000)
+    # Design Rationale: Work done synchronously on the main thread delays the next tick,
+    # so the longest gap is the longest time the window could not repaint or take input.
+
+
+@unittest.skipUnless(os.environ.get('RUN_BENCHMARKS'), "set RUN_BENCHMARKS=1 to run benchmarks")
+class TestUiBenchmark(unittest.TestCase):
+    """Main-thread cost of SteamApp's game list and achievement panel against ui_benchmark_thresholds.json"""
+
+    @classmethod
+    def setUpClass(cls):
+        with open(THRESHOLDS_FILE, 'r', encoding='utf-8') as f:
+            cls.thresholds = json.load(f)
+        cls.results = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        report = os.environ.get('UI_BENCHMARK_REPORT')
+        if report and cls.results:
+            with open(report, 'w', encoding='utf-8') as f:
+                json.dump(cls.results, f, indent=2, sort_keys=True)
+
+    def setUp(self):
+        if not has_display():
+            self.skipTest("needs a display or Xvfb on PATH")
+        self.temp_cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_cache_dir, True)
+        for patcher in (patch.object(PythonApplicationSteam, 'CACHE_DIR', self.temp_cache_dir),
+                        patch.object(PythonApplicationSteam.SteamApp, 'request_achievement_icon'),
+                        patch('Thumbnails.ThumbnailPipeline.submit_game')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Design Rationale: Image loading is stubbed so the phases measure Tk work on the
+        # main thread only; the thumbnail pipeline has its own throughput benchmark.
+        self.root = tk.Tk()
+        self.app = PythonApplicationSteam.SteamApp(self.root)
+        self.root.update()
+
+    def tearDown(self):
+        self.app.thumbnails.shutdown()
+        self.app.close()
+
+    def run_phase(self, name, start, done=lambda: True):
+        """Run start() on the event loop until done() holds; return and record its measurements."""
+        monitor = FrameMonitor(self.root)
+        finished = tk.BooleanVar(self.root, value=False)
+        began = time.perf_counter()
+        deadline = began + PHASE_TIMEOUT
+
+        def check():
+            if done() or time.perf_counter() > deadline:
+                finished.set(True)
+            else:
+                self.root.after(5, check)
+
+        monitor.start()
+        cpu = time.thread_time()
+        start()
+        sync_ms = (time.perf_counter() - began) * 1000
+        self.root.after(5, check)
+        self.root.wait_variable(finished)
+        self.root.update_idletasks()
+        main_thread_ms = (time.thread_time() - cpu) * 1000
+        wall_ms = (time.perf_counter() - began) * 1000
+        monitor.stop()
+        self.assertTrue(done(), f"{name} did not finish within {PHASE_TIMEOUT}s")
+
+        result = {
+            'sync_ms': round(sync_ms, 1),
+            'wall_ms': round(wall_ms, 1),
+            'main_thread_ms': round(main_thread_ms, 1),
+            'max_stall_ms': round(max(monitor.gaps), 1),
+            'stalls': sum(1 for gap in monitor.gaps if gap > STALL_MS),
+            'widgets': count_widgets(self.root),
+            'rss_mb': rss_mb(),
+        }
+        if result['rss_mb'] is not None:
+            result['rss_mb'] = round(result['rss_mb'], 1)
+        self.results[name] = result
+        print(f"\n{name}: " + ", ".join(f"{key} {value}" for key, value in result.items()))
+        return result
+
+    def assertWithinThresholds(self, name, result):
+        exceeded = [f"{metric} {result[metric]} > {limit}"
+                    for metric, limit in self.thresholds[name].items()
+                    if result.get(metric) is not None and result[metric] > limit]
+        self.assertFalse(exceeded, f"{name} regressed: " + "; ".join(exceeded))
+
+    def test_game_list(self):
+        """Build 5k game buttons through handle_search_result, then clear them"""
+        games = make_games(5000)
+        result = self.run_phase('search_5k_games',
+                                lambda: self.app.handle_search_result("76561198000000000", games),
+                                lambda: len(self.app.game_buttons) == len(games))
+        self.assertWithinThresholds('search_5k_games', result)
+
+        result = self.run_phase('clear_5k_games', self.app.clear_games)
+        self.assertWithinThresholds('clear_5k_games', result)
+
+    def test_achievement_panel(self):
+        """Lay out 1k achievements through handle_achievements_result, then scroll to the end"""
+        achievements, percentages = make_achievements(1000)
+        result = self.run_phase('achievements_1k', lambda: self.app.handle_achievements_result(
+            "76561198000000000", 440, "Synthetic Game", achievements, percentages))
+        self.assertWithinThresholds('achievements_1k', result)
+
+        canvas = self.app.achievement_panel.list.canvas
+        steps = iter(range(1, 51))
+        position = {'done': False}
+
+        def scroll():
+            step = next(steps, None)
+            if step is None:
+                position['done'] = True
+                return
+            canvas.yview_moveto(step / 50)
+            self.root.after(FRAME_MS, scroll)
+
+        result = self.run_phase('achievements_1k_scroll', scroll, lambda: position['done'])
+        self.assertWithinThresholds('achievements_1k_scroll', result)
+
+if __name__ == '__main__':
+    unittest.main()
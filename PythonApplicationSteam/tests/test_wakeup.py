@@ -0,0 +1,153 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+import select
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Wakeup
+
+HAS_DISPLAY = bool(os.environ.get('DISPLAY')) or sys.platform == 'win32'
+
+class FakeTk:
+    """Stands in for root.tk, recording the file handler Tk would run."""
+    def __init__(self):
+        self.handlers = {}
+
+    def createfilehandler(self, fd, mask, handler):
+        self.handlers[fd] = handler
+
+    def deletefilehandler(self, fd):
+        del self.handlers[fd]
+
+class FakeRoot:
+    def __init__(self, file_handlers=True):
+        self.tk = FakeTk() if file_handlers else MagicMock(spec=[])
+        self.bindings = {}
+        self.generated = []
+
+    def bind(self, sequence, func, add=None):
+        self.bindings.setdefault(sequence, []).append(func)
+        return sequence
+
+    def unbind(self, sequence, funcid=None):
+        self.bindings.pop(sequence, None)
+
+    def event_generate(self, sequence, when=None):
+        self.generated.append(sequence)
+
+class TestPipeWakeup(unittest.TestCase):
+    """Test cases for the createfilehandler wakeup used on Unix"""
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.calls = []
+        self.queue = Wakeup.UiQueue(self.root, self.drain)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def drain(self):
+        items = []
+        while not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        self.calls.append(items)
+
+    def readable(self, timeout=0):
+        fd = self.queue.waker.read_fd
+        return bool(select.select([fd], [], [], timeout)[0])
+
+    def run_handler(self):
+        fd = self.queue.waker.read_fd
+        self.root.tk.handlers[fd](fd, None)
+
+    @unittest.skipIf(sys.platform == 'win32', "pipes cannot be watched by Tk on Windows")
+    def test_idle_queue_never_wakes(self):
+        self.assertFalse(self.readable())
+
+    @unittest.skipIf(sys.platform == 'win32', "pipes cannot be watched by Tk on Windows")
+    def test_put_from_worker_wakes_once_per_burst(self):
+        """Items put by several threads are all delivered by one callback"""
+        threads = [threading.Thread(target=self.queue.put, args=({'type': 'error', 'n': n},)) for n in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(self.readable(timeout=1))
+
+        self.run_handler()
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(sorted(item['n'] for item in self.calls[0]), list(range(10)))
+        self.assertFalse(self.readable())
+
+    @unittest.skipIf(sys.platform == 'win32', "pipes cannot be watched by Tk on Windows")
+    def test_close_stops_wakeups(self):
+        self.queue.close()
+        self.queue.put({'type': 'error'})
+        self.assertEqual(self.root.tk.handlers, {})
+        self.assertEqual(self.queue.get_nowait(), {'type': 'error'})
+
+    def test_no_destroy_binding_on_root(self):
+        """The root's <Destroy> fires for every descendant widget, so the queue must not bind it"""
+        self.assertNotIn('<Destroy>', self.root.bindings)
+
+class TestEventWakeup(unittest.TestCase):
+    """Test cases for the event_generate fallback"""
+
+    def test_one_event_outstanding(self):
+        root = FakeRoot(file_handlers=False)
+        calls = []
+        queue = Wakeup.UiQueue(root, lambda: calls.append(queue.qsize()))
+        for n in range(5):
+            queue.put(n)
+        self.assertEqual(root.generated, [Wakeup.WAKE_EVENT])
+
+        for handler in root.bindings[Wakeup.WAKE_EVENT]:
+            handler(None)
+        self.assertEqual(calls, [5])
+        queue.put(5)
+        self.assertEqual(root.generated, [Wakeup.WAKE_EVENT, Wakeup.WAKE_EVENT])
+
+@unittest.skipUnless(HAS_DISPLAY, "requires a display")
+class TestTkWakeup(unittest.TestCase):
+    """Results from worker threads reach a real Tk loop without polling"""
+
+    def setUp(self):
+        import tkinter as tk
+        self.root = tk.Tk()
+        self.received = []
+        self.queue = Wakeup.UiQueue(self.root, self.drain)
+
+    def tearDown(self):
+        self.queue.close()
+        self.root.destroy()
+
+    def drain(self):
+        while not self.queue.empty():
+            self.received.append((self.queue.get_nowait(), time.monotonic()))
+
+    def test_result_delivered_promptly(self):
+        sent = []
+
+        def worker():
+            time.sleep(0.05)
+            sent.append(time.monotonic())
+            self.queue.put({'type': 'search_result'})
+
+        threading.Thread(target=worker, daemon=True).start()
+        deadline = time.monotonic() + 2
+        while not self.received and time.monotonic() < deadline:
+            self.root.update()
+            time.sleep(0.001)
+        self.assertEqual(len(self.received), 1)
+        self.assertLess(self.received[0][1] - sent[0], 0.05)
+        self.assertEqual(self.root.tk.call('after', 'info'), '')
+
+if __name__ == '__main__':
+    unittest.main()
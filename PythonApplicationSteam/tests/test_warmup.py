@@ -0,0 +1,131 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import time
+import tempfile
+import shutil
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Import the module to test
+import Warmup
+import Assets
+import Funcs
+import Cache
+import Schema
+import Breaker
+import Http
+
+ICON_BASE = "https://steamcdn-a.akamaihd.net/steamcommunity/public/images/apps"
+
+def make_schema(appid):
+    return {'gameVersion': '1', 'availableGameStats': {'achievements': [
+        {'name': 'ACH1', 'icon': f"{ICON_BASE}/{appid}/a1.jpg", 'icongray': f"{ICON_BASE}/{appid}/locked.jpg"},
+        {'name': 'ACH2', 'icon': f"{ICON_BASE}/{appid}/a2.jpg", 'icongray': f"{ICON_BASE}/{appid}/locked.jpg"},
+    ]}}
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the warm-up token bucket"""
+
+    def test_limits_request_rate(self):
+        limiter = Warmup.RateLimiter(rate=100, burst=1)
+        start = time.monotonic()
+        for _ in range(11):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_zero_rate_is_unlimited(self):
+        limiter = Warmup.RateLimiter(rate=0)
+        start = time.monotonic()
+        for _ in range(1000):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.5)
+
+class TestWarmup(unittest.TestCase):
+    """Test cases for filling the image and API caches in Warmup.py"""
+
+    def setUp(self):
+        Http.reset()
+        Breaker.reset()
+        Schema.reset()
+        self.temp_dir = tempfile.mkdtemp()
+        Assets.init(self.temp_dir)
+        self.reports = []
+
+    def tearDown(self):
+        Assets._negative = Assets.NegativeCache()
+        Schema.reset()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch('requests.get')
+    @patch('Funcs.fetch_game_schema', side_effect=lambda appid, **kwargs: make_schema(appid))
+    @patch('Funcs.fetch_global_achievements', return_value=[])
+    def test_warms_art_icons_and_global_stats(self, mock_global, mock_schema, mock_get):
+        response = MagicMock(status_code=200, content=b'image', headers={})
+        mock_get.return_value = response
+
+        progress = Warmup.warm([440, 570, 440], self.temp_dir, rate=0, report=self.reports.append)
+
+        self.assertEqual((progress.done, progress.failed, progress.total), (2, 0, 2))
+        self.assertEqual(progress.downloads, 2 * 4)  # Art plus three distinct icons per game
+        self.assertEqual(sorted(c[0][0] for c in mock_global.call_args_list), [440, 570])
+        for appid in (440, 570):
+            self.assertTrue(os.path.exists(os.path.join(self.temp_dir, f"{appid}_capsule_184x69.jpg")))
+            self.assertTrue(os.path.exists(Schema.icon_cache_path(self.temp_dir, appid, f"{ICON_BASE}/{appid}/locked.jpg")))
+        self.assertIs(self.reports[-1], progress)
+
+        mock_get.reset_mock()
+        self.assertEqual(Warmup.warm([440], self.temp_dir, rate=0, report=self.reports.append).downloads, 0)
+        mock_get.assert_not_called()
+
+    @patch('requests.get', side_effect=requests.ConnectionError("unreachable"))
+    def test_api_failures_are_reported(self, mock_get):
+        with patch.object(Funcs, 'API_KEY', 'test_api_key'):
+            progress = Warmup.warm([440, 570], self.temp_dir, rate=0)
+        self.assertEqual((progress.done, progress.failed), (2, 2))
+
+    @patch('requests.get')
+    def test_only_requests_take_tokens(self, mock_get):
+        """Fresh API responses and images on disk cost no rate-limit tokens"""
+        def respond(url, **kwargs):
+            if 'GetSchemaForGame' in url:
+                payload = {'game': make_schema(kwargs['params']['appid'])}
+            elif 'GetGlobalAchievementPercentagesForApp' in url:
+                payload = {'achievementpercentages': {'achievements': []}}
+            elif url.endswith('capsule_184x69.jpg'):
+                return MagicMock(status_code=404, raise_for_status=MagicMock(side_effect=requests.HTTPError("404")))
+            else:
+                return MagicMock(status_code=200, content=b'image', headers={})
+            return MagicMock(status_code=200, headers={}, json=MagicMock(return_value=payload))
+
+        mock_get.side_effect = respond
+        limiter = MagicMock()
+        with patch.object(Funcs, 'API_KEY', 'test_api_key'), \
+                patch.object(Funcs, 'RESPONSE_STORE', Cache.ResponseStore(os.path.join(self.temp_dir, 'api'))):
+            self.assertEqual(Warmup.warm_app(440, self.temp_dir, limiter), 4)
+            self.assertEqual(limiter.acquire.call_count, mock_get.call_count)
+            limiter.reset_mock()
+            mock_get.reset_mock()
+            self.assertEqual(Warmup.warm_app(440, self.temp_dir, limiter), 0)
+        mock_get.assert_not_called()
+        limiter.acquire.assert_not_called()
+
+    @patch('requests.get', side_effect=lambda url, **kwargs: MagicMock(
+        status_code=200, headers={}, json=MagicMock(return_value={'achievementpercentages': {'achievements': []}})))
+    @patch('CacheDaemon.get_json')
+    @patch('CacheDaemon.enabled', return_value=True)
+    def test_rate_limited_requests_bypass_the_cache_daemon(self, mock_enabled, mock_daemon, mock_get):
+        limiter = MagicMock()
+        Funcs.fetch_global_achievements(440, before_request=limiter.acquire)
+        mock_daemon.assert_not_called()
+        self.assertEqual((limiter.acquire.call_count, mock_get.call_count), (1, 1))
+
+    def test_appids_from_games(self):
+        games = [{'appid': 1, 'playtime_forever': 5}, {'appid': 2, 'playtime_forever': 50}, {'appid': 3}]
+        self.assertEqual(Warmup.appids_from_games(games), [2, 1, 3])
+
+if __name__ == '__main__':
+    unittest.main()